@@ -16,7 +16,7 @@ if errorlevel 1 (
 :: 2. Install dependencies
 echo [1/3] Install dependencies...
 python -m pip install --upgrade pip
-python -m pip install PySide6 pyinstaller
+python -m pip install PySide6 numpy pyinstaller
 
 :: 3. Build
 echo [2/3] Building...
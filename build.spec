@@ -31,10 +31,19 @@ a = Analysis(
         # 自定义模块
         'core.lottery_engine',
         'core.number_validator',
+        'core.number_space',
+        'core.fenwick',
+        'core.draw_strategy',
+        'core.bitset',
+        'core.rules',
+        'core.households', 'core.alias', 'core.session_plan',
+        'core.journal', 'core.config', 'core.cli', 'core.roster', 'core.export',
+        'core.feasibility', 'core.fairness',
         'utils.resource_path',
         'ui.main_window', 'ui.animated_label', 'ui.confetti_widget',
         'ui.draw_page', 'ui.rounded_card', 'ui.setup_page',
-        'ui.side_menu', 'ui.summary_page'
+        'ui.side_menu', 'ui.summary_page', 'ui.export_worker',
+        'ui.fairness_dialog', 'ui.pool_map', 'ui.frame_clock', 'ui.shadow', 'ui.theme'
     ],
     excludes=[
         # 排除无用模块，减小体积
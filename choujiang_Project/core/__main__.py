@@ -0,0 +1,7 @@
+# core/__main__.py
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
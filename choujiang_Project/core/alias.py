@@ -0,0 +1,110 @@
+# core/alias.py
+
+
+class AliasTable:
+    """Vose 别名表：O(n) 构建，按权重 O(1) 抽取下标"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        self.size = n
+        self._prob = [0.0] * n
+        self._alias = list(range(n))
+        if n == 0 or total <= 0:
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # 浮点误差留下的都视为概率 1
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def sample(self, rng) -> int:
+        i = rng.randrange(self.size)
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+class WeightedPicker:
+    """按号码权重抽号：未指定权重的号码权重为 1
+
+    别名表的条目是每个加权号码，外加一个代表“整个号码空间均匀抽一个”的条目
+    （权重 = 号码空间大小，抽到加权号码时拒绝），于是每个号码被提出的概率
+    恰好正比于它的权重。提出的号码不在当前可抽集合（已抽出/被邻号占用/被排除）
+    时拒绝重抽——拒绝采样保证结果仍按权重分布，抽中后表无需更新。
+    连续拒绝超过 MAX_REJECTIONS 次时，惰性地剔除已永久失效（已抽出/被排除）的
+    加权号码并重建别名表；若仍然抽不中，则按当前可抽集合精确计算。
+    """
+
+    MAX_REJECTIONS = 64
+
+    def __init__(self, space, weights, rng):
+        self.space = space
+        self.rng = rng
+        self.weights = {}
+        for number, weight in weights.items():
+            number, weight = int(number), float(weight)
+            if weight <= 0:
+                raise ValueError(f"号码 {number} 的权重必须大于0：{weight}")
+            if number in space:
+                self.weights[number] = weight
+        self._rebuild(self.weights)
+
+    def _rebuild(self, live):
+        self._numbers = list(live)
+        self._table = AliasTable([live[n] for n in self._numbers] + [len(self.space)])
+
+    def __bool__(self):
+        return bool(self.weights)
+
+    def reset(self):
+        """恢复全部加权号码（重新开始抽奖时调用）"""
+        self._rebuild(self.weights)
+
+    def pick(self, accept, alive, pick_uniform, count):
+        """按权重抽取一个满足 accept 的号码
+
+        accept       —— 号码是否在当前可抽集合中
+        alive        —— 号码是否仍可能被抽到（未抽出且未被排除），用于剔除失效条目
+        pick_uniform —— 在可抽集合中均匀抽一个号码
+        count        —— 可抽集合的大小
+        """
+        for attempt in range(2):
+            for _ in range(self.MAX_REJECTIONS):
+                i = self._table.sample(self.rng)
+                if i < len(self._numbers):
+                    number = self._numbers[i]
+                else:
+                    number = self.space[self.rng.randrange(len(self.space))]
+                    if number in self.weights:
+                        continue
+                if accept(number):
+                    return number
+            if attempt == 0:
+                self._rebuild({n: self.weights[n] for n in self._numbers if alive(n)})
+        return self._pick_exact(accept, pick_uniform, count)
+
+    def _pick_exact(self, accept, pick_uniform, count):
+        live = {n: w for n, w in self.weights.items() if accept(n)}
+        weighted_total = sum(live.values())
+        unweighted = count() - len(live)
+        if weighted_total + unweighted <= 0:
+            return None
+        r = self.rng.random() * (weighted_total + unweighted)
+        if r < weighted_total:
+            for number, weight in live.items():
+                r -= weight
+                if r < 0:
+                    return number
+            return number
+        # 均匀抽一个未加权的号码
+        while True:
+            number = pick_uniform()
+            if number not in self.weights:
+                return number
@@ -0,0 +1,35 @@
+# core/bitset.py
+
+
+class Bitset:
+    """定长位图：每个位置占 1 bit，底层是按 64 位字对齐的 bytearray
+
+    清空是原地的缓冲区写零，不会重新分配；buffer 可直接交给 NumPy 做批量运算。
+    """
+
+    WORD_BITS = 64
+
+    def __init__(self, size: int):
+        self.size = size
+        self.words = (size + self.WORD_BITS - 1) // self.WORD_BITS
+        self.buffer = bytearray(self.words * 8)
+
+    def __getitem__(self, i: int) -> int:
+        return self.buffer[i >> 3] >> (i & 7) & 1
+
+    def set(self, i: int):
+        self.buffer[i >> 3] |= 1 << (i & 7)
+
+    def discard(self, i: int):
+        self.buffer[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def word(self, w: int) -> int:
+        """第 w 个 64 位字（低位对应较小的位置）"""
+        return int.from_bytes(self.buffer[w * 8:w * 8 + 8], "little")
+
+    def clear(self):
+        self.buffer[:] = bytes(len(self.buffer))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
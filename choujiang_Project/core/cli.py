@@ -0,0 +1,122 @@
+# core/cli.py
+"""命令行抽奖（不依赖 PySide6，可用于彩排、批量校验配置和服务器端）
+
+模块顶层只导入标准库和不依赖 NumPy 的 core 模块，引擎在需要抽奖时才导入，
+check 不加 --pool 时启动只需几十毫秒。
+
+    python -m core run lottery_config.json [--format json|csv] [-o 结果文件] [--seed 种子]
+    python -m core check lottery_config.json [--pool]
+    python -m core verify lottery_plan_reveal.json [--commitment 哈希] [--roster 名单文件]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .config import load_config
+from .export import write_csv, write_json
+from .households import HouseholdIndex
+from .rules import NumberRules
+
+
+def build_engine(config, seed=None):
+    """按配置创建引擎；给定种子时使用计数器随机数，结果与同种子的预生成方案一致"""
+    from .lottery_engine import LotteryEngine
+    from .session_plan import CounterRandom
+
+    engine = LotteryEngine(rng=CounterRandom(seed) if seed is not None else None)
+    engine.apply_config(config)
+    return engine
+
+
+def cmd_run(args):
+    engine = build_engine(load_config(args.config), args.seed)
+    started = time.perf_counter()
+    prize_drawn = engine.draw_all(sequential=args.seed is not None)
+    elapsed = time.perf_counter() - started
+
+    name_of = engine.guest_name if engine.roster is not None else None
+    # utf-8-sig 便于 Excel 直接打开中文 CSV
+    encoding = "utf-8-sig" if args.format == "csv" else "utf-8"
+    f = open(args.output, "w", encoding=encoding, newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(prize_drawn, f, name_of)
+        else:
+            write_json(prize_drawn, f, name_of, extra={
+                "seed": args.seed,
+                "strategy": engine.state_size()["strategy"],
+                "elapsed_ms": round(elapsed * 1000, 3),
+            })
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return 0
+
+
+def cmd_check(args):
+    """校验配置；只做校验时不加载 NumPy 和号码空间，--pool 时再建引擎分析号码池"""
+    config = load_config(args.config)
+    needed = sum(p["count"] for p in config["prizes"])
+    print(f"号码范围：{config['start']} ~ {config['end']}")
+    print(f"排除规则：{NumberRules.from_config(config['rules']).describe()}")
+    print(f"奖项：{len(config['prizes'])} 项，共需 {needed} 个号码")
+    households = HouseholdIndex(config["households"])
+    print(f"家庭分组：{len(households)} 组，加权号码：{len(config['weights'])} 个")
+    if config["roster"]:
+        if not os.path.isfile(config["roster"]):
+            raise ValueError(f"找不到来宾名单：{config['roster']}")
+        print(f"来宾名单：{config['roster']}")
+    if args.pool:
+        engine = build_engine(config)
+        spaced = engine.spaced_capacity
+        print(f"号码池：{engine.pool_size} 个")
+        print(f"间隔 ≥ {engine.MIN_GAP} 时最多 {spaced} 人中奖"
+              + ("" if spaced >= needed else "，之后会抽到相邻号码"))
+    return 0
+
+
+def cmd_verify(args):
+    from .session_plan import SessionPlan
+
+    with open(args.reveal, encoding="utf-8") as f:
+        revealed = json.load(f)
+    ok = SessionPlan.verify(revealed, args.commitment, args.roster)
+    print("✅ 验证通过" if ok else "❌ 验证失败：哈希承诺、来宾名单或抽奖结果不一致")
+    return 0 if ok else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="婚礼抽奖命令行工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="按配置抽完所有奖项并输出结果")
+    run.add_argument("config", help="配置文件（.json / .yaml，格式同 lottery_config_example.json）")
+    run.add_argument("--format", choices=("json", "csv"), default="json")
+    run.add_argument("-o", "--output", help="结果文件，缺省输出到标准输出")
+    run.add_argument("--seed", help="随机种子（彩排复现用）")
+    run.set_defaults(func=cmd_run)
+
+    check = sub.add_parser("check", help="只校验配置，不抽奖")
+    check.add_argument("config")
+    check.add_argument("--pool", action="store_true",
+                       help="同时分析号码池大小和邻号间隔（需加载号码空间，较慢）")
+    check.set_defaults(func=cmd_check)
+
+    verify = sub.add_parser("verify", help="验证预生成方案的公开文件")
+    verify.add_argument("reveal", help="抽奖结束后保存的验证文件")
+    verify.add_argument("--commitment", help="抽奖前公布的哈希承诺，缺省使用文件中的值")
+    verify.add_argument("--roster", help="公开的来宾名单文件，缺省使用验证文件中记录的路径")
+    verify.set_defaults(func=cmd_verify)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, KeyError, ValueError, RuntimeError) as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 1
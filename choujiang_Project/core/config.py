@@ -0,0 +1,160 @@
+# core/config.py
+"""抽奖配置文件读写（格式同 lottery_config_example.json，也支持 YAML）
+
+    {
+        "start": 520089, "end": 520199,
+        "prizes": [{"name": "一等奖", "count": 1}, ...],
+        "rules": {"exclude_digits": [4], "exclude_endings": [], "blacklist": []},   # 可选
+        "households": [[520101, 520102], ...],                                       # 可选
+        "weights": {"520101": 3},                                                    # 可选
+        "roster": "guests.csv",                                                      # 可选，来宾名单
+        "precompute": false                                                          # 可选
+    }
+"""
+
+import json
+import os
+
+from .rules import NumberRules
+
+CONFIG_KEYS = ("start", "end", "prizes", "rules", "households", "weights", "precompute", "roster")
+YAML_SUFFIXES = (".yaml", ".yml")
+MAX_NUMBER = 1_000_000_000  # 号码上限，设置页的输入框范围与此一致
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _int_list(values, path):
+    if not isinstance(values, list):
+        raise ValueError(f"{path} 必须是数组")
+    for i, value in enumerate(values):
+        if not _is_int(value):
+            raise ValueError(f"{path}[{i}] 必须是整数：{value!r}")
+    return values
+
+
+def validate_config(config) -> dict:
+    """校验配置并返回规范化后的副本；出错时抛出 ValueError，指明出错的字段"""
+    if not isinstance(config, dict):
+        raise ValueError("配置必须是一个对象")
+    unknown = set(config) - set(CONFIG_KEYS)
+    if unknown:
+        raise ValueError(f"未知的配置项：{', '.join(sorted(unknown))}")
+    for key in ("start", "end", "prizes"):
+        if key not in config:
+            raise ValueError(f"配置缺少字段：{key}")
+
+    start, end = config["start"], config["end"]
+    if not _is_int(start) or not _is_int(end) or start < 0:
+        raise ValueError("start / end 必须是非负整数")
+    if start >= end:
+        raise ValueError("起始号码必须小于结束号码")
+    if end > MAX_NUMBER:
+        raise ValueError(f"end 不能超过 {MAX_NUMBER}：{end}")
+
+    prizes = config["prizes"]
+    if not isinstance(prizes, list) or not prizes:
+        raise ValueError("prizes 必须是非空数组")
+    names = set()
+    for i, prize in enumerate(prizes):
+        if not isinstance(prize, dict) or set(prize) != {"name", "count"}:
+            raise ValueError(f"prizes[{i}] 必须只包含 name 和 count")
+        name, count = prize["name"], prize["count"]
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f"prizes[{i}].name 不能为空")
+        if name in names:
+            raise ValueError(f"prizes[{i}].name 重复：{name}")
+        if not _is_int(count) or count < 1:
+            raise ValueError(f"prizes[{i}].count 必须是正整数：{count!r}")
+        names.add(name)
+
+    rules = config.get("rules") or {}
+    if not isinstance(rules, dict):
+        raise ValueError("rules 必须是对象")
+    for key in ("exclude_digits", "blacklist"):
+        if key in rules:
+            _int_list(rules[key], f"rules.{key}")
+    if "exclude_endings" in rules and not isinstance(rules["exclude_endings"], list):
+        raise ValueError("rules.exclude_endings 必须是数组")
+    rules = NumberRules.from_config(rules).to_config()
+
+    households = config.get("households") or []
+    if not isinstance(households, list):
+        raise ValueError("households 必须是数组")
+    for i, members in enumerate(households):
+        _int_list(members, f"households[{i}]")
+
+    weights = config.get("weights") or {}
+    if not isinstance(weights, dict):
+        raise ValueError("weights 必须是对象（号码: 权重）")
+    normalized = {}
+    for number, weight in weights.items():
+        if not str(number).isdigit():
+            raise ValueError(f"weights 中的号码必须是整数：{number!r}")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+            raise ValueError(f"weights[{number}] 必须是正数：{weight!r}")
+        normalized[str(int(number))] = weight
+
+    precompute = config.get("precompute", False)
+    if not isinstance(precompute, bool):
+        raise ValueError("precompute 必须是 true / false")
+
+    roster = config.get("roster") or ""
+    if not isinstance(roster, str):
+        raise ValueError("roster 必须是名单文件路径")
+
+    return {
+        "start": start,
+        "end": end,
+        "prizes": [{"name": p["name"], "count": p["count"]} for p in prizes],
+        "rules": rules,
+        "households": households,
+        "weights": normalized,
+        "precompute": precompute,
+        "roster": roster,
+    }
+
+
+def _yaml():
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("读写 YAML 配置需要安装 PyYAML：pip install pyyaml")
+    return yaml
+
+
+def load_config(path) -> dict:
+    """读取并校验配置文件（.json / .yaml / .yml）"""
+    with open(path, "rb") as f:
+        if os.path.splitext(path)[1].lower() in YAML_SUFFIXES:
+            yaml = _yaml()
+            # 有 libyaml 时用 C 实现的解析器
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            config = yaml.load(f, Loader=loader)
+        else:
+            try:
+                config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON 格式有误：第 {e.lineno} 行第 {e.colno} 列")
+    config = validate_config(config)
+    # 名单路径相对于配置文件所在目录
+    if config["roster"]:
+        config["roster"] = os.path.join(os.path.dirname(os.path.abspath(path)), config["roster"])
+    return config
+
+
+def save_config(config: dict, path):
+    """校验后写出配置文件，格式由扩展名决定"""
+    config = validate_config(config)
+    if not config["precompute"]:
+        del config["precompute"]
+    for key in ("households", "weights", "roster"):
+        if not config[key]:
+            del config[key]
+    with open(path, "w", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in YAML_SUFFIXES:
+            _yaml().safe_dump(config, f, allow_unicode=True, sort_keys=False)
+        else:
+            json.dump(config, f, ensure_ascii=False, indent=4)
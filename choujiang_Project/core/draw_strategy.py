@@ -0,0 +1,413 @@
+# core/draw_strategy.py
+
+import bisect
+import heapq
+from abc import ABC, abstractmethod
+from array import array
+
+import numpy as np
+
+from .bitset import Bitset
+from .fenwick import FenwickTree
+from .number_validator import valid_gap_mask
+
+
+# rank_states 返回的号码状态
+STATE_FREE = 0      # 可抽（间隔安全）
+STATE_BLOCKED = 1   # 与已抽号码间隔不足
+STATE_USED = 2      # 已中奖
+STATE_EXCLUDED = 3  # 被排除（保留号码、同家庭已有人中奖等）
+STATE_OUTSIDE = 4   # 不在号码空间内（含禁用数字、不在名单中），由引擎的 number_states 给出
+
+
+class PoolCrowded(Exception):
+    """拒绝采样在重试预算内没有抽中，号码池已过于拥挤"""
+
+
+class DrawStrategy(ABC):
+    """抽号策略基类
+
+    策略负责维护已抽号码的索引，并提供两种抽取：
+    pick_safe —— 与所有已抽号码间隔>=min_gap 的号码；
+    pick_available —— 任意未抽出的号码（没有安全号码时的退路）。
+    均匀抽取，没有可抽号码时返回 None。
+    sample_safe 供批量抽奖使用：从当前安全号码中有放回地均匀抽取一批候选，
+    没有安全号码时返回空数组。
+    exclude 把一批号码移出号码池（既不能中奖，也不占用邻号间隔）。
+    unmark_used / unexclude 是对应的撤销操作，只增量更新该号码邻域内的索引。
+    is_safe / is_available 与 count_safe / count_available 供加权抽奖做拒绝采样和精确计数。
+    rank_states 批量给出一段连续名次的 STATE_* 状态，供界面绘制号码池。
+    以上接口均为抽象方法，缺少实现的策略在创建时就会报错，而不是抽到一半才失败。
+    """
+
+    name = ""
+
+    def __init__(self, space, min_gap, rng):
+        self.space = space
+        self.min_gap = min_gap
+        self.rng = rng
+
+    def neighbour_ranks(self, num, gap):
+        """num ±(gap-1) 邻域内合法号码的名次区间"""
+        return range(self.space.rank(num - gap + 1), self.space.rank(num + gap))
+
+    @abstractmethod
+    def mark_used(self, number):
+        ...
+
+    @abstractmethod
+    def exclude(self, numbers):
+        ...
+
+    @abstractmethod
+    def unmark_used(self, number):
+        ...
+
+    @abstractmethod
+    def unexclude(self, numbers):
+        ...
+
+    @abstractmethod
+    def reset(self):
+        """清空已抽/排除状态"""
+
+    @abstractmethod
+    def is_safe(self, number):
+        ...
+
+    @abstractmethod
+    def is_available(self, number):
+        ...
+
+    @abstractmethod
+    def count_safe(self):
+        ...
+
+    @abstractmethod
+    def count_available(self):
+        ...
+
+    @abstractmethod
+    def rank_states(self, lo, hi, numbers=None):
+        """名次 [lo, hi) 的状态数组（uint8，STATE_*）；numbers 为这些名次对应的号码（已知时传入）"""
+
+    @abstractmethod
+    def pick_safe(self):
+        ...
+
+    @abstractmethod
+    def sample_safe(self, size, np_rng):
+        ...
+
+    @abstractmethod
+    def pick_available(self):
+        ...
+
+    @abstractmethod
+    def memory_usage(self) -> dict:
+        """各项状态缓冲区占用的字节数"""
+
+
+def _select_bit(word, k):
+    """word 中第k个（从0计）置1位的位置"""
+    for _ in range(k):
+        word &= word - 1
+    return (word & -word).bit_length() - 1
+
+
+class DenseIndexStrategy(DrawStrategy):
+    """稠密索引：每个号码 1 bit 记录已抽/被邻号占用/被排除
+
+    两棵按 64 位字计数的树状数组分别统计未抽出/安全号码，
+    先 O(log n) 定位到字，再在字内选位，整体每号码约 3.2 bit。
+    """
+
+    name = "dense"
+
+    def __init__(self, space, min_gap, rng):
+        super().__init__(space, min_gap, rng)
+        size = len(space)
+        self._used = Bitset(size)
+        self._blocked = Bitset(size)
+        self._excluded = Bitset(size)
+
+        # 最后一个字可能不满 64 位
+        words = self._used.words
+        self._tail_mask = (1 << (size - (words - 1) * Bitset.WORD_BITS)) - 1 if words else 0
+        counts = [Bitset.WORD_BITS] * words
+        if words:
+            counts[-1] = self._tail_mask.bit_count()
+        self._free_index = FenwickTree.from_counts(counts)
+        self._safe_index = FenwickTree.from_counts(counts)
+        self._pristine = self._free_index.snapshot()
+
+    def reset(self):
+        self._used.clear()
+        self._blocked.clear()
+        self._excluded.clear()
+        self._free_index.restore(self._pristine)
+        self._safe_index.restore(self._pristine)
+
+    def _word_mask(self, w):
+        return self._tail_mask if w == self._used.words - 1 else (1 << Bitset.WORD_BITS) - 1
+
+    def _free_word(self, w):
+        return ~(self._used.word(w) | self._excluded.word(w)) & self._word_mask(w)
+
+    def _safe_word(self, w):
+        return self._free_word(w) & ~self._blocked.word(w)
+
+    def _is_free(self, rank):
+        return not (self._used[rank] or self._excluded[rank])
+
+    def _is_safe_rank(self, rank):
+        return self._is_free(rank) and not self._blocked[rank]
+
+    def _remove(self, rank, bitset):
+        """把 rank 记入 used/excluded，同步两棵计数树"""
+        if self._is_free(rank):
+            self._free_index.add(rank >> 6, -1)
+            if not self._blocked[rank]:
+                self._safe_index.add(rank >> 6, -1)
+        bitset.set(rank)
+
+    def mark_used(self, number):
+        """登记中奖号码，只更新其 ±min_gap 邻域内的索引"""
+        self._remove(self.space.rank(number), self._used)
+        for rank in self.neighbour_ranks(number, self.min_gap):
+            if not self._blocked[rank]:
+                if self._is_free(rank):
+                    self._safe_index.add(rank >> 6, -1)
+                self._blocked.set(rank)
+
+    def exclude(self, numbers):
+        for number in numbers:
+            if number in self.space:
+                self._remove(self.space.rank(number), self._excluded)
+
+    def _restore(self, rank, bitset):
+        """从 used/excluded 中清掉 rank，同步两棵计数树"""
+        if not bitset[rank]:
+            return
+        bitset.discard(rank)
+        if self._is_free(rank):
+            self._free_index.add(rank >> 6, 1)
+            if not self._blocked[rank]:
+                self._safe_index.add(rank >> 6, 1)
+
+    def _has_used_near(self, number):
+        return any(self._used[rank] for rank in self.neighbour_ranks(number, self.min_gap))
+
+    def unmark_used(self, number):
+        """撤销中奖号码：邻域内不再被其他已抽号码占用的位置恢复为安全"""
+        self._restore(self.space.rank(number), self._used)
+        for rank in self.neighbour_ranks(number, self.min_gap):
+            if self._blocked[rank] and not self._has_used_near(self.space[rank]):
+                self._blocked.discard(rank)
+                if self._is_free(rank):
+                    self._safe_index.add(rank >> 6, 1)
+
+    def unexclude(self, numbers):
+        for number in numbers:
+            if number in self.space:
+                self._restore(self.space.rank(number), self._excluded)
+
+    def is_safe(self, number):
+        return self._is_safe_rank(self.space.rank(number))
+
+    def is_available(self, number):
+        return self._is_free(self.space.rank(number))
+
+    def count_safe(self):
+        return self._safe_index.total()
+
+    def count_available(self):
+        return self._free_index.total()
+
+    def _pick(self, index, word_of):
+        remaining = index.total()
+        if remaining <= 0:
+            return None
+        w, k = index.locate(self.rng.randrange(remaining))
+        return self.space[w * Bitset.WORD_BITS + _select_bit(word_of(w), k)]
+
+    def pick_safe(self):
+        return self._pick(self._safe_index, self._safe_word)
+
+    def pick_available(self):
+        return self._pick(self._free_index, self._free_word)
+
+    def sample_safe(self, size, np_rng):
+        def bits(bitset):
+            return np.frombuffer(bitset.buffer, dtype=np.uint8)
+
+        unsafe = bits(self._used) | bits(self._excluded) | bits(self._blocked)
+        safe = np.unpackbits(~unsafe, count=len(self.space), bitorder="little")
+        safe_ranks = np.flatnonzero(safe)
+        if not len(safe_ranks):
+            return safe_ranks
+        return self.space.unrank_array(safe_ranks[np_rng.integers(0, len(safe_ranks), size)])
+
+    def rank_states(self, lo, hi, numbers=None):
+        """直接从三个位图的缓冲区解出 [lo, hi) 的状态，只解包覆盖到的字节"""
+        def bits(bitset):
+            raw = np.frombuffer(bitset.buffer, dtype=np.uint8)[lo >> 3:(hi + 7) >> 3]
+            return np.unpackbits(raw, bitorder="little")[lo & 7:(lo & 7) + hi - lo].view(bool)
+
+        states = np.full(hi - lo, STATE_FREE, dtype=np.uint8)
+        states[bits(self._blocked)] = STATE_BLOCKED
+        states[bits(self._excluded)] = STATE_EXCLUDED
+        states[bits(self._used)] = STATE_USED
+        return states
+
+    def memory_usage(self):
+        return {
+            "used": self._used.nbytes,
+            "blocked": self._blocked.nbytes,
+            "excluded": self._excluded.nbytes,
+            "free_index": self._free_index.nbytes,
+            "safe_index": self._safe_index.nbytes,
+        }
+
+
+class SparseRejectionStrategy(DrawStrategy):
+    """稀疏拒绝采样：随机抽名次，对照已抽号码的有序数组检查间隔
+
+    号码池很大、中奖号码很少时期望 O(1) 次即可抽中，几乎不占内存。
+    重试超过 MAX_RETRIES 次抛出 PoolCrowded，由引擎切换到稠密索引；
+    若号码池太大无法建稠密索引，则以 exact=True 走精确的名次跳过算法。
+    """
+
+    name = "sparse"
+    MAX_RETRIES = 64
+    INSORT_LIMIT = 64  # exclude 一次新增不超过这么多号码时逐个插入，否则整体归并
+
+    def __init__(self, space, min_gap, rng):
+        super().__init__(space, min_gap, rng)
+        self._winners = array('q')   # 已抽号码，升序
+        self._excluded = array('q')  # 被排除的号码，升序
+
+    def reset(self):
+        del self._winners[:]
+        del self._excluded[:]
+
+    def mark_used(self, number):
+        bisect.insort(self._winners, number)
+
+    def exclude(self, numbers):
+        """只插入新增的号码：每次抽奖排除同家庭号码时不重排整个排除表"""
+        new = sorted({n for n in numbers if n in self.space and not self._is_excluded(n)})
+        if not new:
+            return
+        if len(new) <= self.INSORT_LIMIT:
+            for number in new:
+                bisect.insort(self._excluded, number)
+        else:
+            # 批量排除（黑名单等）时两个有序序列归并一次
+            self._excluded = array('q', heapq.merge(self._excluded, new))
+
+    def unmark_used(self, number):
+        i = bisect.bisect_left(self._winners, number)
+        if i < len(self._winners) and self._winners[i] == number:
+            del self._winners[i]
+
+    def unexclude(self, numbers):
+        for number in set(numbers):
+            i = bisect.bisect_left(self._excluded, number)
+            if i < len(self._excluded) and self._excluded[i] == number:
+                del self._excluded[i]
+
+    def _is_within(self, num, gap):
+        """num 与某个已抽号码的距离是否小于 gap"""
+        i = bisect.bisect_left(self._winners, num - gap + 1)
+        return i < len(self._winners) and self._winners[i] < num + gap
+
+    def _is_excluded(self, num):
+        i = bisect.bisect_left(self._excluded, num)
+        return i < len(self._excluded) and self._excluded[i] == num
+
+    def is_safe(self, number):
+        return not (self._is_within(number, self.min_gap) or self._is_excluded(number))
+
+    def is_available(self, number):
+        return not (self._is_within(number, 1) or self._is_excluded(number))
+
+    def count_safe(self):
+        return len(self.space) - len(self._excluded_ranks(self.min_gap))
+
+    def count_available(self):
+        return len(self.space) - len(self._excluded_ranks(1))
+
+    def _pick(self, gap, exact):
+        size = len(self.space)
+        if size == 0:
+            return None
+        if not exact:
+            for _ in range(self.MAX_RETRIES):
+                num = self.space[self.rng.randrange(size)]
+                if not (self._is_within(num, gap) or self._is_excluded(num)):
+                    return num
+            raise PoolCrowded()
+        return self._pick_exact(gap)
+
+    def _excluded_ranks(self, gap):
+        """已抽号码 ±(gap-1) 邻域及被排除号码的名次（升序）"""
+        excluded = {self.space.rank(num) for num in self._excluded}
+        for used in self._winners:
+            excluded.update(self.neighbour_ranks(used, gap))
+        return sorted(excluded)
+
+    def _pick_exact(self, gap):
+        """排除已抽号码邻域及被排除号码的名次后均匀抽取"""
+        excluded = self._excluded_ranks(gap)
+        remaining = len(self.space) - len(excluded)
+        if remaining <= 0:
+            return None
+        # 先在剩余号码中抽名次，再跳过被排除的名次映射回号码空间
+        r = self.rng.randrange(remaining)
+        for rank in excluded:
+            if rank > r:
+                break
+            r += 1
+        return self.space[r]
+
+    def pick_safe(self, exact=False):
+        return self._pick(self.min_gap, exact)
+
+    def pick_available(self, exact=False):
+        return self._pick(1, exact)
+
+    def sample_safe(self, size, np_rng, exact=False):
+        if exact:
+            num = self._pick_exact(self.min_gap)
+            return np.array([] if num is None else [num], dtype=np.int64)
+        if not len(self.space):
+            return np.array([], dtype=np.int64)
+        winners = np.array(self._winners, dtype=np.int64)
+        excluded = np.array(self._excluded, dtype=np.int64)
+        for _ in range(self.MAX_RETRIES):
+            candidates = self.space.unrank_array(np_rng.integers(0, len(self.space), size))
+            candidates = candidates[
+                valid_gap_mask(winners, candidates, self.min_gap)
+                & valid_gap_mask(excluded, candidates, 1)
+            ]
+            if len(candidates):
+                return candidates
+        raise PoolCrowded()
+
+    def rank_states(self, lo, hi, numbers=None):
+        if numbers is None:
+            numbers = self.space.unrank_array(np.arange(lo, hi))
+        winners = np.array(self._winners, dtype=np.int64)
+        states = np.full(hi - lo, STATE_FREE, dtype=np.uint8)
+        states[~valid_gap_mask(winners, numbers, self.min_gap)] = STATE_BLOCKED
+        # 两个数组都是升序的，间隔 1 即“不等于任何一个”
+        states[~valid_gap_mask(np.array(self._excluded, dtype=np.int64), numbers, 1)] = STATE_EXCLUDED
+        states[~valid_gap_mask(winners, numbers, 1)] = STATE_USED
+        return states
+
+    def memory_usage(self):
+        return {
+            "winners": len(self._winners) * self._winners.itemsize,
+            "excluded": len(self._excluded) * self._excluded.itemsize,
+        }
@@ -0,0 +1,61 @@
+# core/export.py
+"""抽奖结果导出（CSV / JSON），逐行写入文件对象，结果再多也不会在内存里拼出整个文件"""
+
+import csv
+import json
+
+PROGRESS_EVERY = 10_000  # 每写出这么多行回报一次进度
+
+
+def _rows(prize_drawn, name_of):
+    for prize_name, winners in prize_drawn.items():
+        for i, number in enumerate(winners, 1):
+            row = [prize_name, i, number]
+            if name_of:
+                row.append(name_of(number) or "")
+            yield row
+
+
+def write_csv(prize_drawn, f, name_of=None, progress=None):
+    """写出 奖项,序号,号码[,姓名]；progress(已写行数, 总行数)"""
+    total = sum(len(w) for w in prize_drawn.values())
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(["奖项", "序号", "号码"] + (["姓名"] if name_of else []))
+    for done, row in enumerate(_rows(prize_drawn, name_of), 1):
+        writer.writerow(row)
+        if progress and done % PROGRESS_EVERY == 0:
+            progress(done, total)
+    if progress:
+        progress(total, total)
+
+
+def write_json(prize_drawn, f, name_of=None, progress=None, extra=None):
+    """写出 {"results": {奖项: [号码]}, "guests": {...}, **extra}，逐个号码写入"""
+    total = sum(len(w) for w in prize_drawn.values())
+    done = 0
+
+    def dump_section(key, value_of):
+        nonlocal done
+        f.write(f'    {json.dumps(key)}: {{')
+        for p, (prize_name, winners) in enumerate(prize_drawn.items()):
+            f.write(",\n" if p else "\n")
+            f.write(f"        {json.dumps(prize_name, ensure_ascii=False)}: [")
+            for i, number in enumerate(winners):
+                f.write(", " if i else "")
+                f.write(json.dumps(value_of(number), ensure_ascii=False))
+                done += 1
+                if progress and done % PROGRESS_EVERY == 0:
+                    progress(done, total * (2 if name_of else 1))
+            f.write("]")
+        f.write("\n    }")
+
+    f.write("{\n")
+    dump_section("results", lambda n: n)
+    if name_of:
+        f.write(",\n")
+        dump_section("guests", name_of)
+    for key, value in (extra or {}).items():
+        f.write(f",\n    {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}")
+    f.write("\n}\n")
+    if progress:
+        progress(done, done)
@@ -0,0 +1,116 @@
+# core/fairness.py
+"""公平性分析：用真实的 LotteryEngine 模拟大量整场抽奖，统计每个号码的中奖概率
+
+邻号间隔规则和“优先安全号码”的退路会让边缘号码、孤立号码更容易中奖，
+这里直接跑引擎本身（draw_many 的向量化批量抽取），而不是另写一套近似模型。
+模拟分成若干批交给进程池，每个进程只建一次引擎、每场只 reset()，
+批与批之间没有依赖，耗时随 CPU 核数线性下降。
+"""
+
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .lottery_engine import LotteryEngine
+
+POOL_LIMIT = 2_000_000  # 逐号统计需要 O(号码池) 的计数数组
+BATCHES_PER_WORKER = 4  # 每个进程至少分几批，批数越多进度越细
+BATCH_SESSIONS = 2_000  # 每批最多模拟的场数，决定进度刷新和停止的响应速度
+
+_engine = None  # 进程内复用的引擎
+_numbers = None  # 号码池（升序），计数数组的下标
+
+
+def _build_engine(config):
+    engine = LotteryEngine()
+    # 预生成方案只是把同样的抽取过程提前做完，模拟时按普通模式抽
+    engine.apply_config({**config, "precompute": False})
+    return engine, engine.pool_numbers()
+
+
+def _init_worker(config):
+    global _engine, _numbers
+    _engine, _numbers = _build_engine(config)
+
+
+def _simulate(sessions, seed):
+    """在本进程的引擎上连抽 sessions 场，返回每个号码的中奖次数"""
+    counts = np.zeros(len(_numbers), dtype=np.int64)
+    for i in range(sessions):
+        _engine.reset(seed if i == 0 else None)
+        winners = [n for drawn in _engine.draw_all().values() for n in drawn]
+        np.add.at(counts, np.searchsorted(_numbers, winners), 1)
+    return counts
+
+
+def chi_square(counts, sessions, winners_per_session):
+    """各号码中奖次数相对“人人等概率”的卡方统计量，返回 (卡方, 自由度, p值)
+
+    每场抽出 m 个不同号码时，单个号码每场中奖的概率为 p = m/n，
+    中奖次数近似 Binomial(场数, p)，故用二项方差 S·p·(1-p) 标准化；
+    p 值用 Wilson–Hilferty 近似（自由度很大时足够精确，不依赖 scipy）。
+    """
+    n = len(counts)
+    p = winners_per_session / n
+    expected = sessions * p
+    variance = expected * (1 - p)
+    dof = n - 1
+    if dof < 1 or variance <= 0:
+        return 0.0, dof, 1.0
+    chi2 = float(((counts - expected) ** 2).sum() / variance)
+    h = 2 / (9 * dof)
+    z = ((chi2 / dof) ** (1 / 3) - (1 - h)) / math.sqrt(h)
+    return chi2, dof, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def run_fairness(config: dict, sessions: int, workers=None, seed=None,
+                 progress=None, cancelled=None) -> dict:
+    """模拟 sessions 场抽奖（配置需已校验），返回统计结果
+
+        numbers      号码池（升序）
+        probability  每个号码在一场中中奖的频率
+        expected     人人等概率时每个号码的中奖概率
+        chi2, dof, p_value   见 chi_square()
+
+    progress(已完成场数, 总场数) 在主调线程中回调；cancelled() 返回 True 时尽快停止，
+    结果只统计已完成的场次。
+    """
+    _, numbers = _build_engine(config)
+    if len(numbers) > POOL_LIMIT:
+        raise ValueError(f"号码池共 {len(numbers)} 个号码，超过公平性分析支持的上限 {POOL_LIMIT}")
+    needed = sum(p["count"] for p in config["prizes"])
+
+    workers = workers or os.cpu_count() or 1
+    batches = min(sessions, max(workers * BATCHES_PER_WORKER, -(-sessions // BATCH_SESSIONS)))
+    sizes = [sessions // batches + (i < sessions % batches) for i in range(batches)]
+    seeds = random.Random(seed).sample(range(1 << 62), batches)
+
+    counts = np.zeros(len(numbers), dtype=np.int64)
+    done = 0
+    # spawn：子进程不继承界面线程等状态，各平台行为一致
+    with ProcessPoolExecutor(workers, multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(config,)) as pool:
+        futures = {pool.submit(_simulate, n, s): n for n, s in zip(sizes, seeds)}
+        for future in as_completed(futures):
+            counts += future.result()
+            done += futures[future]
+            if progress:
+                progress(done, sessions)
+            if cancelled and cancelled():
+                pool.shutdown(cancel_futures=True)
+                break
+
+    chi2, dof, p_value = chi_square(counts, done, needed)
+    return {
+        "sessions": done,
+        "numbers": numbers,
+        "probability": counts / max(done, 1),
+        "expected": needed / len(numbers),
+        "chi2": chi2,
+        "dof": dof,
+        "p_value": p_value,
+    }
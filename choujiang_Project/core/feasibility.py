@@ -0,0 +1,120 @@
+# core/feasibility.py
+"""可行性分析：号码池能否在满足邻号间隔的前提下抽完所有奖项
+
+一组号码中最多能选出多少个两两间隔 >= gap 的号码？直线上的点，
+从小到大“能选就选”的贪心即为最优解。号码空间不展开：区间拆成按十进制
+对齐的整块（前缀 + k 位任意数字），块内贪心的结果只取决于
+(k, 前缀的自动机状态, 进入块时的偏移)，记忆化后 10^9 级的范围也只需几千步；
+保留号码等额外排除的号码把区间切成若干段，贪心逐段接续。
+名单（TicketSpace）的票号是显式数组，直接顺序扫描。
+"""
+
+import numpy as np
+
+from .households import HouseholdIndex
+from .number_space import NumberSpace
+from .roster import Roster
+from .rules import NumberRules
+
+
+class _BlockGreedy:
+    """在数字自动机描述的号码空间上做按块记忆化的贪心"""
+
+    def __init__(self, automaton, gap):
+        self.fa = automaton
+        self.gap = gap
+        self._memo = {}
+
+    def block(self, k, state, offset):
+        """10^k 个号码的整块（前缀停在 state）中从第 offset 个起贪心
+
+        返回 (选中个数, 下一个允许的号码相对块末尾之后的偏移)。
+        """
+        size = 10 ** k
+        if offset >= size or self.fa.tail_count(k, state) == 0:
+            return 0, max(offset - size, 0)
+        if k == 0:
+            return 1, self.gap - 1
+        key = (k, state, offset)
+        if key not in self._memo:
+            count = 0
+            for d in range(10):
+                chosen, offset = self.block(k - 1, self.fa.delta[state][d], offset)
+                count += chosen
+            self._memo[key] = (count, offset)
+        return self._memo[key]
+
+    def _blocks(self, lo, hi):
+        """把 [lo, hi] 从小到大拆成对齐整块 (起点, k, 前缀状态)，前缀不含前导零"""
+        x = lo
+        while x <= hi:
+            k = 0
+            while (x % 10 ** (k + 1) == 0 and x >= 10 ** (k + 1)
+                   and x + 10 ** (k + 1) - 1 <= hi):
+                k += 1
+            state = 0
+            for ch in str(x // 10 ** k):
+                state = self.fa.delta[state][int(ch)]
+                if state == self.fa.DEAD:
+                    break
+            yield x, k, state
+            x += 10 ** k
+
+    def run(self, lo, hi, nxt):
+        """在 [lo, hi] 上接着贪心，nxt 为下一个允许的号码；返回 (选中个数, 新的 nxt)"""
+        count = 0
+        for base, k, state in self._blocks(lo, hi):
+            chosen, offset = self.block(k, state, max(nxt - base, 0))
+            count += chosen
+            nxt = base + 10 ** k + offset
+        return count, nxt
+
+
+def max_spaced_count(space, excluded, gap) -> int:
+    """号码池（space 去掉 excluded）中最多能选出多少个两两间隔 >= gap 的号码"""
+    excluded = np.asarray(excluded, dtype=np.int64)
+    if not isinstance(space, NumberSpace):
+        numbers = space.unrank_array(np.arange(len(space)))
+        count, nxt = 0, None
+        for n in numbers[~np.isin(numbers, excluded)].tolist():
+            if nxt is None or n >= nxt:
+                count += 1
+                nxt = n + gap
+        return count
+
+    greedy = _BlockGreedy(space.automaton, gap)
+    count, nxt, lo = 0, space.start, space.start
+    for e in excluded.tolist() + [space.end + 1]:
+        if lo < e:
+            chosen, nxt = greedy.run(lo, e - 1, nxt)
+            count += chosen
+        lo = e + 1
+    return count
+
+
+def available_count(space, excluded, households) -> int:
+    """可参与抽奖的号码数，每个家庭只计一人"""
+    pool_size = len(space) - len(excluded)
+    excluded_set = set(np.asarray(excluded).tolist())
+    for members in households.groups():
+        in_pool = sum(1 for n in members if n in space and n not in excluded_set)
+        pool_size -= max(in_pool - 1, 0)
+    return pool_size
+
+
+def analyze(config: dict, min_gap: int) -> dict:
+    """分析一份已校验的配置（见 core.config.validate_config）
+
+    返回 {"needed": 奖项总人数, "pool": 可用号码数（家庭只计一人）,
+          "spaced": 最多能保持间隔的中奖人数（不考虑家庭）}。
+    needed 超过 spaced 时，抽到后面会退而使用相邻号码。
+    """
+    roster = Roster.load(config["roster"]) if config["roster"] else None
+    space, excluded = NumberRules.from_config(config["rules"]).compile(
+        config["start"], config["end"], roster.tickets if roster is not None else None
+    )
+    return {
+        "needed": sum(p["count"] for p in config["prizes"]),
+        "pool": available_count(space, excluded, HouseholdIndex(config["households"])),
+        "spaced": max_spaced_count(space, excluded, min_gap),
+    }
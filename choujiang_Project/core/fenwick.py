@@ -0,0 +1,73 @@
+# core/fenwick.py
+
+from array import array
+
+
+class FenwickTree:
+    """非负计数树状数组（顺序统计索引）
+
+    支持 O(log n) 的单点增减、前缀和，以及按名次定位第k个计数单位所在的位置。
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = array('i', bytes(4 * (size + 1)))
+        self._top = 1 << size.bit_length() if size else 0
+
+    @classmethod
+    def from_counts(cls, counts) -> "FenwickTree":
+        """由各位置的计数 O(n) 构造"""
+        tree = cls(len(counts))
+        t = tree._tree
+        for i, c in enumerate(counts, 1):
+            t[i] += c
+            j = i + (i & -i)
+            if j <= tree.size:
+                t[j] += t[i]
+        return tree
+
+    def snapshot(self) -> array:
+        return array('i', self._tree)
+
+    def restore(self, snapshot: array):
+        """原地恢复到 snapshot 时的状态（整块内存拷贝）"""
+        self._tree[:] = snapshot
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._tree) * self._tree.itemsize
+
+    def add(self, index: int, delta: int):
+        """位置 index（从0计）加上 delta"""
+        i = index + 1
+        tree = self._tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """[0, index) 的和"""
+        total = 0
+        i = index
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> int:
+        return self.prefix_sum(self.size)
+
+    def locate(self, k: int):
+        """第k个（从0计）计数单位所在的位置，以及它在该位置内的序号"""
+        pos = 0
+        remaining = k + 1
+        step = self._top
+        tree = self._tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and tree[nxt] < remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return pos, remaining - 1
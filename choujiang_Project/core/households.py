@@ -0,0 +1,84 @@
+# core/households.py
+
+class HouseholdIndex:
+    """家庭分组索引：号码 → 家庭ID
+
+    分组声明可以有交集（如 [1, 2] 与 [2, 3]），用并查集合并成同一个家庭；
+    合并完成后压缩成 号码→家庭ID 的哈希表和 家庭ID→成员 的数组，
+    抽奖时查询同组号码是 O(1) 查表，与来宾总数无关。
+    """
+
+    def __init__(self, groups=()):
+        self._parent = {}
+        self._group_of = {}
+        self._members = []
+        self._dirty = False
+        for members in groups:
+            self.add_group(members)
+
+    def _find(self, n):
+        root = n
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # 路径压缩
+        while self._parent[n] != root:
+            self._parent[n], n = root, self._parent[n]
+        return root
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            self._parent[rb] = ra
+
+    def add_group(self, members):
+        members = [int(n) for n in members]
+        if not members:
+            return
+        for n in members:
+            self._parent.setdefault(n, n)
+        for n in members[1:]:
+            self._union(members[0], n)
+        self._dirty = True
+
+    def _build(self):
+        """把并查集压缩成 号码→家庭ID 与 家庭ID→成员"""
+        roots = {}
+        self._members = []
+        self._group_of = {}
+        for n in sorted(self._parent):
+            root = self._find(n)
+            if root not in roots:
+                roots[root] = len(self._members)
+                self._members.append([])
+            gid = roots[root]
+            self._group_of[n] = gid
+            self._members[gid].append(n)
+        self._dirty = False
+
+    def group_of(self, n):
+        """号码所属家庭ID，不属于任何家庭时返回 None"""
+        if self._dirty:
+            self._build()
+        return self._group_of.get(n)
+
+    def members(self, gid):
+        if self._dirty:
+            self._build()
+        return self._members[gid]
+
+    def others(self, n):
+        """与 n 同一家庭的其他号码"""
+        gid = self.group_of(n)
+        if gid is None:
+            return []
+        return [m for m in self._members[gid] if m != n]
+
+    def groups(self):
+        if self._dirty:
+            self._build()
+        return list(self._members)
+
+    def __len__(self):
+        if self._dirty:
+            self._build()
+        return len(self._members)
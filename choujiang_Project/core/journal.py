@@ -0,0 +1,142 @@
+# core/journal.py
+
+import json
+import os
+import sqlite3
+import time
+
+
+def default_journal_path():
+    """抽奖日志默认位置：~/.wedding_lottery/journal.sqlite3"""
+    folder = os.path.join(os.path.expanduser("~"), ".wedding_lottery")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, "journal.sqlite3")
+
+
+class DrawJournal:
+    """抽奖日志：SQLite（WAL 模式）保存当前一场抽奖的配置和每个中奖号码
+
+    每次 set_settings / reset 开启一个新场次（旧场次随之删除），撤销/补抽时
+    整体改写当前场次。每个中奖号码追加一行，单次写入只是一次 WAL 追加，
+    不会拖慢 stop_draw；程序崩溃后最近一次提交的号码都在。每 SNAPSHOT_EVERY 个号码把结果
+    压缩成一个快照并删除已合并的日志行，恢复时读取 快照 + 日志尾部 即可。
+    """
+
+    SNAPSHOT_EVERY = 64
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 下 NORMAL 只在检查点时 fsync：进程崩溃不丢数据，提交无需等磁盘
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS session (
+                    id INTEGER PRIMARY KEY,
+                    created REAL NOT NULL,
+                    config TEXT NOT NULL,
+                    plan TEXT
+                );
+                CREATE TABLE IF NOT EXISTS snapshot (
+                    session_id INTEGER PRIMARY KEY,
+                    upto INTEGER NOT NULL,
+                    prize_drawn TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS draw (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL,
+                    prize TEXT NOT NULL,
+                    number INTEGER NOT NULL
+                );
+            """)
+        row = self._conn.execute("SELECT MAX(id) FROM session").fetchone()
+        self._session = row[0]
+        self._pending = 0
+
+    def close(self):
+        self._conn.close()
+
+    def start_session(self, config: dict, plan: dict = None):
+        """开始新场次，只保留这一场"""
+        with self._conn:
+            self._conn.execute("DELETE FROM draw")
+            self._conn.execute("DELETE FROM snapshot")
+            self._conn.execute("DELETE FROM session")
+            cur = self._conn.execute(
+                "INSERT INTO session (created, config, plan) VALUES (?, ?, ?)",
+                (
+                    time.time(),
+                    json.dumps(config, ensure_ascii=False),
+                    json.dumps(plan, ensure_ascii=False) if plan is not None else None,
+                ),
+            )
+        self._session = cur.lastrowid
+        self._pending = 0
+
+    def record(self, prize_name, numbers):
+        """追加一批中奖号码（同一事务提交）"""
+        if self._session is None or not numbers:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO draw (session_id, prize, number) VALUES (?, ?, ?)",
+                [(self._session, prize_name, int(n)) for n in numbers],
+            )
+        self._pending += len(numbers)
+        if self._pending >= self.SNAPSHOT_EVERY:
+            self.compact()
+
+    def _load_drawn(self):
+        """快照 + 快照之后的日志，返回 (prize_drawn, 最后一行日志序号)"""
+        row = self._conn.execute(
+            "SELECT upto, prize_drawn FROM snapshot WHERE session_id = ?", (self._session,)
+        ).fetchone()
+        upto, prize_drawn = (row[0], json.loads(row[1])) if row else (0, {})
+        for seq, prize, number in self._conn.execute(
+            "SELECT seq, prize, number FROM draw WHERE session_id = ? AND seq > ? ORDER BY seq",
+            (self._session, upto),
+        ):
+            prize_drawn.setdefault(prize, []).append(number)
+            upto = seq
+        return prize_drawn, upto
+
+    def compact(self):
+        """把日志合并进快照并删除已合并的日志行"""
+        if self._session is None:
+            return
+        prize_drawn, upto = self._load_drawn()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshot (session_id, upto, prize_drawn) VALUES (?, ?, ?)",
+                (self._session, upto, json.dumps(prize_drawn, ensure_ascii=False)),
+            )
+            self._conn.execute("DELETE FROM draw WHERE seq <= ?", (upto,))
+        self._pending = 0
+
+    def rewrite(self, config: dict, prize_drawn: dict):
+        """撤销/补抽后整体改写当前场次的配置和结果（少见操作，直接写成快照）"""
+        if self._session is None:
+            return
+        _, upto = self._load_drawn()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE session SET config = ? WHERE id = ?",
+                (json.dumps(config, ensure_ascii=False), self._session),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshot (session_id, upto, prize_drawn) VALUES (?, ?, ?)",
+                (self._session, upto, json.dumps(prize_drawn, ensure_ascii=False)),
+            )
+            self._conn.execute("DELETE FROM draw WHERE seq <= ?", (upto,))
+        self._pending = 0
+
+    def load(self):
+        """最近一场的 (配置, 预生成方案或 None, {奖项: [中奖号码]})，没有记录时返回 None"""
+        if self._session is None:
+            return None
+        config, plan = self._conn.execute(
+            "SELECT config, plan FROM session WHERE id = ?", (self._session,)
+        ).fetchone()
+        prize_drawn, _ = self._load_drawn()
+        return json.loads(config), json.loads(plan) if plan else None, prize_drawn
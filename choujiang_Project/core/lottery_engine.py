@@ -2,70 +2,380 @@
 
 import random
 
-def contains_digit_4(n: int) -> bool:
-    return '4' in str(n)
+import numpy as np
+
+from .alias import WeightedPicker
+from .config import validate_config
+from .draw_strategy import (
+    STATE_OUTSIDE, DenseIndexStrategy, PoolCrowded, SparseRejectionStrategy
+)
+from .feasibility import available_count, max_spaced_count
+from .households import HouseholdIndex
+from .roster import Roster
+from .rules import NumberRules
+from .session_plan import SessionPlan
 
 
 class LotteryEngine:
     MIN_GAP = 3  # 邻号最小间隔
+    DENSE_INDEX_LIMIT = 2_000_000  # 号码池不超过该规模时才允许建稠密索引
+    SPARSE_MAX_LOAD = 0.25  # 邻号占用比例不超过该值时使用拒绝采样
 
-    def __init__(self):
+    def __init__(self, rng=None, np_rng=None):
         self.start = 1
         self.end = 100
         self.prizes = []
-        self.used_numbers = set()
         self.prize_drawn = {}
-        self.valid_numbers = []
+        self._used = set()  # 所有已抽出的号码，随抽奖/撤销增量维护
+        self.rules = NumberRules()
+        self.households = HouseholdIndex()
+        self.roster = None
+        self.valid_numbers, self._excluded = self.rules.compile(self.start, self.end)
+        self._rng = rng or random.Random()
+        self._np_rng = np_rng or np.random.default_rng()  # 批量抽取（draw_many）用
+        self._weighted = WeightedPicker(self.valid_numbers, {}, self._rng)
+        self.plan = None
+        self.journal = None
+        self._strategy = self._choose_strategy()
+
+    def set_settings(self, start, end, prizes, rules=None, households=None, weights=None,
+                     precompute=False, roster=None):
+        """设置号码范围、奖项、排除规则（默认只排除含数字4的号码）、家庭分组和号码权重
+
+        households 为若干组号码，同一组视为一家人：其中一人中奖后，
+        同组其他号码不再参与抽奖。
+        weights 为 {号码: 权重}，未列出的号码权重为 1（如贵宾桌给 2~3 倍中奖机会）。
+        precompute=True 时立即用随机种子生成整场抽奖方案（见 SessionPlan），
+        抽奖时只按顺序揭晓，plan.commitment 可在抽奖前公布。
+        roster 为来宾名单（Roster），给定时只在名单票号中抽取（仍受范围和规则限制）。
+        """
+        rules = rules or NumberRules()
+        households = HouseholdIndex(households or ())
+        # 数字规则编译成号码空间（数位DP，不展开成列表），名单/自定义规则预先求值成排除数组
+        valid_numbers, excluded = rules.compile(
+            start, end, roster.tickets if roster is not None else None
+        )
+        weighted = WeightedPicker(valid_numbers, weights or {}, self._rng)
+
+        # 检查号码是否足够：每个家庭最多只能有一人中奖
+        pool_size = available_count(valid_numbers, excluded, households)
+        total_needed = sum(p["count"] for p in prizes)
+        if pool_size < total_needed:
+            raise ValueError(
+                f"可用号码不足！范围 [{start}, {end}] 中符合规则（{rules.describe()}）"
+                f"且每个家庭只计一人的号码共 {pool_size} 个，"
+                f"但奖项总共需要 {total_needed} 个。"
+            )
 
-    def set_settings(self, start, end, prizes):
         self.start = start
         self.end = end
         self.prizes = prizes
-        self.used_numbers.clear()
+        self.rules = rules
+        self.households = households
+        self.roster = roster
+        self.valid_numbers = valid_numbers
+        self._excluded = excluded
+        self._weighted = weighted
         self.prize_drawn = {p["name"]: [] for p in prizes}
+        self._used = set()
+        self._strategy = self._choose_strategy()
+        self.plan = None
+        if precompute:
+            if rules.predicates:
+                raise ValueError("自定义规则无法写入抽奖方案，不能预生成")
+            self.plan = SessionPlan.generate(self.to_config(), self.MIN_GAP)
+        self._start_journal_session()
 
-        # 生成不含数字4的号码池
-        self.valid_numbers = [
-            n for n in range(start, end + 1)
-            if not contains_digit_4(n)
-        ]
+    def apply_config(self, config: dict):
+        """校验配置文件格式的配置（见 core.config）并一次性应用"""
+        config = validate_config(config)
+        self.set_settings(
+            config["start"], config["end"], config["prizes"],
+            NumberRules.from_config(config["rules"]),
+            config["households"], config["weights"],
+            precompute=config["precompute"],
+            roster=Roster.load(config["roster"]) if config["roster"] else None,
+        )
 
-        # 检查号码是否足够
-        total_needed = sum(p["count"] for p in prizes)
-        if len(self.valid_numbers) < total_needed:
-            raise ValueError(
-                f"可用号码不足！范围 [{start}, {end}] 中不含4的号码共 {len(self.valid_numbers)} 个，"
-                f"但奖项总共需要 {total_needed} 个。"
+    def to_config(self) -> dict:
+        """当前配置（可 JSON 序列化，格式同 lottery_config）"""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "prizes": [{"name": p["name"], "count": p["count"]} for p in self.prizes],
+            "rules": self.rules.to_config(),
+            "households": [list(g) for g in self.households.groups()],
+            "weights": {str(n): w for n, w in sorted(self._weighted.weights.items())},
+            "roster": self.roster.path if self.roster is not None else "",
+        }
+
+    def guest_name(self, number):
+        """中奖号码对应的来宾姓名（导入了来宾名单时），否则返回 None"""
+        return self.roster.name_of(number) if self.roster is not None else None
+
+    def reset(self, seed=None):
+        """清空抽奖结果，保留号码范围、奖项配置和排除规则（状态缓冲区原地清零）
+
+        给定 seed 时同时重设随机数种子（模拟、彩排复现用）。随机数对象原地重设，
+        抽号策略和加权表持有的是同一个对象。
+        """
+        if seed is not None:
+            self._rng.seed(seed)
+            self._np_rng = np.random.default_rng(seed)
+        self.prize_drawn = {p["name"]: [] for p in self.prizes}
+        self._used.clear()
+        self._strategy.reset()
+        self._strategy.exclude(self._excluded.tolist())
+        self._weighted.reset()
+        self._start_journal_session()
+
+    def _start_journal_session(self):
+        if self.journal is not None:
+            self.journal.start_session(
+                self.to_config(), self.plan.reveal() if self.plan is not None else None
             )
 
-    def _is_too_close(self, num):
-        """检查号码是否与已抽出的号码间隔小于5"""
+    def resume(self, journal):
+        """挂上抽奖日志；日志中有上一场抽奖时恢复其配置、方案和已抽号码，返回是否恢复"""
+        self.journal = None
+        state = journal.load()
+        if state is not None:
+            config, plan, prize_drawn = state
+            self.apply_config(config)
+            if plan is not None:
+                self.plan = SessionPlan.from_reveal(plan)
+            for prize_name, numbers in prize_drawn.items():
+                drawn = self.prize_drawn[prize_name]
+                for number in numbers:
+                    self._commit_winner(number, drawn)
+        self.journal = journal
+        return state is not None
+
+    @property
+    def pool_size(self):
+        """号码池大小：号码空间扣除名单/自定义规则排除的号码"""
+        return len(self.valid_numbers) - len(self._excluded)
+
+    def pool_numbers(self):
+        """号码池中的全部号码（升序，已去掉名单/自定义规则排除的号码）"""
+        numbers = self.valid_numbers.unrank_array(np.arange(len(self.valid_numbers)))
+        return numbers[~np.isin(numbers, self._excluded)]
+
+    @property
+    def spaced_capacity(self):
+        """号码池中最多能有多少人中奖而号码仍两两间隔 >= MIN_GAP"""
+        return max_spaced_count(self.valid_numbers, self._excluded, self.MIN_GAP)
+
+    def number_states(self, lo, hi):
+        """号码 [lo, hi] 逐个的状态（uint8）：draw_strategy.STATE_*，
+        不在号码空间内的（含禁用数字、不在名单中）为 STATE_OUTSIDE"""
+        numbers = np.arange(lo, hi + 1, dtype=np.int64)
+        inside = self.valid_numbers.contains_array(numbers)
+        states = np.full(len(numbers), STATE_OUTSIDE, dtype=np.uint8)
+        if inside.any():
+            # 区间内的合法号码名次连续
+            valid = numbers[inside]
+            first = self.valid_numbers.rank(int(valid[0]))
+            states[inside] = self._strategy.rank_states(first, first + len(valid), valid)
+        return states
+
+    def rolling_numbers(self, size, rng):
+        """滚动动画用：随机取 size 个当前仍可能抽中的号码（可重复、已打乱）
+
+        去掉已中奖、被排除和中奖者同家庭的号码；号码池较大时只抽样一批名次，
+        不展开整个号码空间。没有可抽号码时返回空数组。
+        """
+        n = len(self.valid_numbers)
+        ranks = np.arange(n) if n <= 4 * size else rng.integers(0, n, 4 * size)
+        numbers = self.valid_numbers.unrank_array(ranks)
+        taken = set(self._excluded.tolist())
         for used in self.used_numbers:
-            if abs(num - used) < self.MIN_GAP:
-                return True
-        return False
+            taken.add(used)
+            taken.update(self.households.others(used))
+        numbers = numbers[~np.isin(numbers, np.fromiter(taken, dtype=np.int64, count=len(taken)))]
+        if not len(numbers):
+            return numbers
+        return rng.choice(numbers, size)
 
-    def draw_once(self, prize_name):
+    @property
+    def used_numbers(self):
+        """所有已抽出的号码（引擎内部维护的集合，调用方只读不改）"""
+        return self._used
+
+    def state_size(self):
+        """抽奖状态占用的内存（字节），按缓冲区分项，另附策略名与合计"""
+        usage = self._strategy.memory_usage()
+        return {"strategy": self._strategy.name, **usage, "total": sum(usage.values())}
+
+    def _choose_strategy(self):
+        """按号码池密度和 MIN_GAP 自动选择抽号策略
+
+        所有奖项抽完后被邻号规则占掉的比例不超过 SPARSE_MAX_LOAD 时，
+        拒绝采样期望几次即可抽中，用稀疏策略；否则建稠密索引。
+        """
+        size = self.pool_size
+        total_needed = sum(p["count"] for p in self.prizes)
+        load = total_needed * (2 * self.MIN_GAP - 1) / size if size else 1
+        if len(self.valid_numbers) > self.DENSE_INDEX_LIMIT or load <= self.SPARSE_MAX_LOAD:
+            return self._build_strategy(SparseRejectionStrategy)
+        return self._build_strategy(DenseIndexStrategy)
+
+    def _build_strategy(self, strategy_cls):
+        """创建策略并登记排除号码和已抽号码"""
+        strategy = strategy_cls(self.valid_numbers, self.MIN_GAP, self._rng)
+        strategy.exclude(self._excluded.tolist())
+        for used in self.used_numbers:
+            strategy.mark_used(used)
+            strategy.exclude(self.households.others(used))
+        return strategy
+
+    def _pick(self, kind, *args):
+        """调用策略的抽号方法（pick_safe / pick_available / sample_safe），号码池拥挤时升级策略"""
+        try:
+            return getattr(self._strategy, kind)(*args)
+        except PoolCrowded:
+            if len(self.valid_numbers) > self.DENSE_INDEX_LIMIT:
+                return getattr(self._strategy, kind)(*args, exact=True)
+            # 拒绝采样频繁落空：改用稠密索引
+            self._strategy = self._build_strategy(DenseIndexStrategy)
+            return getattr(self._strategy, kind)(*args)
+
+    def _pick_weighted(self, kind):
+        """按号码权重抽取：kind 为 safe（间隔安全的号码）或 available（任意未抽出的号码）"""
+        return self._weighted.pick(
+            lambda n: getattr(self._strategy, f"is_{kind}")(n),
+            lambda n: self._strategy.is_available(n),
+            lambda: self._pick(f"pick_{kind}"),
+            lambda: getattr(self._strategy, f"count_{kind}")(),
+        )
+
+    @property
+    def weights(self):
+        """{号码: 权重}，只含号码空间内显式指定的号码"""
+        return dict(self._weighted.weights)
+
+    def _prize_state(self, prize_name):
+        """返回 (奖项配置, 该奖项已抽出的号码列表)"""
         prize_info = next((p for p in self.prizes if p["name"] == prize_name), None)
         if not prize_info:
             raise ValueError(f"未知奖项：{prize_name}")
+        return prize_info, self.prize_drawn[prize_name]
+
+    def _commit_winner(self, winner, drawn):
+        self._strategy.mark_used(winner)
+        # 同一家庭的其他号码不再参与抽奖：查表 O(1)，只更新这一家的号码
+        self._strategy.exclude(self.households.others(winner))
+        drawn.append(winner)
+        self._used.add(winner)
 
-        drawn = self.prize_drawn[prize_name]
+    def draw_once(self, prize_name):
+        prize_info, drawn = self._prize_state(prize_name)
         if len(drawn) >= prize_info["count"]:
             return None
 
-        # 排除已使用的号码
-        available = [n for n in self.valid_numbers if n not in self.used_numbers]
-        if not available:
-            raise RuntimeError("所有不含4的号码已抽完！")
-
-        # 优先选择间隔>=5的号码
-        safe_numbers = [n for n in available if not self._is_too_close(n)]
-        
-        # 如果没有安全号码，退而求其次使用所有可用号码
-        pool = safe_numbers if safe_numbers else available
-        
-        winner = random.choice(pool)
-        self.used_numbers.add(winner)
-        drawn.append(winner)
-        return winner
\ No newline at end of file
+        # 预生成方案：直接揭晓下一个号码
+        # 否则优先选择间隔>=MIN_GAP的号码，没有则退而求其次使用所有可用号码
+        if self.plan is not None:
+            winner = self.plan.winner(prize_name, len(drawn))
+        elif self._weighted:
+            winner = self._pick_weighted("safe")
+            if winner is None:
+                winner = self._pick_weighted("available")
+        else:
+            winner = self._pick("pick_safe")
+            if winner is None:
+                winner = self._pick("pick_available")
+        if winner is None:
+            raise RuntimeError("所有可用号码已抽完！")
+
+        self._commit_winner(winner, drawn)
+        if self.journal is not None:
+            self.journal.record(prize_name, [winner])
+        return winner
+
+    def revoke(self, prize_name, number, blacklist=False):
+        """撤销一个中奖号码（如中奖人不在场）
+
+        该号码的邻号和同家庭号码恢复可抽，策略索引只在其邻域内增量更新；
+        blacklist=True 时该号码加入保留号码，不再参与抽奖。
+        """
+        if self.plan is not None:
+            raise RuntimeError("预生成方案模式下不能撤销中奖号码")
+        _, drawn = self._prize_state(prize_name)
+        if number not in drawn:
+            raise ValueError(f"{number} 不是「{prize_name}」的中奖号码")
+
+        drawn.remove(number)
+        self._used.discard(number)
+        self._strategy.unmark_used(number)
+        excluded = set(self._excluded.tolist())
+        self._strategy.unexclude(
+            [n for n in self.households.others(number) if n not in excluded]
+        )
+        if blacklist:
+            self.rules = NumberRules(
+                self.rules.exclude_digits, self.rules.exclude_endings,
+                self.rules.blacklist + [number], self.rules.predicates,
+            )
+            self._excluded = np.union1d(self._excluded, np.array([number], dtype=np.int64))
+            self._strategy.exclude([number])
+        # 别名表可能已剔除了失效的加权号码，撤销后重新建表
+        self._weighted.reset()
+        self._rewrite_journal()
+
+    def redraw(self, prize_name, number, blacklist=False):
+        """撤销中奖号码并为同一奖项补抽一个，新号码占用原号码的位置，返回新号码"""
+        _, drawn = self._prize_state(prize_name)
+        index = drawn.index(number) if number in drawn else len(drawn)
+        self.revoke(prize_name, number, blacklist)
+        winner = self.draw_once(prize_name)
+        drawn.insert(index, drawn.pop())
+        self._rewrite_journal()
+        return winner
+
+    def _rewrite_journal(self):
+        if self.journal is not None:
+            self.journal.rewrite(self.to_config(), self.prize_drawn)
+
+    def draw_many(self, prize_name, k):
+        """一次抽出某奖项的 k 个号码（不超过剩余名额），返回新增的中奖号码列表
+
+        从当前安全号码中向量化地批量采样候选，再按顺序逐个复核：
+        仍然安全的候选即中奖，并立即更新索引。每个被接受的候选都是在
+        “当时的安全号码”中均匀抽取的，结果分布与逐个调用 draw_once 相同。
+        没有安全号码后，剩余名额按 draw_once 的退路规则逐个抽取。
+        设置了号码权重或预生成了方案时逐个抽取（单次 O(1)）。
+        """
+        prize_info, drawn = self._prize_state(prize_name)
+        k = min(k, prize_info["count"] - len(drawn))
+        winners = []
+        while len(winners) < k and self.plan is None and not self._weighted:
+            candidates = self._pick("sample_safe", 4 * (k - len(winners)), self._np_rng)
+            if not len(candidates):
+                break
+            for num in candidates.tolist():
+                if len(winners) >= k:
+                    break
+                if self._strategy.is_safe(num):
+                    self._commit_winner(num, drawn)
+                    winners.append(num)
+        if self.journal is not None:
+            self.journal.record(prize_name, winners)
+
+        while len(winners) < k:
+            winners.append(self.draw_once(prize_name))
+        return winners
+
+    def draw_all(self, sequential=False):
+        """按奖项顺序抽完所有奖项的剩余名额，返回 {奖项: [中奖号码]}
+
+        sequential=True 时逐个 draw_once，随机数的消耗顺序与预生成方案一致。
+        """
+        for prize in self.prizes:
+            remaining = prize["count"] - len(self.prize_drawn[prize["name"]])
+            if sequential:
+                for _ in range(remaining):
+                    self.draw_once(prize["name"])
+            else:
+                self.draw_many(prize["name"], remaining)
+        return self.prize_drawn
@@ -0,0 +1,323 @@
+# core/number_space.py
+
+import numpy as np
+
+
+class DigitAutomaton:
+    """号码数字规则的有限自动机
+
+    按十进制数字从高位到低位读入号码：
+    含 banned_digits 中任一数字 —— 落入死状态；
+    以 banned_endings 中任一尾号结尾 —— 读完时停在拒绝状态（Aho-Corasick 多模式匹配）。
+    数位DP在自动机状态上计数，因此任意条数字规则都只影响预处理，不影响单次查询。
+    """
+
+    DEAD = -1
+
+    def __init__(self, banned_digits=(4,), banned_endings=()):
+        self.banned_digits = frozenset(int(d) for d in banned_digits)
+        self.banned_endings = tuple(sorted({str(e) for e in banned_endings if str(e)}))
+
+        # 尾号模式的 trie
+        goto = [{}]
+        terminal = [False]
+        for pattern in self.banned_endings:
+            state = 0
+            for ch in pattern:
+                d = int(ch)
+                if d not in goto[state]:
+                    goto.append({})
+                    terminal.append(False)
+                    goto[state][d] = len(goto) - 1
+                state = goto[state][d]
+            terminal[state] = True
+
+        # BFS 补全失配转移，得到完整的 DFA
+        n = len(goto)
+        self.delta = [[self.DEAD] * 10 for _ in range(n)]
+        fail = [0] * n
+        order = [0]
+        for state in order:
+            for d in range(10):
+                if d in goto[state]:
+                    nxt = goto[state][d]
+                    fail[nxt] = self.delta[fail[state]][d] if state else 0
+                    terminal[nxt] = terminal[nxt] or terminal[fail[nxt]]
+                    self.delta[state][d] = nxt
+                    order.append(nxt)
+                else:
+                    self.delta[state][d] = self.delta[fail[state]][d] if state else 0
+        # 失配转移全部算完后再封死禁用数字，避免死状态被当作失配目标
+        for row in self.delta:
+            for d in self.banned_digits:
+                row[d] = self.DEAD
+        self.accepting = [not t for t in terminal]
+        self.num_states = n
+        self._tail_counts = [[1 if a else 0 for a in self.accepting]]
+        self._tables = {}
+        self._delta_table = None
+
+    def tail_count(self, length: int, state: int) -> int:
+        """从 state 出发再读 length 个任意数字后被接受的数字串个数"""
+        if state == self.DEAD:
+            return 0
+        counts = self._tail_counts
+        while len(counts) <= length:
+            prev = counts[-1]
+            counts.append([
+                sum(prev[t] for t in self.delta[s] if t != self.DEAD)
+                for s in range(self.num_states)
+            ])
+        return counts[length][state]
+
+    def tail_table(self, length: int) -> np.ndarray:
+        """tail_count 的表格形式，末尾附一行死状态（全0），供向量化查询（只读，已缓存）"""
+        table = self._tables.get(length)
+        if table is None:
+            self.tail_count(length, 0)
+            table = np.array(self._tail_counts[length] + [0], dtype=np.int64)
+            table.flags.writeable = False
+            self._tables[length] = table
+        return table
+
+    def delta_table(self) -> np.ndarray:
+        """转移表，死状态映射到最后一行（只读，已缓存）"""
+        if self._delta_table is None:
+            dead = self.num_states
+            table = [[dead if t == self.DEAD else t for t in row] for row in self.delta]
+            table.append([dead] * 10)
+            self._delta_table = np.array(table, dtype=np.int64)
+            self._delta_table.flags.writeable = False
+        return self._delta_table
+
+    def accepts(self, n: int) -> bool:
+        state = 0
+        for ch in str(n):
+            state = self.delta[state][int(ch)]
+            if state == self.DEAD:
+                return False
+        return self.accepting[state]
+
+    def accepts_array(self, numbers) -> np.ndarray:
+        """accepts 的向量化版本：对非负整数数组逐位并行跑自动机"""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        delta = self.delta_table()
+        state = np.zeros(len(numbers), dtype=np.int64)
+        if not len(numbers):
+            return state.astype(bool)
+        power = 1
+        while power * 10 <= numbers.max():
+            power *= 10
+        # 从最高位往低位读；位数不足的号码在读到自己的最高位之前保持初始状态
+        while power >= 1:
+            started = (numbers >= power) | (power == 1)
+            digit = numbers // power % 10
+            state = np.where(started, delta[state, digit], state)
+            power //= 10
+        accepting = np.array(self.accepting + [False])
+        return accepting[state]
+
+
+class NumberSpace:
+    """[start, end] 内满足数字规则的号码空间（默认：不含数字4）
+
+    不展开成列表：用数位DP计数，按名次（rank）定位第k个号码，
+    单次查询 O(位数)，因此支持 10^9 级别的号码范围。
+    对外表现为只读序列：len()、下标访问、in、迭代。
+    """
+
+    def __init__(self, start: int, end: int, automaton: DigitAutomaton = None):
+        if start < 0 or end < start:
+            raise ValueError(f"号码范围无效：[{start}, {end}]")
+        self.start = start
+        self.end = end
+        self.automaton = automaton or DigitAutomaton()
+        self._length_counts = {}
+        # 起点之前的合法号码数，unrank/rank 都以它为基准
+        self._offset = self._count_below(start)
+        self._size = self._count_below(end + 1) - self._offset
+
+    # ---------- 数位DP ----------
+
+    def _first_digits(self, length: int):
+        return range(1, 10) if length > 1 else range(10)
+
+    def _count_with_length(self, length: int) -> int:
+        """恰好 length 位的合法非负整数个数（按位数缓存，rank/unrank 每次都要用）"""
+        count = self._length_counts.get(length)
+        if count is None:
+            fa = self.automaton
+            count = sum(fa.tail_count(length - 1, fa.delta[0][d]) for d in self._first_digits(length))
+            self._length_counts[length] = count
+        return count
+
+    def _count_below(self, x: int) -> int:
+        """[0, x) 中合法号码的个数"""
+        if x <= 0:
+            return 0
+        fa = self.automaton
+        digits = str(x)
+        length = len(digits)
+        total = sum(self._count_with_length(l) for l in range(1, length))
+
+        # 与 x 同长度、且小于 x 的号码：逐位枚举更小的数字
+        state = 0
+        for i, ch in enumerate(digits):
+            d = int(ch)
+            lo = 1 if (i == 0 and length > 1) else 0
+            for c in range(lo, d):
+                total += fa.tail_count(length - i - 1, fa.delta[state][c])
+            state = fa.delta[state][d]
+            if state == fa.DEAD:
+                return total
+        return total
+
+    def _unrank_global(self, k: int) -> int:
+        """第k个（从0计）合法非负整数"""
+        length = 1
+        while k >= self._count_with_length(length):
+            k -= self._count_with_length(length)
+            length += 1
+
+        fa = self.automaton
+        result = 0
+        state = 0
+        for i in range(length):
+            digits = self._first_digits(length) if i == 0 else range(10)
+            for c in digits:
+                nxt = fa.delta[state][c]
+                block = fa.tail_count(length - i - 1, nxt)
+                if k < block:
+                    break
+                k -= block
+            result = result * 10 + c
+            state = nxt
+        return result
+
+    def unrank_array(self, ranks) -> np.ndarray:
+        """批量把名次映射为号码（向量化的 __getitem__，不做越界检查）"""
+        k = np.asarray(ranks, dtype=np.int64) + self._offset
+        result = np.zeros_like(k)
+        delta = self.automaton.delta_table()
+
+        # 按位数分组，组内逐位在 10 个候选数字的累计计数上做向量化查找
+        lo, hi = (int(k.min()), int(k.max())) if len(k) else (0, -1)
+        length, base = 1, 0
+        while True:
+            count = self._count_with_length(length)
+            # 比最小名次还短的位数整组跳过
+            in_group = (k >= base) & (k < base + count) if base + count > lo else None
+            if in_group is not None and in_group.any():
+                rest = k[in_group] - base
+                rows = np.arange(len(rest))
+                state = np.zeros_like(rest)
+                value = np.zeros_like(rest)
+                for i in range(length):
+                    blocks = self.automaton.tail_table(length - i - 1)[delta[state]]
+                    if i == 0 and length > 1:
+                        blocks[:, 0] = 0
+                    # 累计计数首次超过剩余名次的位置即为这一位的数字
+                    cum = np.cumsum(blocks, axis=1)
+                    digit = (cum <= rest[:, None]).sum(axis=1)
+                    rest = rest - (cum[rows, digit] - blocks[rows, digit])
+                    value = value * 10 + digit
+                    state = delta[state, digit]
+                result[in_group] = value
+            base += count
+            if base > hi:
+                return result
+            length += 1
+
+    # ---------- 序列接口 ----------
+
+    def rank(self, n: int) -> int:
+        """范围内小于 n 的合法号码个数（n 本身合法时即为它的名次）"""
+        n = min(max(n, self.start), self.end + 1)
+        return self._count_below(n) - self._offset
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, k: int) -> int:
+        if k < 0:
+            k += self._size
+        if not 0 <= k < self._size:
+            raise IndexError("号码名次越界")
+        return self._unrank_global(self._offset + k)
+
+    def __contains__(self, n) -> bool:
+        return (
+            isinstance(n, int)
+            and self.start <= n <= self.end
+            and self.automaton.accepts(n)
+        )
+
+    def contains_array(self, numbers) -> np.ndarray:
+        """__contains__ 的向量化版本"""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        inside = (numbers >= self.start) & (numbers <= self.end)
+        inside[inside] = self.automaton.accepts_array(numbers[inside])
+        return inside
+
+    def __iter__(self):
+        # 分块批量 unrank，避免逐个号码做数字检查
+        chunk = 1 << 16
+        for lo in range(0, self._size, chunk):
+            yield from self.unrank_array(np.arange(lo, min(lo + chunk, self._size))).tolist()
+
+    def __repr__(self):
+        return f"NumberSpace({self.start}, {self.end}, size={self._size})"
+
+
+class TicketSpace:
+    """任意（不连续）票号集合上的号码空间，接口与 NumberSpace 相同
+
+    票号保存为升序数组（可以是内存映射数组），数字规则预先向量化过滤；
+    名次即数组下标，rank 为二分查找。
+    """
+
+    def __init__(self, tickets, automaton: DigitAutomaton = None):
+        self.automaton = automaton or DigitAutomaton()
+        tickets = np.asarray(tickets, dtype=np.int64)
+        mask = self.automaton.accepts_array(tickets)
+        # 全部符合规则时直接沿用（内存映射的）原数组，不复制
+        self._tickets = tickets if mask.all() else tickets[mask]
+        self.start = int(self._tickets[0]) if len(self._tickets) else 0
+        self.end = int(self._tickets[-1]) if len(self._tickets) else -1
+
+    def unrank_array(self, ranks) -> np.ndarray:
+        return np.asarray(self._tickets[np.asarray(ranks, dtype=np.int64)], dtype=np.int64)
+
+    def rank(self, n: int) -> int:
+        return int(np.searchsorted(self._tickets, n, side="left"))
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def __getitem__(self, k: int) -> int:
+        if k < 0:
+            k += len(self._tickets)
+        if not 0 <= k < len(self._tickets):
+            raise IndexError("号码名次越界")
+        return int(self._tickets[k])
+
+    def __contains__(self, n) -> bool:
+        if not isinstance(n, (int, np.integer)):
+            return False
+        i = self.rank(n)
+        return i < len(self._tickets) and self._tickets[i] == n
+
+    def contains_array(self, numbers) -> np.ndarray:
+        numbers = np.asarray(numbers, dtype=np.int64)
+        i = np.searchsorted(self._tickets, numbers)
+        inside = i < len(self._tickets)
+        inside[inside] = self._tickets[i[inside]] == numbers[inside]
+        return inside
+
+    def __iter__(self):
+        chunk = 1 << 16
+        for lo in range(0, len(self._tickets), chunk):
+            yield from self._tickets[lo:lo + chunk].tolist()
+
+    def __repr__(self):
+        return f"TicketSpace(size={len(self._tickets)})"
@@ -1,8 +1,51 @@
+import numpy as np
+
+
+def contains_digits_array(numbers, digits=(4,)) -> np.ndarray:
+    """逐元素判断号码是否含有 digits 中的任一数字（纯整数运算，不做字符串转换）"""
+    x = np.array(numbers, dtype=np.int64, copy=True).reshape(-1)
+    hit = np.zeros(x.shape, dtype=bool)
+    if 0 in digits:
+        hit |= x == 0
+    while True:
+        active = x > 0
+        if not active.any():
+            return hit
+        d = x % 10
+        for digit in digits:
+            hit |= active & (d == digit)
+        x //= 10
+
+
+def contains_digit_4_array(numbers) -> np.ndarray:
+    return contains_digits_array(numbers, (4,))
+
+
+def filter_numbers_without_4_array(start: int, end: int) -> np.ndarray:
+    numbers = np.arange(start, end + 1, dtype=np.int64)
+    return numbers[~contains_digit_4_array(numbers)]
+
+
+def valid_gap_mask(selected, candidates, min_gap: int = 5) -> np.ndarray:
+    """逐元素判断候选号码与 selected（升序）中所有号码的间隔是否都>=min_gap
+
+    对每个候选二分查找 >= candidate-min_gap+1 的第一个已选号码，
+    它只要不落在 candidate+min_gap 之前即满足间隔要求。
+    """
+    candidates = np.asarray(candidates, dtype=np.int64).reshape(-1)
+    # 末尾加一个哨兵，二分结果总能取到“右侧最近的已选号码”
+    selected = np.append(np.asarray(selected, dtype=np.int64), np.iinfo(np.int64).max)
+    nearest = selected[np.searchsorted(selected, candidates - min_gap + 1)]
+    return nearest >= candidates + min_gap
+
+
 def contains_digit_4(n: int) -> bool:
-    return '4' in str(n)
+    return bool(contains_digit_4_array(n)[0])
+
 
 def filter_numbers_without_4(start: int, end: int) -> list[int]:
-    return [n for n in range(start, end + 1) if not contains_digit_4(n)]
+    return filter_numbers_without_4_array(start, end).tolist()
+
 
 def is_valid_gap(selected: list[int], candidate: int, min_gap: int = 5) -> bool:
-    return all(abs(candidate - x) >= min_gap for x in selected)
\ No newline at end of file
+    return bool(valid_gap_mask(np.sort(np.asarray(list(selected), dtype=np.int64)), candidate, min_gap)[0])
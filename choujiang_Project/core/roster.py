@@ -0,0 +1,118 @@
+# core/roster.py
+
+import csv
+import hashlib
+import os
+import re
+
+import numpy as np
+
+
+def _cache_dir():
+    folder = os.path.join(os.path.expanduser("~"), ".wedding_lottery", "roster_cache")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def parse_roster(path):
+    """读取来宾名单，返回 [(票号, 姓名)]
+
+    .csv 按 CSV 解析（第一列票号、第二列姓名，首行不是数字时视为表头）；
+    其他文本文件每行“票号 姓名”，票号与姓名之间用逗号、制表符或空格分隔。
+    姓名可以省略。
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = ([cell.strip() for cell in row] for row in csv.reader(f))
+        else:
+            rows = (re.split(r"[,，\t ]+", line.strip(), maxsplit=1) for line in f)
+        entries = []
+        for lineno, row in enumerate(rows, 1):
+            if not row or not row[0]:
+                continue
+            ticket = row[0]
+            if not ticket.isdigit():
+                if lineno == 1:
+                    continue  # 表头
+                raise ValueError(f"名单第 {lineno} 行的票号不是数字：{ticket}")
+            entries.append((int(ticket), row[1].strip() if len(row) > 1 else ""))
+    if not entries:
+        raise ValueError("名单中没有票号")
+    return entries
+
+
+class Roster:
+    """来宾名单：票号升序数组 + 票号→姓名索引
+
+    名单不大时用哈希表查姓名，O(1)；超过 MMAP_THRESHOLD 人时，
+    票号数组和姓名按票号顺序写成缓存文件并以内存映射方式打开，
+    再次打开同一份名单不需要重新解析，查姓名为映射数组上的二分查找。
+    抽奖过程中都只查内存/映射页，不会逐次读文件。
+    """
+
+    MMAP_THRESHOLD = 200_000
+
+    def __init__(self, tickets, names, path=""):
+        self.path = path
+        self.tickets = tickets
+        self._names = names
+        self._index = None
+        if isinstance(names, list):
+            self._index = dict(zip(tickets.tolist(), names))
+
+    @classmethod
+    def load(cls, path) -> "Roster":
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise ValueError(f"找不到来宾名单：{path}")
+        # 缓存以 路径+大小+修改时间 为键，名单文件改动后自动失效
+        key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+        cache = os.path.join(_cache_dir(), hashlib.sha256(key).hexdigest()[:32])
+        if os.path.exists(cache + ".names"):
+            return cls._open_cache(cache, path)
+
+        entries = parse_roster(path)
+        entries.sort()
+        tickets = np.fromiter((t for t, _ in entries), dtype=np.int64, count=len(entries))
+        duplicated = tickets[1:][tickets[1:] == tickets[:-1]]
+        if len(duplicated):
+            raise ValueError(f"名单中票号重复：{int(duplicated[0])}")
+        names = [name for _, name in entries]
+        if len(entries) <= cls.MMAP_THRESHOLD:
+            return cls(tickets, names, path)
+
+        encoded = [name.encode("utf-8") for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        np.save(cache + ".tickets.npy", tickets)
+        np.save(cache + ".offsets.npy", offsets)
+        # 姓名文件最后写入，作为缓存完整的标记
+        with open(cache + ".names.tmp", "wb") as f:
+            f.write(b"".join(encoded))
+        os.replace(cache + ".names.tmp", cache + ".names")
+        return cls._open_cache(cache, path)
+
+    @classmethod
+    def _open_cache(cls, cache, path):
+        tickets = np.load(cache + ".tickets.npy", mmap_mode="r")
+        offsets = np.load(cache + ".offsets.npy", mmap_mode="r")
+        if os.path.getsize(cache + ".names"):
+            blob = np.memmap(cache + ".names", dtype=np.uint8, mode="r")
+        else:
+            blob = np.zeros(0, dtype=np.uint8)
+        return cls(tickets, (offsets, blob), path)
+
+    def __len__(self):
+        return len(self.tickets)
+
+    def name_of(self, ticket):
+        """票号对应的姓名，不在名单中或未填写姓名时返回 None"""
+        if self._index is not None:
+            return self._index.get(ticket) or None
+        i = int(np.searchsorted(self.tickets, ticket))
+        if i >= len(self.tickets) or self.tickets[i] != ticket:
+            return None
+        offsets, blob = self._names
+        return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") or None
@@ -0,0 +1,102 @@
+# core/rules.py
+
+
+class NumberRules:
+    """号码排除规则
+
+    exclude_digits  —— 不能含有的数字，默认 [4]
+    exclude_endings —— 不能使用的尾号，如 ["13", "250"]
+    blacklist       —— 保留号码（座位号、工作人员号等），不参与抽奖
+    predicates      —— 自定义规则：接收号码数组、返回“需要排除”布尔数组的函数，只能通过代码传入
+
+    compile() 把数字类规则编译成一个数字自动机（决定号码空间本身），
+    把名单和自定义规则预先求值成一个有序的排除号码数组，
+    抽奖时每个号码的检查代价与规则条数无关。
+    构造、校验和描述规则不依赖 NumPy（命令行校验配置时不必加载），
+    只有 compile() 才加载号码空间。
+    """
+
+    CONFIG_KEYS = ("exclude_digits", "exclude_endings", "blacklist")
+    PREDICATE_LIMIT = 2_000_000  # 自定义规则需要逐号求值，号码池不能超过该规模
+
+    def __init__(self, exclude_digits=(4,), exclude_endings=(), blacklist=(), predicates=()):
+        self.exclude_digits = sorted({int(d) for d in exclude_digits})
+        self.exclude_endings = sorted({str(e) for e in exclude_endings})
+        self.blacklist = sorted({int(n) for n in blacklist})
+        self.predicates = list(predicates)
+
+        for d in self.exclude_digits:
+            if not 0 <= d <= 9:
+                raise ValueError(f"排除数字必须是 0~9：{d}")
+        for e in self.exclude_endings:
+            if not e.isdigit():
+                raise ValueError(f"排除尾号只能由数字组成：{e}")
+
+    @classmethod
+    def from_config(cls, config: dict) -> "NumberRules":
+        """从配置中的 rules 段构造，缺省字段使用默认值"""
+        config = config or {}
+        unknown = set(config) - set(cls.CONFIG_KEYS)
+        if unknown:
+            raise ValueError(f"未知的排除规则：{', '.join(sorted(unknown))}")
+        return cls(
+            exclude_digits=config.get("exclude_digits", (4,)),
+            exclude_endings=config.get("exclude_endings", ()),
+            blacklist=config.get("blacklist", ()),
+        )
+
+    def to_config(self) -> dict:
+        return {
+            "exclude_digits": list(self.exclude_digits),
+            "exclude_endings": list(self.exclude_endings),
+            "blacklist": list(self.blacklist),
+        }
+
+    def describe(self) -> str:
+        digits = []
+        if self.exclude_digits:
+            digits.append("不含" + "、".join(str(d) for d in self.exclude_digits))
+        if self.exclude_endings:
+            digits.append("不以" + "、".join(self.exclude_endings) + "结尾")
+        parts = ["，".join(digits) or "无数字限制"]
+        if self.blacklist:
+            parts.append(f"保留号码 {len(self.blacklist)} 个")
+        if self.predicates:
+            parts.append(f"自定义规则 {len(self.predicates)} 条")
+        return "，".join(parts)
+
+    def compile(self, start: int, end: int, tickets=None):
+        """返回 (号码空间, 额外排除的号码数组)，排除号码升序且都在号码空间内
+
+        给定 tickets（升序票号数组）时，号码空间为其中落在 [start, end] 内的票号。
+        """
+        import numpy as np
+
+        from .number_space import DigitAutomaton, NumberSpace, TicketSpace
+
+        automaton = DigitAutomaton(self.exclude_digits, self.exclude_endings)
+        if tickets is None:
+            space = NumberSpace(start, end, automaton)
+        else:
+            lo, hi = np.searchsorted(tickets, [start, end + 1])
+            space = TicketSpace(tickets[lo:hi], automaton)
+        excluded = np.array(
+            [n for n in self.blacklist if n in space], dtype=np.int64
+        )
+
+        if self.predicates:
+            if len(space) > self.PREDICATE_LIMIT:
+                raise ValueError(
+                    f"号码池共 {len(space)} 个号码，超过自定义规则支持的上限 {self.PREDICATE_LIMIT}"
+                )
+            chunk = 1 << 16
+            parts = [excluded]
+            for lo in range(0, len(space), chunk):
+                numbers = space.unrank_array(np.arange(lo, min(lo + chunk, len(space))))
+                mask = np.zeros(len(numbers), dtype=bool)
+                for predicate in self.predicates:
+                    mask |= np.asarray(predicate(numbers), dtype=bool)
+                parts.append(numbers[mask])
+            excluded = np.unique(np.concatenate(parts))
+
+        return space, excluded
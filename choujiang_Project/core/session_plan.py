@@ -0,0 +1,146 @@
+# core/session_plan.py
+
+import hashlib
+import json
+import random
+import secrets
+
+PLAN_VERSION = 2  # 2：承诺中加入来宾名单文件的哈希
+
+
+class CounterRandom(random.Random):
+    """计数器模式伪随机数：第 i 个随机块 = SHA-256(种子 ‖ i)
+
+    输出只由种子和调用顺序决定，与 Python 版本、平台无关，
+    任何人拿到种子都能离线复现整场抽奖。
+    """
+
+    def __init__(self, seed: str):
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        self._key = str(a).encode("utf-8")
+        self._counter = 0
+        self.gauss_next = None
+
+    def getstate(self):
+        return self._key, self._counter
+
+    def setstate(self, state):
+        self._key, self._counter = state
+
+    def _block(self) -> int:
+        digest = hashlib.sha256(self._key + self._counter.to_bytes(8, "big")).digest()
+        self._counter += 1
+        return int.from_bytes(digest, "big")
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        blocks = (k + 255) // 256
+        value = 0
+        for _ in range(blocks):
+            value = (value << 256) | self._block()
+        return value >> (blocks * 256 - k)
+
+    def random(self) -> float:
+        return self.getrandbits(53) * 2.0 ** -53
+
+
+def _digest(payload: dict) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path) -> str:
+    """文件内容的 SHA-256（十六进制）"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _roster_sha256(settings: dict):
+    return file_sha256(settings["roster"]) if settings.get("roster") else None
+
+
+def replay(settings: dict, seed: str, min_gap: int) -> dict:
+    """用种子按奖项顺序逐个抽完所有奖项，返回 {奖项: [中奖号码]}"""
+    from .lottery_engine import LotteryEngine
+
+    engine = LotteryEngine(rng=CounterRandom(seed))
+    engine.MIN_GAP = min_gap
+    engine.apply_config(settings)
+    return engine.draw_all(sequential=True)
+
+
+class SessionPlan:
+    """整场抽奖的预生成方案（先承诺、后揭晓）
+
+    配置确定后用随机种子一次性算出所有奖项的中奖号码，先公布
+    commitment = SHA-256(版本, 种子, 配置, 名单哈希, 方案)；抽奖时每次停止只是按顺序
+    揭晓下一个号码。活动结束后公开 reveal()，任何人都可以用 verify()
+    核对哈希并用种子重新推演一遍，确认方案没有被事后改动。
+    配置里的来宾名单只是文件路径，所以名单文件内容的哈希也写进承诺，
+    推演前先核对，换掉或改动名单后验证不会通过。
+    """
+
+    def __init__(self, seed, settings, min_gap, winners, roster_sha256=None):
+        self.seed = seed
+        self.settings = settings
+        self.min_gap = min_gap
+        self.winners = winners
+        self.roster_sha256 = roster_sha256
+
+    @classmethod
+    def generate(cls, settings: dict, min_gap: int, seed: str = None) -> "SessionPlan":
+        seed = seed or secrets.token_hex(32)
+        return cls(seed, settings, min_gap, replay(settings, seed, min_gap), _roster_sha256(settings))
+
+    @classmethod
+    def from_reveal(cls, revealed: dict) -> "SessionPlan":
+        """由 reveal() 的结果还原（不重新推演）"""
+        return cls(revealed["seed"], revealed["settings"], revealed["min_gap"], revealed["winners"],
+                   revealed.get("roster_sha256"))
+
+    def _payload(self) -> dict:
+        return {
+            "version": PLAN_VERSION,
+            "seed": self.seed,
+            "settings": self.settings,
+            "roster_sha256": self.roster_sha256,
+            "min_gap": self.min_gap,
+            "winners": self.winners,
+        }
+
+    @property
+    def commitment(self) -> str:
+        return _digest(self._payload())
+
+    def winner(self, prize_name, index):
+        """某奖项第 index 个（从0计）中奖号码"""
+        return self.winners[prize_name][index]
+
+    def reveal(self) -> dict:
+        """活动结束后公开的完整方案（可直接保存为 JSON）"""
+        return {**self._payload(), "commitment": self.commitment}
+
+    @staticmethod
+    def verify(revealed: dict, commitment: str = None, roster: str = None) -> bool:
+        """核对公开方案：哈希与承诺一致，名单文件未被改动，且用种子重新推演得到相同的中奖号码
+
+        roster 为验证者手中的名单文件路径，缺省使用方案里记录的路径。
+        """
+        if revealed.get("version") != PLAN_VERSION:
+            raise ValueError(f"不支持的方案版本：{revealed.get('version')}")
+        keys = ("version", "seed", "settings", "roster_sha256", "min_gap", "winners")
+        payload = {k: revealed[k] for k in keys}
+        if _digest(payload) != (commitment or revealed.get("commitment")):
+            return False
+        settings = payload["settings"]
+        if settings.get("roster"):
+            settings = {**settings, "roster": roster or settings["roster"]}
+        if _roster_sha256(settings) != payload["roster_sha256"]:
+            return False
+        return replay(settings, payload["seed"], payload["min_gap"]) == payload["winners"]
@@ -1,23 +1,23 @@
 # main.py
 
+import multiprocessing
 import sys
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
-from ui.main_window import MainWindow
-from core.lottery_engine import LotteryEngine
+from ui.main_window import open_main_window
+from ui.theme import Theme
 
 
 def main():
     app = QApplication(sys.argv)
     font = QFont("PingFang SC", 12)
     app.setFont(font)
+    Theme.instance().load()  # 全局样式表，只解析这一次
 
-    engine = LotteryEngine()  # ✅ 空初始化
-
-    window = MainWindow(engine)
-    window.show()
+    window = open_main_window()  # 保持引用，窗口随程序存活
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 打包后公平性分析的进程池需要
     main()
\ No newline at end of file
@@ -1,141 +1,242 @@
 # ui/animated_label.py
 
-from PySide6.QtWidgets import QLabel, QGraphicsDropShadowEffect
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QColor
-import random
+import math
 
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QPointF, QRectF, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QLinearGradient, QPainter, QPixmap
+
+from .frame_clock import FrameClock
+from .shadow import DropShadow
+
+
+class AnimatedNumberLabel(QWidget):
+    """带滚动动画的号码显示控件
+
+    不经过 QLabel 的文字排版和样式表：每种样式的字符预先渲染成字形位图，
+    背景也只画一次，paintEvent 只是贴几张位图。滚动的号码取自预先打乱的
+    环形缓冲区（当前真正可抽的号码），每帧用到的字形元组在开始滚动时就备好。
+    动画由全局帧时钟驱动，按经过的时间换算出该显示哪一帧，帧变了才重绘。
+    """
+
+    rolling_finished = Signal(int)  # 减速结束、最终号码已显示
+
+    RING_SIZE = 256          # 环形缓冲区大小，取 2 的幂以便位与回绕
+    ROLL_PERIOD = 0.05       # 匀速滚动时每个号码停留的秒数
+    STOP_STEPS = 50          # 减速阶段依次显示的号码个数
+    STOP_DURATION = 2.5      # 减速阶段的秒数
+    RADIUS = 20
+    GLYPH_CHARS = "0123456789? "
+
+    # 样式：字号、字重、颜色、字间距、背景渐变（对角线方向或竖直方向）
+    STYLES = {
+        "idle": (72, QFont.Bold, "#c7c7cc", 8, ((0, "#ffffff"), (1, "#f5f5f7")), False),
+        "rolling": (72, QFont.Bold, "#667eea", 4, ((0, "#ffffff"), (1, "#f0f0ff")), False),
+        "winner": (80, QFont.ExtraBold, "#ffffff", 4,
+                   ((0, "#667eea"), (0.5, "#764ba2"), (1, "#f093fb")), True),
+    }
 
-class AnimatedNumberLabel(QLabel):
-    """带滚动动画的号码显示标签"""
-    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._current_number = 0
-        self.setAlignment(Qt.AlignCenter)
         self.setFixedSize(280, 140)
-        self._set_idle_style()
-        
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_random_number)
-        
-        self.min_val = 1
-        self.max_val = 999
+        self.rng = np.random.default_rng()  # 滚动号码的抽样与减速阶段取号用，不动引擎的随机数
+        self._glyphs = {}        # (样式, 设备像素比) → {字符: (字形位图, 字宽)}
+        self._backgrounds = {}   # (样式, 设备像素比) → 背景位图
+        self._numbers = []       # 环形缓冲区中的号码
+        self._ring = []          # 滚动帧：(文字, 样式, 字形元组, 总宽度)
+        self._index = 0
+        self._schedule = []      # 减速阶段依次显示的帧
+        self._frame = None
+        self._clock = FrameClock.instance()
+        self._started = 0.0      # 开始滚动 / 开始减速的时钟时间
+        self._duration = self.STOP_DURATION
+
         self.final_number = None
+        self.is_rolling = False
         self.is_stopping = False
-        self.step = 0
-        self.total_steps = 50
+        # 中奖发光：缓存的阴影位图，只在显示中奖号码时打开
+        self.glow = DropShadow(self, blur=30, color=QColor(102, 126, 234, 150), radius=self.RADIUS)
+        self._set_idle_style()
+
+    def text(self):
+        """当前显示的文字"""
+        return self._frame[0]
+
+    # ---------- 字形与帧 ----------
+
+    def _glyph_set(self, style):
+        key = (style, self.devicePixelRatioF())
+        if key not in self._glyphs:
+            self._glyphs[key] = self._render_glyphs(style, key[1])
+        return self._glyphs[key]
+
+    def _render_glyphs(self, style, ratio):
+        size, weight, color, _, _, _ = self.STYLES[style]
+        font = QFont(self.font())
+        font.setPixelSize(size)
+        font.setWeight(weight)
+        metrics = QFontMetrics(font)
+        glyphs = {}
+        for ch in self.GLYPH_CHARS:
+            advance = metrics.horizontalAdvance(ch)
+            pixmap = QPixmap(math.ceil(max(advance, 1) * ratio), math.ceil(metrics.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.TextAntialiasing)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(0, metrics.ascent(), ch)
+            painter.end()
+            glyphs[ch] = (pixmap, advance)
+        return glyphs
+
+    def _make_frame(self, text, style):
+        glyphs = self._glyph_set(style)
+        parts = tuple(glyphs[ch] for ch in text)
+        width = sum(advance for _, advance in parts) + self.STYLES[style][3] * (len(parts) - 1)
+        return (text, style, parts, width)
+
+    def _background(self, style):
+        ratio = self.devicePixelRatioF()
+        key = (style, ratio)
+        if key not in self._backgrounds:
+            stops, diagonal = self.STYLES[style][4], self.STYLES[style][5]
+            pixmap = QPixmap(math.ceil(self.width() * ratio), math.ceil(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            rect = QRectF(0, 0, self.width(), self.height())
+            gradient = QLinearGradient(
+                rect.topLeft(), rect.bottomRight() if diagonal else rect.bottomLeft()
+            )
+            for stop, color in stops:
+                gradient.setColorAt(stop, QColor(color))
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(gradient)
+            painter.drawRoundedRect(rect, self.RADIUS, self.RADIUS)
+            painter.end()
+            self._backgrounds[key] = pixmap
+        return self._backgrounds[key]
+
+    def paintEvent(self, event):
+        _, style, parts, width = self._frame
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(0, 0, self._background(style))
+        if not parts:
+            return
+        # 号码过长时整体缩小，而不是被裁掉
+        scale = min(1.0, (self.width() - 2 * self.RADIUS) / width) if width else 1.0
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.scale(scale, scale)
+        height = parts[0][0].deviceIndependentSize().height()
+        x, y = -width / 2, -height / 2
+        spacing = self.STYLES[style][3]
+        for pixmap, advance in parts:
+            painter.drawPixmap(QPointF(x, y), pixmap)
+            x += advance + spacing
+
+    # ---------- 样式 ----------
 
     def _set_idle_style(self):
         """待机状态样式"""
-        self.setText("? ? ?")
-        self.setGraphicsEffect(None)
-        self.setStyleSheet("""
-            QLabel {
-                font-size: 72px;
-                font-weight: 700;
-                color: #c7c7cc;
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #ffffff, stop:1 #f5f5f7);
-                border-radius: 20px;
-                letter-spacing: 8px;
-            }
-        """)
-    
+        self._frame = self._make_frame("? ? ?", "idle")
+        self.glow.set_active(False)
+        self.update()
+
     def show_final_number(self, number):
         """直接显示最终号码（用于恢复状态）"""
-        self.setText(str(number))
+        self.is_rolling = self.is_stopping = False
+        self._frame = self._make_frame(str(number), "winner")
         self._set_winner_style()
 
-    def _set_rolling_style(self):
-        """滚动中样式"""
-        self.setStyleSheet("""
-            QLabel {
-                font-size: 72px;
-                font-weight: 700;
-                color: #667eea;
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #ffffff, stop:1 #f0f0ff);
-                border-radius: 20px;
-                letter-spacing: 4px;
-            }
-        """)
-
     def _set_winner_style(self):
-        """中奖号码样式"""
-        self.setStyleSheet("""
-            QLabel {
-                font-size: 80px;
-                font-weight: 800;
-                color: #ffffff;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #667eea, stop:0.5 #764ba2, stop:1 #f093fb);
-                border-radius: 20px;
-                letter-spacing: 4px;
-            }
-        """)
-        
-        # 添加发光效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(30)
-        shadow.setOffset(0, 0)
-        shadow.setColor(QColor(102, 126, 234, 150))
-        self.setGraphicsEffect(shadow)
-
-    def start_rolling(self, min_val: int, max_val: int):
-        """开始无限滚动"""
-        self.min_val = min_val
-        self.max_val = max_val
+        """中奖号码样式：添加发光效果"""
+        self.glow.set_active(True)
+        self.update()
+
+    # ---------- 滚动 ----------
+
+    def _fill_ring(self, numbers):
+        """用号码填满环形缓冲区，并预先备好每一帧"""
+        numbers = [int(n) for n in numbers[:self.RING_SIZE]]
+        self._numbers = numbers
+        self._index = 0
+        if not numbers:
+            self._ring = [self._make_frame("? ? ?", "rolling")] * self.RING_SIZE
+            return
+        frames = {n: self._make_frame(str(n), "rolling") for n in set(numbers)}
+        self._ring = [frames[numbers[i % len(numbers)]] for i in range(self.RING_SIZE)]
+
+    def _build_schedule(self, final_number, total_steps):
+        """预先排好减速阶段依次显示的号码，最后几个逐渐靠近最终值"""
+        nearest = sorted(set(self._numbers), key=lambda n: abs(n - final_number))
+        frames = {}
+        schedule = []
+        for step in range(total_steps):
+            progress = step / total_steps
+            if progress > 0.6 and nearest:
+                # 号码逐渐靠近最终值：只在离它最近的一部分号码里取
+                k = max(1, round(len(nearest) * (1 - progress) * 2 / 3))
+                n = nearest[int(self.rng.integers(k))]
+                if n not in frames:
+                    frames[n] = self._make_frame(str(n), "rolling")
+                schedule.append(frames[n])
+            else:
+                schedule.append(self._ring[(self._index + step) & (self.RING_SIZE - 1)])
+        self._schedule = schedule
+
+    def start_rolling(self, numbers):
+        """开始无限滚动，numbers 为当前可抽的号码（见 LotteryEngine.rolling_numbers）"""
+        self._fill_ring(numbers)
+        self.is_rolling = True
         self.is_stopping = False
         self.final_number = None
-        self._set_rolling_style()
-        self.timer.start(50)
+        self.glow.set_active(False)
+        self._frame = self._ring[self._index]
+        self._started = self._clock.now()
+        self._clock.add(self._advance)
+        self.update()
 
     def stop_rolling(self, final_number: int):
-        """停止滚动并显示最终号码"""
-        self.final_number = final_number
-        self.is_stopping = True
-        self.step = 0
-        self.total_steps = 50  # 2.5秒减速
+        """停止滚动：减速 STOP_DURATION 秒后显示最终号码并发出 rolling_finished"""
+        self._stop_at(final_number, self.STOP_DURATION)
 
     def start_animation(self, min_val: int, max_val: int, final_number: int, duration_ms: int = 2500):
-        """兼容旧接口：直接开始并结束动画"""
-        self.min_val = min_val
-        self.max_val = max_val
+        """兼容旧接口：直接开始并结束动画（滚动号码从 [min_val, max_val] 中均匀抽取）"""
+        numbers = self.rng.integers(min_val, max_val, self.RING_SIZE, endpoint=True)
+        self.start_rolling(numbers.tolist())
+        self._stop_at(final_number, duration_ms / 1000)
+
+    def _stop_at(self, final_number, duration):
         self.final_number = final_number
-        self.step = 0
-        self.total_steps = duration_ms // 50
+        self._build_schedule(final_number, self.STOP_STEPS)
+        self._started = self._clock.now()
+        self._duration = duration
         self.is_stopping = True
-        self._set_rolling_style()
-        self.timer.start(50)
 
-    def _update_random_number(self):
+    def _advance(self, now):
+        """帧时钟回调：按经过的时间选出当前帧，返回 False 表示动画结束"""
+        if not self.is_rolling:
+            return False
+        elapsed = now - self._started
         if self.is_stopping:
-            self.step += 1
-            if self.step >= self.total_steps:
-                self.timer.stop()
-                self.setText(str(self.final_number))
-                self._set_winner_style()
-                return
-
-            # 减速效果：越接近结束，变化越慢
-            progress = self.step / self.total_steps
-            
-            # 动态调整定时器间隔（减速）
-            if progress > 0.7:
-                self.timer.setInterval(int(50 + (progress - 0.7) * 300))
-            
-            # 号码逐渐靠近最终值
-            if progress > 0.6:
-                offset = int((1 - progress) * (self.max_val - self.min_val) / 3)
-                low = max(self.min_val, self.final_number - offset)
-                high = min(self.max_val, self.final_number + offset)
-                num = random.randint(low, high)
-            else:
-                num = random.randint(self.min_val, self.max_val)
-            
-            self.setText(str(num))
+            t = elapsed / self._duration
+            if t >= 1:
+                self.show_final_number(self.final_number)
+                self.rolling_finished.emit(self.final_number)
+                return False
+            # 减速曲线（OutQuad）：进度先快后慢，号码越来越久才换一个
+            eased = 1 - (1 - t) * (1 - t)
+            frame = self._schedule[int(eased * len(self._schedule))]
         else:
-            # 无限滚动模式
-            num = random.randint(self.min_val, self.max_val)
-            self.setText(str(num))
+            # 匀速滚动：环形缓冲区按时间轮转
+            self._index = int(elapsed / self.ROLL_PERIOD) & (self.RING_SIZE - 1)
+            frame = self._ring[self._index]
+        if frame is not self._frame:
+            self._frame = frame
+            self._clock.request_update(self)
+        return True
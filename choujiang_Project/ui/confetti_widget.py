@@ -1,82 +1,143 @@
 # ui/confetti_widget.py
 
-from PySide6.QtWidgets import QWidget, QLabel
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QPoint
-from PySide6.QtGui import QFont, QPainter, QColor
-import random
+import math
 
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont, QFontMetrics, QPainter, QPixmap
 
-class ConfettiParticle(QLabel):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(30, 30)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.emojis = ["🎉", "🎊", "✨", "🎁", "🎈", "💎", "🌟", "💫", "🎀", "💝"]
-        self.setText(random.choice(self.emojis))
-        self.setFont(QFont("Arial", 20))
-        self.setStyleSheet("background: transparent;")
-        
-    def start_fall(self, start_x, start_y, end_y, duration):
-        self.move(start_x, start_y)
-        self.show()
-        
-        # 随机水平偏移
-        end_x = start_x + random.randint(-150, 150)
-        
-        self.anim = QPropertyAnimation(self, b"pos")
-        self.anim.setDuration(duration)
-        self.anim.setStartValue(QPoint(start_x, start_y))
-        self.anim.setEndValue(QPoint(end_x, end_y))
-        self.anim.setEasingCurve(QEasingCurve.OutQuad)
-        self.anim.finished.connect(self.deleteLater)
-        self.anim.start()
+from .frame_clock import FrameClock
 
 
 class ConfettiWidget(QWidget):
-    """彩带撒花效果 - 直接在父窗口内显示"""
-    
+    """彩带撒花效果 - 直接在父窗口内显示的一层透明覆盖控件
+
+    粒子不是子控件：位置、速度、出发时间都放在固定大小的 NumPy 数组里
+    （粒子池），每帧由全局帧时钟推进一次、整体向量化更新；emoji 预先
+    渲染进一张图集，paintEvent 只按图集里的位置逐个贴图。
+    每个父窗口只有一个实例（见 overlay()），多次撒花复用同一个粒子池。
+    """
+
+    EMOJIS = ["🎉", "🎊", "✨", "🎁", "🎈", "💎", "🌟", "💫", "🎀", "💝"]
+    SPRITE = 30              # 每个 emoji 的逻辑尺寸（像素）
+    POOL_SIZE = 4096         # 粒子池容量，同时在场的粒子超过时复用最早的
+    WAVE = 2.4               # 一次撒花的粒子在这么多秒内依次出发，产生波浪效果
+    GRAVITY = 0.5            # 重力加速度（父窗口高度 / 秒²）
+    MAX_DT = 0.05            # 单帧最多推进的秒数，卡顿后不会瞬移
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)  # 不阻挡鼠标事件
-        self.particles = []
-        
+        self._clock = FrameClock.instance()
+        self._last = 0.0         # 上一帧的时钟时间
+        self._animating = False
+        self._atlas = None
+        self._atlas_ratio = None
+        self._sources = []       # 每种 emoji 在图集中的源矩形（设备像素）
+
+        n = self.POOL_SIZE
+        self._x = np.zeros(n, dtype=np.float32)
+        self._y = np.zeros(n, dtype=np.float32)
+        self._vx = np.zeros(n, dtype=np.float32)
+        self._vy = np.zeros(n, dtype=np.float32)
+        self._start = np.zeros(n, dtype=np.float64)   # 出发的时钟时间
+        self._sprite = np.zeros(n, dtype=np.uint8)
+        self._alive = np.zeros(n, dtype=bool)
+        self._rng = np.random.default_rng()
+
+    @classmethod
+    def overlay(cls, parent):
+        """parent 上的撒花层，没有则创建"""
+        for child in parent.children():
+            if isinstance(child, cls):
+                return child
+        return cls(parent)
+
+    def _ensure_atlas(self):
+        """把所有 emoji 预先渲染进一张横向图集（按当前设备像素比）"""
+        ratio = self.devicePixelRatioF()
+        if self._atlas is not None and self._atlas_ratio == ratio:
+            return
+        cell = math.ceil(self.SPRITE * ratio)
+        atlas = QPixmap(cell * len(self.EMOJIS), cell)
+        atlas.setDevicePixelRatio(ratio)
+        atlas.fill(Qt.transparent)
+        font = QFont("Arial", 20)
+        metrics = QFontMetrics(font)
+        painter = QPainter(atlas)
+        painter.setFont(font)
+        for i, emoji in enumerate(self.EMOJIS):
+            x = i * self.SPRITE + (self.SPRITE - metrics.horizontalAdvance(emoji)) / 2
+            y = (self.SPRITE - metrics.height()) / 2 + metrics.ascent()
+            painter.drawText(round(x), round(y), emoji)
+        painter.end()
+        self._atlas, self._atlas_ratio = atlas, ratio
+        self._sources = [(i * cell, 0, cell, cell) for i in range(len(self.EMOJIS))]
+
     def show_confetti(self, count=60):
-        # 获取父窗口尺寸并调整自身大小
+        # 覆盖整个父窗口
         if self.parent():
             self.setGeometry(self.parent().rect())
-        
         self.show()
         self.raise_()  # 置于顶层
-        
-        parent_width = self.width()
-        parent_height = self.height()
-        
-        # 创建粒子
-        for i in range(count):
-            particle = ConfettiParticle(self)
-            
-            # 随机起始位置（从顶部不同位置）
-            start_x = random.randint(0, parent_width)
-            start_y = random.randint(-50, 0)
-            end_y = parent_height + 50
-            
-            # 随机持续时间
-            duration = random.randint(1500, 3000)
-            
-            # 延迟启动，产生波浪效果
-            QTimer.singleShot(i * 30, lambda p=particle, sx=start_x, sy=start_y, ey=end_y, d=duration: 
-                              p.start_fall(sx, sy, ey, d))
-            
-            self.particles.append(particle)
-        
-        # 动画结束后清理
-        QTimer.singleShot(4000, self._cleanup)
-    
-    def _cleanup(self):
-        self.particles.clear()
-        self.hide()
-    
+        self._ensure_atlas()
+
+        count = min(count, self.POOL_SIZE)
+        free = np.flatnonzero(~self._alive)
+        if len(free) < count:
+            # 粒子池不够：复用最早出发的粒子
+            oldest = np.argsort(np.where(self._alive, self._start, np.inf))
+            free = np.concatenate([free, oldest[:count - len(free)]])
+        slots = free[:count]
+
+        width, height = self.width(), self.height()
+        now = self._clock.now()
+        rng = self._rng
+        # 从顶部随机位置出发，带一点水平速度
+        self._x[slots] = rng.uniform(0, width, count)
+        self._y[slots] = rng.uniform(-50, 0, count)
+        self._vx[slots] = rng.uniform(-75, 75, count)
+        self._vy[slots] = rng.uniform(0.1, 0.4, count) * height
+        self._start[slots] = now + np.arange(count) * min(0.03, self.WAVE / count)
+        self._sprite[slots] = rng.integers(0, len(self.EMOJIS), count)
+        self._alive[slots] = True
+
+        if not self._animating:
+            self._last = now
+            self._animating = True
+        self._clock.add(self._advance)
+
+    def _advance(self, now):
+        """帧时钟回调：一次向量化地推进所有已出发的粒子，全部落地后隐藏"""
+        dt = min(now - self._last, self.MAX_DT)
+        self._last = now
+        moving = self._alive & (self._start <= now)
+        step = np.float32(dt) * moving
+        self._vy += np.float32(self.GRAVITY * self.height()) * step
+        self._x += self._vx * step
+        self._y += self._vy * step
+        # 落出窗口底部的粒子回收
+        self._alive &= self._y < self.height() + 50
+        self._clock.request_update(self)
+        if not self._alive.any():
+            self._animating = False
+            self.hide()
+            return False
+        return True
+
     def paintEvent(self, event):
-        # 不绘制任何背景，完全透明
-        pass
+        # 没有背景，完全透明；只贴已出发的粒子
+        shown = np.flatnonzero(self._alive & (self._start <= self._last))
+        if not len(shown) or self._atlas is None:
+            return
+        half = self.SPRITE // 2
+        xs = (self._x[shown] - half).astype(np.int32).tolist()
+        ys = (self._y[shown] - half).astype(np.int32).tolist()
+        sprites = self._sprite[shown].tolist()
+        atlas, sources = self._atlas, self._sources
+        painter = QPainter(self)
+        for x, y, s in zip(xs, ys, sprites):
+            sx, sy, sw, sh = sources[s]
+            painter.drawPixmap(x, y, atlas, sx, sy, sw, sh)
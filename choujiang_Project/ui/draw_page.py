@@ -2,20 +2,27 @@
 
 from PySide6.QtWidgets import (
     QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QFrame, QGraphicsDropShadowEffect,
-    QMessageBox, QScrollArea
+    QLabel, QPushButton, QFrame,
+    QMessageBox, QScrollArea, QMenu
 )
-from PySide6.QtCore import QTimer, Qt, Signal
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor
 from .animated_label import AnimatedNumberLabel
 from .confetti_widget import ConfettiWidget
+from .pool_map import PoolMap
+from .shadow import DropShadow
+from .theme import set_state
 
 
 class WinnerCard(QFrame):
-    """中奖号码展示卡片"""
-    def __init__(self, number, parent=None):
+    """中奖号码展示卡片（右键可缺席补抽）"""
+
+    redraw_requested = Signal(object, bool)  # (卡片, 原号码是否作废)
+
+    def __init__(self, number, parent=None, name=None):
         super().__init__(parent)
-        self.setFixedSize(80, 80)
+        self.number = number
+        self._fit(name)
         self.setStyleSheet("""
             QFrame {
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
@@ -27,34 +34,65 @@ class WinnerCard(QFrame):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        label = QLabel(str(number))
-        label.setStyleSheet("""
+        self.label = QLabel(str(number))
+        self.label.setStyleSheet("""
             font-size: 28px;
             font-weight: 700;
             color: white;
             background: transparent;
         """)
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
+        self.label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.label)
+
+        self.name_label = QLabel(name or "")
+        self.name_label.setStyleSheet("""
+            font-size: 14px;
+            color: rgba(255, 255, 255, 0.9);
+            background: transparent;
+        """)
+        self.name_label.setAlignment(Qt.AlignCenter)
+        self.name_label.setVisible(bool(name))
+        layout.addWidget(self.name_label)
         
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(102, 126, 234, 100))
-        self.setGraphicsEffect(shadow)
+        self.shadow = DropShadow(self, blur=20, offset=(0, 4), color=QColor(102, 126, 234, 100), radius=16)
+
+    def _fit(self, name):
+        """有来宾姓名时加宽卡片，号码下方显示姓名"""
+        self.setFixedSize(110, 100) if name else self.setFixedSize(80, 80)
+
+    def set_number(self, number, name=None):
+        """补抽后换成新号码，按有无姓名重新定尺寸"""
+        self.number = number
+        self.label.setText(str(number))
+        self.name_label.setText(name or "")
+        self.name_label.setVisible(bool(name))
+        self._fit(name)
+        self.updateGeometry()
+
+    def contextMenuEvent(self, event):
+        menu = QMenu(self)
+        discard = menu.addAction("🔁 缺席补抽（原号码作废）")
+        keep = menu.addAction("↩️ 补抽（原号码放回号码池）")
+        action = menu.exec(event.globalPos())
+        if action is discard:
+            self.redraw_requested.emit(self, True)
+        elif action is keep:
+            self.redraw_requested.emit(self, False)
 
 
 class DrawPrizeWidget(QWidget):
     """单个奖项的抽奖界面"""
     
     prize_completed = Signal(str)  # 单个奖项完成信号
+    winner_replaced = Signal(str, int, int)  # 补抽：(奖项, 原号码, 新号码)
+    winners_revealed = Signal(list)  # 新揭晓的中奖号码（动画结束后）
     
     def __init__(self, prize_name, prize_count, engine, existing_winners=None, parent=None):
         super().__init__(parent)
         self.prize_name = prize_name
         self.prize_count = prize_count
         self.engine = engine
-        self.winner_list = existing_winners if existing_winners else []
+        self.winner_list = list(existing_winners) if existing_winners else []
         self.is_rolling = False
         self.init_ui()
         
@@ -94,25 +132,55 @@ class DrawPrizeWidget(QWidget):
                 border-radius: 24px;
             }
         """)
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(40)
-        shadow.setOffset(0, 8)
-        shadow.setColor(QColor(0, 0, 0, 25))
-        self.number_container.setGraphicsEffect(shadow)
+        self.number_shadow = DropShadow(
+            self.number_container, blur=40, offset=(0, 8), color=QColor(0, 0, 0, 25), radius=24
+        )
         
         number_layout = QVBoxLayout(self.number_container)
         number_layout.setContentsMargins(60, 50, 60, 50)
         
         self.number_label = AnimatedNumberLabel()
+        self.number_label.rolling_finished.connect(lambda winner: self.on_draw_complete([winner]))
         number_layout.addWidget(self.number_label)
 
         # 按钮
         self.draw_btn = QPushButton("🎰  开始抽奖")
         self.draw_btn.setFixedSize(200, 56)
         self.draw_btn.setCursor(Qt.PointingHandCursor)
-        self._set_btn_normal_style()
+        self.draw_btn.setObjectName("drawButton")  # 样式见主题的 #drawButton[state=...]
+        self.draw_btn.setProperty("state", "normal")
         self.draw_btn.clicked.connect(self.toggle_draw)
 
+        # 一次抽完本奖项剩余名额
+        self.draw_all_btn = QPushButton("⚡  一次抽完")
+        self.draw_all_btn.setFixedSize(160, 56)
+        self.draw_all_btn.setCursor(Qt.PointingHandCursor)
+        self.draw_all_btn.setStyleSheet("""
+            QPushButton {
+                background: white;
+                color: #667eea;
+                border: 2px solid #667eea;
+                border-radius: 28px;
+                font-size: 16px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: #f0f0ff;
+            }
+            QPushButton:disabled {
+                color: #c7c7cc;
+                border-color: #d1d1d6;
+            }
+        """)
+        self.draw_all_btn.clicked.connect(self.draw_all)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setSpacing(16)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.draw_btn)
+        btn_layout.addWidget(self.draw_all_btn)
+        btn_layout.addStretch()
+
         # 中奖记录区域
         self.winner_section = QFrame()
         self.winner_section.setStyleSheet("""
@@ -157,7 +225,7 @@ class DrawPrizeWidget(QWidget):
         layout.addSpacing(20)
         layout.addWidget(self.number_container, alignment=Qt.AlignCenter)
         layout.addSpacing(30)
-        layout.addWidget(self.draw_btn, alignment=Qt.AlignCenter)
+        layout.addLayout(btn_layout)
         layout.addWidget(self.progress_label)
         layout.addStretch(1)
         layout.addWidget(self.winner_section)
@@ -167,70 +235,18 @@ class DrawPrizeWidget(QWidget):
         self.no_winner_label.hide()
         
         for num in self.winner_list:
-            card = WinnerCard(num, self)
-            self.winner_cards_layout.addWidget(card)
+            self._add_card(num)
         
         self.progress_label.setText(f"{len(self.winner_list)} / {self.prize_count}")
         
         if len(self.winner_list) >= self.prize_count:
             self.draw_btn.setText("✅ 已完成")
             self.draw_btn.setEnabled(False)
-            self._set_btn_completed_style()
+            self.draw_all_btn.hide()
+            set_state(self.draw_btn, "state", "completed")
             # 显示最后一个中奖号码
             self.number_label.show_final_number(self.winner_list[-1])
 
-    def _set_btn_normal_style(self):
-        self.draw_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: white;
-                border: none;
-                border-radius: 28px;
-                font-size: 18px;
-                font-weight: 600;
-                letter-spacing: 1px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #5a6fd6, stop:1 #6a4190);
-            }
-            QPushButton:disabled {
-                background: #d1d1d6;
-                color: #86868b;
-            }
-        """)
-
-    def _set_btn_stop_style(self):
-        self.draw_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #ff6b6b, stop:1 #ee5a5a);
-                color: white;
-                border: none;
-                border-radius: 28px;
-                font-size: 18px;
-                font-weight: 600;
-                letter-spacing: 1px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #ee5a5a, stop:1 #dd4a4a);
-            }
-        """)
-
-    def _set_btn_completed_style(self):
-        self.draw_btn.setStyleSheet("""
-            QPushButton {
-                background: #34c759;
-                color: white;
-                border: none;
-                border-radius: 28px;
-                font-size: 18px;
-                font-weight: 600;
-            }
-        """)
-
     def toggle_draw(self):
         if self.is_rolling:
             self.stop_draw()
@@ -243,13 +259,14 @@ class DrawPrizeWidget(QWidget):
             return
             
         self.is_rolling = True
+        self.draw_all_btn.setEnabled(False)
         self.draw_btn.setText("🛑  停止")
-        self._set_btn_stop_style()
+        set_state(self.draw_btn, "state", "stop")
         
-        if self.engine.valid_numbers:
-            min_val = min(self.engine.valid_numbers)
-            max_val = max(self.engine.valid_numbers)
-            self.number_label.start_rolling(min_val, max_val)
+        # 只滚动当前真正可抽的号码（不含 4、不在名单外、未中奖）
+        self.number_label.start_rolling(
+            self.engine.rolling_numbers(AnimatedNumberLabel.RING_SIZE, self.number_label.rng)
+        )
 
     def stop_draw(self):
         self.is_rolling = False
@@ -262,21 +279,40 @@ class DrawPrizeWidget(QWidget):
                 return
 
             self.winner_list.append(winner)
-            self.number_label.stop_rolling(winner)
-            
-            QTimer.singleShot(2600, lambda: self.on_draw_complete(winner))
+            self.number_label.stop_rolling(winner)  # 减速结束后 on_draw_complete
 
         except Exception as e:
-            self._set_btn_normal_style()
+            set_state(self.draw_btn, "state", "normal")
             self.draw_btn.setText("🎰  开始抽奖")
+            self.draw_all_btn.setEnabled(True)
             QMessageBox.critical(self, "错误", f"抽奖失败：{str(e)}")
 
-    def on_draw_complete(self, winner):
+    def draw_all(self):
+        """一次抽出本奖项剩余的全部名额"""
+        if self.is_rolling:
+            return
+        remaining = self.prize_count - len(self.winner_list)
+        if remaining <= 0:
+            QMessageBox.information(self, "提示", f"{self.prize_name} 已全部抽完！")
+            return
+
+        try:
+            winners = self.engine.draw_many(self.prize_name, remaining)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"抽奖失败：{str(e)}")
+            return
+
+        self.winner_list.extend(winners)
+        self.number_label.show_final_number(winners[-1])
+        self.on_draw_complete(winners)
+
+    def on_draw_complete(self, winners):
         if self.no_winner_label.isVisible():
             self.no_winner_label.hide()
         
-        card = WinnerCard(winner, self)
-        self.winner_cards_layout.addWidget(card)
+        for winner in winners:
+            self._add_card(winner)
+        self.winners_revealed.emit(list(winners))
         
         self.progress_label.setText(f"{len(self.winner_list)} / {self.prize_count}")
         
@@ -285,27 +321,61 @@ class DrawPrizeWidget(QWidget):
         if main_window:
             central = main_window.centralWidget()
             if central:
-                self.confetti = ConfettiWidget(central)
-                self.confetti.show_confetti(count=80)
+                ConfettiWidget.overlay(central).show_confetti(count=80)
         
         if len(self.winner_list) >= self.prize_count:
             self.draw_btn.setText("✅ 已完成")
             self.draw_btn.setEnabled(False)
-            self._set_btn_completed_style()
+            self.draw_all_btn.hide()
+            set_state(self.draw_btn, "state", "completed")
             self.prize_completed.emit(self.prize_name)
         else:
             self.draw_btn.setText("🎰  开始抽奖")
-            self._set_btn_normal_style()
+            self.draw_all_btn.setEnabled(True)
+            set_state(self.draw_btn, "state", "normal")
+
+
+    def _add_card(self, number):
+        card = WinnerCard(number, self, self.engine.guest_name(number))
+        card.redraw_requested.connect(self.redraw_winner)
+        self.winner_cards_layout.addWidget(card)
+
+    def redraw_winner(self, card, blacklist):
+        """撤销某个中奖号码并补抽，新号码原地替换卡片"""
+        if self.is_rolling:
+            return
+        old = card.number
+        reply = QMessageBox.question(
+            self, "确认补抽",
+            f"确定撤销号码 {old} 并为「{self.prize_name}」补抽一个号码吗？",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            new = self.engine.redraw(self.prize_name, old, blacklist)
+        except (RuntimeError, ValueError) as e:
+            QMessageBox.critical(self, "错误", f"补抽失败：{str(e)}")
+            return
+
+        self.winner_list[self.winner_list.index(old)] = new
+        card.set_number(new, self.engine.guest_name(new))
+        self.number_label.show_final_number(new)
+        self.winner_replaced.emit(self.prize_name, old, new)
 
 
 class DrawPage(QWidget):
     all_prizes_completed = Signal()  # 所有奖项完成信号
+    winner_replaced = Signal(str, int, int)  # 补抽：(奖项, 原号码, 新号码)
+    winners_revealed = Signal(str, list)  # 某奖项新揭晓的中奖号码：(奖项, 号码列表)
     
     def __init__(self, engine, parent=None):
         super().__init__(parent)
         self.engine = engine
-        self.setStyleSheet("background: #f5f5f7;")
-        self.prize_widgets = {}  # 保存奖项widget引用
+        self.setObjectName("drawPage")  # 页面底色见主题
+        self.prize_widgets = {}  # 保存奖项widget引用（切换到该奖项时才创建）
+        self.tab_prizes = []  # 各标签页对应的奖项配置
         self.completed_prizes = set()
         
         layout = QVBoxLayout(self)
@@ -331,6 +401,29 @@ class DrawPage(QWidget):
         """)
         header_layout.addWidget(header_title)
         header_layout.addStretch()
+
+        # 号码池状态图开关
+        self.pool_btn = QPushButton("🗺️ 号码池")
+        self.pool_btn.setCheckable(True)
+        self.pool_btn.setChecked(True)
+        self.pool_btn.setCursor(Qt.PointingHandCursor)
+        self.pool_btn.setStyleSheet("""
+            QPushButton {
+                background: #f5f5f7;
+                color: #86868b;
+                border: none;
+                border-radius: 10px;
+                padding: 8px 16px;
+                font-size: 14px;
+                font-weight: 500;
+            }
+            QPushButton:checked {
+                background: #f0f0ff;
+                color: #667eea;
+            }
+        """)
+        self.pool_btn.toggled.connect(self.toggle_pool_map)
+        header_layout.addWidget(self.pool_btn)
         
         # Tab切换
         self.tab_widget = QTabWidget()
@@ -358,8 +451,37 @@ class DrawPage(QWidget):
             }
         """)
         
+        self.tab_widget.currentChanged.connect(self._ensure_prize_widget)
+
+        # 号码池状态图：图例（含各状态号码数）+ 每号一像素的状态图
+        self.pool_panel = QFrame()
+        self.pool_panel.setStyleSheet("""
+            QFrame {
+                background: white;
+                border-top: 1px solid #e5e5e5;
+            }
+        """)
+        pool_layout = QVBoxLayout(self.pool_panel)
+        pool_layout.setContentsMargins(30, 12, 30, 16)
+        pool_layout.setSpacing(8)
+        legend_layout = QHBoxLayout()
+        legend_layout.setSpacing(18)
+        self.legend_labels = []
+        for _, color, text in PoolMap.STATES:
+            label = QLabel()
+            label.setStyleSheet("font-size: 13px; color: #86868b; border: none;")
+            label.setProperty("legend", f'<span style="color:{color}">■</span> {text}')
+            legend_layout.addWidget(label)
+            self.legend_labels.append(label)
+        legend_layout.addStretch()
+        self.pool_map = PoolMap(engine)
+        self.pool_map.setFixedHeight(110)
+        pool_layout.addLayout(legend_layout)
+        pool_layout.addWidget(self.pool_map)
+
         layout.addWidget(header)
         layout.addWidget(self.tab_widget)
+        layout.addWidget(self.pool_panel)
         
         # 空状态提示
         self.empty_label = QLabel("请先在「奖项设置」中配置奖项")
@@ -375,41 +497,90 @@ class DrawPage(QWidget):
         """加载奖项，保持已有结果"""
         if not prizes:
             self.tab_widget.hide()
+            self.pool_panel.hide()
             self.empty_label.show()
             return
         
         self.empty_label.hide()
         self.tab_widget.show()
+        self.pool_panel.setVisible(self.pool_btn.isChecked())
+        self.refresh_pool_map()
         
         # 检查是否需要重建（奖项配置变化）
         current_names = {p["name"] for p in prizes}
-        cached_names = set(self.prize_widgets.keys())
+        cached_names = {p["name"] for p in self.tab_prizes}
         
         if current_names != cached_names:
             # 配置变化，重建所有
+            # 奖项很多时逐个创建抽奖界面很慢：先放占位页，切换到该奖项时再创建
+            self.tab_widget.blockSignals(True)
             self.tab_widget.clear()
             self.prize_widgets.clear()
             self.completed_prizes.clear()
+            self.tab_prizes = list(prizes)
             
             for prize in prizes:
+                self.tab_widget.addTab(QWidget(), f"  {prize['name']}  ")
                 existing = self.engine.prize_drawn.get(prize["name"], [])
-                widget = DrawPrizeWidget(
-                    prize["name"], prize["count"], self.engine, existing
-                )
-                widget.prize_completed.connect(self.on_prize_completed)
-                self.prize_widgets[prize["name"]] = widget
-                self.tab_widget.addTab(widget, f"  {prize['name']}  ")
-                
                 if len(existing) >= prize["count"]:
                     self.completed_prizes.add(prize["name"])
+            self.tab_widget.blockSignals(False)
+            self._ensure_prize_widget(self.tab_widget.currentIndex())
             
             # 检查是否全部完成
             if len(self.completed_prizes) == len(prizes):
                 self.all_prizes_completed.emit()
 
+    def _ensure_prize_widget(self, index):
+        """把第 index 个标签页的占位页换成抽奖界面"""
+        if index < 0 or index >= len(self.tab_prizes):
+            return
+        prize = self.tab_prizes[index]
+        if prize["name"] in self.prize_widgets:
+            return
+        widget = DrawPrizeWidget(
+            prize["name"], prize["count"], self.engine,
+            self.engine.prize_drawn.get(prize["name"], [])
+        )
+        widget.prize_completed.connect(self.on_prize_completed)
+        widget.winner_replaced.connect(self.winner_replaced)
+        widget.winner_replaced.connect(
+            lambda prize, old, new: self.refresh_pool_map([old, new])
+        )
+        widget.winners_revealed.connect(self.refresh_pool_map)
+        widget.winners_revealed.connect(
+            lambda winners, name=prize["name"]: self.winners_revealed.emit(name, winners)
+        )
+        self.prize_widgets[prize["name"]] = widget
+
+        self.tab_widget.blockSignals(True)
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, widget, f"  {prize['name']}  ")
+        self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+
     def on_prize_completed(self, prize_name):
         """单个奖项完成"""
         self.completed_prizes.add(prize_name)
         
         if len(self.completed_prizes) == len(self.engine.prizes):
             self.all_prizes_completed.emit()
+
+    def toggle_pool_map(self, checked):
+        self.pool_panel.setVisible(checked and bool(self.tab_prizes))
+        if checked:
+            self.refresh_pool_map()
+
+    def refresh_pool_map(self, numbers=None):
+        """抽奖后只增量更新相关号码；numbers 为空时按需整张重算"""
+        if not self.pool_panel.isVisibleTo(self):
+            self.pool_map.invalidate()  # 隐藏期间不更新，重新显示时整张重算
+            return
+        if numbers:
+            self.pool_map.refresh_numbers(numbers)
+        else:
+            self.pool_map.sync()
+        for label, count in zip(self.legend_labels, self.pool_map.counts.tolist()):
+            label.setText(f"{label.property('legend')} {count}")
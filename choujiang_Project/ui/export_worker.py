@@ -0,0 +1,189 @@
+# ui/export_worker.py
+
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QRectF, Qt, Signal
+from PySide6.QtGui import QBrush, QColor, QFont, QImage, QLinearGradient, QPainter, QPen
+
+from core.export import write_csv, write_json
+
+
+class ExportSignals(QObject):
+    progress = Signal(int, int)  # (已完成, 总数)
+    finished = Signal(str)       # 导出文件路径（海报分页时每行一个）
+    failed = Signal(str)         # 错误信息
+
+
+class ExportTask(QRunnable):
+    """在线程池中导出抽奖结果（CSV / JSON / PNG 海报）
+
+    snapshot 为 {奖项: [(号码, 姓名或None)]} 的副本，在界面线程中生成，
+    工作线程只读它，不接触引擎和任何界面对象。
+    """
+
+    def __init__(self, fmt, path, snapshot, gradients=()):
+        super().__init__()
+        self.fmt = fmt
+        self.path = path
+        self.snapshot = snapshot
+        self.gradients = gradients
+        self.signals = ExportSignals()
+
+    def run(self):
+        try:
+            if self.fmt == "png":
+                paths = render_poster(self.snapshot, self.path, self.gradients, self.signals.progress.emit)
+            else:
+                prize_drawn = {p: [n for n, _ in rows] for p, rows in self.snapshot.items()}
+                names = {n: name for rows in self.snapshot.values() for n, name in rows if name}
+                name_of = names.get if names else None
+                encoding = "utf-8-sig" if self.fmt == "csv" else "utf-8"
+                with open(self.path, "w", encoding=encoding, newline="") as f:
+                    writer = write_csv if self.fmt == "csv" else write_json
+                    writer(prize_drawn, f, name_of, self.signals.progress.emit)
+                paths = [self.path]
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit("\n".join(paths))
+
+
+# ---------- 海报 ----------
+
+POSTER_SCALE = 3           # 按逻辑像素绘制，输出放大 3 倍
+POSTER_MIN_SCALE = 2       # 海报过高时先降低放大倍数，最低到 2 倍
+MAX_PIXEL_HEIGHT = 12000   # 单张图片的最大像素高度，再高就分页输出
+POSTER_WIDTH = 1600
+CARD_WIDTH = 340
+CARD_GAP = 30
+CIRCLE = 60
+PER_ROW = 4
+MAX_PER_PRIZE = 40         # 单个奖项最多画出的号码数，其余只在卡片底部计数
+
+
+def _card_height(rows, with_names):
+    shown = min(len(rows), MAX_PER_PRIZE)
+    lines = (shown + PER_ROW - 1) // PER_ROW
+    line_height = CIRCLE + (26 if with_names else 0) + 14
+    return 110 + max(lines, 1) * line_height + 50
+
+
+def _page_paths(path, pages):
+    """单页时就是 path，多页时依次为 xxx-1.png、xxx-2.png……"""
+    if pages == 1:
+        return [path]
+    stem, ext = os.path.splitext(path)
+    return [f"{stem}-{i}{ext or '.png'}" for i in range(1, pages + 1)]
+
+
+def render_poster(snapshot, path, gradients=(), progress=None):
+    """离屏绘制结果汇总海报（QImage + QPainter，可在工作线程中运行），返回保存的文件路径列表
+
+    gradients 为各奖项卡片的渐变色，与汇总页的 PrizeCardDelegate.GRADIENTS 一致。
+    奖项很多时图片高度不设限会申请到数 GB 的内存：超过 MAX_PIXEL_HEIGHT 时先降低
+    放大倍数，降到 POSTER_MIN_SCALE 仍放不下就按卡片行分页，每页都带标题。
+    """
+    gradients = gradients or [("#667eea", "#764ba2", "#f093fb")]
+    prizes = [(p, rows) for p, rows in snapshot.items() if rows]
+    with_names = any(name for _, rows in prizes for _, name in rows)
+    columns = max(1, min(len(prizes), (POSTER_WIDTH - CARD_GAP) // (CARD_WIDTH + CARD_GAP)))
+
+    # 逐行排布卡片，每行高度取该行最高的卡片；放不下时另起一页
+    max_height = MAX_PIXEL_HEIGHT / POSTER_MIN_SCALE
+    pages, layout, y = [], [], 180
+    for start in range(0, len(prizes), columns):
+        line = prizes[start:start + columns]
+        height = max(_card_height(rows, with_names) for _, rows in line)
+        if layout and y + height + 60 > max_height:
+            pages.append((layout, y + 60))
+            layout, y = [], 180
+        line_width = len(line) * CARD_WIDTH + (len(line) - 1) * CARD_GAP
+        x = (POSTER_WIDTH - line_width) / 2
+        for i, (prize_name, rows) in enumerate(line):
+            layout.append((start + i, prize_name, rows, QRectF(x, y, CARD_WIDTH, height)))
+            x += CARD_WIDTH + CARD_GAP
+        y += height + CARD_GAP
+    pages.append((layout, y + 60))
+
+    paths = _page_paths(path, len(pages))
+    total = sum(len(layout) for layout, _ in pages)
+    done = 0
+    for page_path, (layout, poster_height) in zip(paths, pages):
+        scale = min(POSTER_SCALE, MAX_PIXEL_HEIGHT / poster_height)
+        width, height = int(POSTER_WIDTH * scale), int(poster_height * scale)
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        if image.isNull():
+            raise MemoryError(f"无法创建 {width}×{height} 像素的海报图片，内存不足")
+        image.fill(QColor("#1a1a2e"))
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.scale(scale, scale)
+        for _ in _paint_poster(painter, layout, gradients, with_names):
+            done += 1
+            if progress:
+                progress(done, total)
+        painter.end()
+        if not image.save(page_path, "PNG"):
+            raise OSError(f"无法保存图片：{page_path}")
+    return paths
+
+
+def _paint_poster(painter, layout, gradients, with_names):
+    """在一页上画标题和各奖项卡片，每画完一张卡片 yield 一次"""
+    def font(size, bold=False):
+        f = QFont("PingFang SC")
+        f.setPixelSize(size)
+        f.setBold(bold)
+        return f
+
+    painter.setPen(QColor("white"))
+    painter.setFont(font(44, True))
+    painter.drawText(QRectF(0, 50, POSTER_WIDTH, 60), Qt.AlignCenter, "🏆 抽奖结果汇总")
+    painter.setPen(QColor(255, 255, 255, 150))
+    painter.setFont(font(20))
+    painter.drawText(QRectF(0, 110, POSTER_WIDTH, 30), Qt.AlignCenter, "恭喜以下幸运嘉宾！")
+
+    for index, prize_name, rows, rect in layout:
+        colors = gradients[index % len(gradients)]
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        for stop, color in zip((0, 0.5, 1), colors):
+            gradient.setColorAt(stop, QColor(color))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(gradient))
+        painter.drawRoundedRect(rect, 20, 20)
+
+        painter.setPen(QColor("white"))
+        painter.setFont(font(26, True))
+        painter.drawText(QRectF(rect.x(), rect.y() + 24, rect.width(), 40), Qt.AlignCenter, prize_name)
+        painter.fillRect(QRectF(rect.x() + 30, rect.y() + 80, rect.width() - 60, 2),
+                         QColor(255, 255, 255, 76))
+
+        shown = rows[:MAX_PER_PRIZE]
+        line_height = CIRCLE + (26 if with_names else 0) + 14
+        cell = (rect.width() - 40) / PER_ROW
+        for i, (number, name) in enumerate(shown):
+            cx = rect.x() + 20 + (i % PER_ROW + 0.5) * cell
+            if len(shown) - i <= (len(shown) - 1) % PER_ROW + 1 and len(shown) % PER_ROW:
+                # 最后一行不满时居中
+                cx += (PER_ROW - len(shown) % PER_ROW) * cell / 2
+            cy = rect.y() + 110 + (i // PER_ROW) * line_height
+            circle = QRectF(cx - CIRCLE / 2, cy, CIRCLE, CIRCLE)
+            painter.setPen(QPen(QColor(255, 255, 255, 102), 2))
+            painter.setBrush(QColor(255, 255, 255, 64))
+            painter.drawEllipse(circle)
+            painter.setPen(QColor("white"))
+            painter.setFont(font(22 if len(str(number)) <= 4 else 15, True))
+            painter.drawText(circle, Qt.AlignCenter, str(number))
+            if name:
+                painter.setFont(font(14))
+                painter.drawText(QRectF(cx - cell / 2, cy + CIRCLE + 4, cell, 22), Qt.AlignCenter, name)
+
+        footer = f"共 {len(rows)} 人中奖"
+        if len(rows) > MAX_PER_PRIZE:
+            footer = f"展示前 {MAX_PER_PRIZE} 位，共 {len(rows)} 人中奖"
+        painter.setPen(QColor(255, 255, 255, 204))
+        painter.setFont(font(14))
+        painter.drawText(QRectF(rect.x(), rect.bottom() - 44, rect.width(), 30), Qt.AlignCenter, footer)
+        yield index
+
@@ -0,0 +1,279 @@
+# ui/fairness_dialog.py
+
+import math
+import os
+import threading
+
+import numpy as np
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QPushButton,
+    QProgressBar, QWidget, QToolTip
+)
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QRect
+from PySide6.QtGui import QImage, QPainter
+
+from core.fairness import run_fairness
+
+
+class FairnessSignals(QObject):
+    progress = Signal(int, int)   # (已模拟场数, 总场数)
+    finished = Signal(object)     # run_fairness() 的结果
+    failed = Signal(str)
+
+
+class FairnessTask(QRunnable):
+    """在线程池中驱动进程池模拟，界面线程只接收进度和结果"""
+
+    def __init__(self, config, sessions):
+        super().__init__()
+        self.config = config
+        self.sessions = sessions
+        self.stop_event = threading.Event()
+        self.signals = FairnessSignals()
+
+    def run(self):
+        try:
+            result = run_fairness(
+                self.config, self.sessions,
+                progress=self.signals.progress.emit,
+                cancelled=self.stop_event.is_set,
+            )
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class OddsHeatmap(QWidget):
+    """每个号码一格的中奖概率热力图：红色高于等概率，蓝色低于等概率
+
+    整张图先用 numpy 算好颜色写进一个 QImage（一格一像素），
+    paintEvent 只做一次缩放贴图，号码再多也不会逐格绘制。
+    """
+
+    LOW = np.array([79, 172, 254])    # #4facfe
+    MID = np.array([255, 255, 255])
+    HIGH = np.array([245, 87, 108])   # #f5576c
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(240)
+        self.setMouseTracking(True)
+        self.numbers = None
+        self.ratio = None
+        self.columns = 1
+        self.image = None
+
+    def set_data(self, numbers, probability, expected):
+        n = len(numbers)
+        self.numbers = numbers
+        self.ratio = probability / expected if expected else np.ones(n)
+        # 大致 2:1 的网格
+        self.columns = max(1, min(n, math.ceil(math.sqrt(n * 2))))
+        rows = math.ceil(n / self.columns)
+
+        # 偏差按最大偏离程度归一化到 [-1, 1]
+        deviation = self.ratio - 1
+        spread = max(float(np.abs(deviation).max(initial=0)), 1e-9)
+        t = np.clip(deviation / spread, -1, 1)[:, None]
+        colors = np.where(t >= 0, self.MID + (self.HIGH - self.MID) * t,
+                          self.MID + (self.LOW - self.MID) * -t)
+        pixels = np.full((rows * self.columns, 3), 245, dtype=np.uint8)
+        pixels[:n] = colors.astype(np.uint8)
+        self._buffer = np.ascontiguousarray(pixels.reshape(rows, self.columns, 3))
+        self.image = QImage(self._buffer.data, self.columns, rows,
+                            self.columns * 3, QImage.Format_RGB888)
+        self.update()
+
+    def _image_rect(self):
+        """保持格子为正方形、居中的绘制区域"""
+        rows = self.image.height()
+        cell = min(self.width() / self.columns, self.height() / rows)
+        w, h = int(cell * self.columns), int(cell * rows)
+        return QRect((self.width() - w) // 2, (self.height() - h) // 2, w, h)
+
+    def paintEvent(self, event):
+        if self.image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage(self._image_rect(), self.image)
+
+    def mouseMoveEvent(self, event):
+        if self.image is None:
+            return
+        rect = self._image_rect()
+        pos = event.position().toPoint()
+        if not rect.contains(pos):
+            QToolTip.hideText()
+            return
+        col = (pos.x() - rect.x()) * self.columns // max(rect.width(), 1)
+        row = (pos.y() - rect.y()) * self.image.height() // max(rect.height(), 1)
+        index = row * self.columns + col
+        if index < len(self.numbers):
+            QToolTip.showText(
+                event.globalPosition().toPoint(),
+                f"{self.numbers[index]}：等概率的 {self.ratio[index]:.1%}",
+                self,
+            )
+
+
+class FairnessDialog(QDialog):
+    """公平性分析：模拟大量整场抽奖，展示每个号码的中奖概率"""
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.task = None
+        self.setWindowTitle("公平性分析")
+        self.resize(760, 560)
+        self.setStyleSheet("background: white;")
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(28, 24, 28, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("📊 公平性分析")
+        title.setStyleSheet("font-size: 20px; font-weight: 700; color: #1d1d1f;")
+        hint = QLabel(
+            "用当前配置反复模拟整场抽奖，统计每个号码的中奖概率。"
+            "邻号间隔规则会让边缘号码、孤立号码略微更容易中奖。"
+        )
+        hint.setWordWrap(True)
+        hint.setStyleSheet("font-size: 13px; color: #86868b;")
+
+        controls = QHBoxLayout()
+        controls.setSpacing(12)
+        sessions_label = QLabel("模拟场数")
+        sessions_label.setStyleSheet("font-size: 14px; color: #86868b; font-weight: 500;")
+        self.sessions_input = QSpinBox()
+        self.sessions_input.setRange(1000, 10_000_000)
+        self.sessions_input.setSingleStep(10_000)
+        self.sessions_input.setValue(20_000)
+        self.sessions_input.setGroupSeparatorShown(True)
+        self.sessions_input.setStyleSheet("""
+            QSpinBox {
+                padding: 8px 12px;
+                border: 2px solid #e5e5e5;
+                border-radius: 10px;
+                font-size: 15px;
+                color: #1d1d1f;
+                min-width: 120px;
+            }
+        """)
+        cores = QLabel(f"使用 {os.cpu_count() or 1} 个进程")
+        cores.setStyleSheet("font-size: 13px; color: #86868b;")
+        self.run_btn = QPushButton("▶ 开始模拟")
+        self.run_btn.setCursor(Qt.PointingHandCursor)
+        self.run_btn.setStyleSheet("""
+            QPushButton {
+                background: #667eea;
+                color: white;
+                border: none;
+                border-radius: 10px;
+                padding: 10px 20px;
+                font-size: 15px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: #5a6fd6;
+            }
+        """)
+        self.run_btn.clicked.connect(self.toggle_run)
+        controls.addWidget(sessions_label)
+        controls.addWidget(self.sessions_input)
+        controls.addWidget(cores)
+        controls.addStretch()
+        controls.addWidget(self.run_btn)
+
+        self.progress = QProgressBar()
+        self.progress.setTextVisible(False)
+        self.progress.setFixedHeight(8)
+        self.progress.setStyleSheet("""
+            QProgressBar {
+                background: #f0f0f5;
+                border: none;
+                border-radius: 4px;
+            }
+            QProgressBar::chunk {
+                background: #667eea;
+                border-radius: 4px;
+            }
+        """)
+        self.progress.hide()
+
+        self.heatmap = OddsHeatmap()
+        legend = QLabel("🟥 高于等概率　⬜ 等概率　🟦 低于等概率（颜色深浅按最大偏差归一化，鼠标悬停查看号码）")
+        legend.setStyleSheet("font-size: 12px; color: #86868b;")
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        self.stats_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.stats_label.setStyleSheet("font-size: 14px; color: #1d1d1f;")
+
+        layout.addWidget(title)
+        layout.addWidget(hint)
+        layout.addLayout(controls)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.heatmap, 1)
+        layout.addWidget(legend)
+        layout.addWidget(self.stats_label)
+
+    def toggle_run(self):
+        if self.task is not None:
+            self.task.stop_event.set()
+            self.run_btn.setEnabled(False)
+            self.run_btn.setText("正在停止…")
+            return
+        task = FairnessTask(self.config, self.sessions_input.value())
+        task.signals.progress.connect(self.on_progress)
+        task.signals.finished.connect(self.on_finished)
+        task.signals.failed.connect(self.on_failed)
+        self.task = task
+        self.run_btn.setText("■ 停止")
+        self.progress.setValue(0)
+        self.progress.show()
+        self.stats_label.setText("⏳ 正在模拟…")
+        QThreadPool.globalInstance().start(task)
+
+    def on_progress(self, done, total):
+        self.progress.setMaximum(total)
+        self.progress.setValue(done)
+        self.stats_label.setText(f"⏳ 已模拟 {done:,} / {total:,} 场")
+
+    def on_finished(self, result):
+        self._end_run()
+        if not result["sessions"]:
+            self.stats_label.setText("已停止")
+            return
+        numbers, probability = result["numbers"], result["probability"]
+        expected = result["expected"]
+        self.heatmap.set_data(numbers, probability, expected)
+        high, low = int(np.argmax(probability)), int(np.argmin(probability))
+        verdict = (
+            "⚠️ 各号码中奖概率存在统计上显著的差异"
+            if result["p_value"] < 0.01 else "✅ 未发现统计上显著的差异"
+        )
+        self.stats_label.setText(
+            f"{verdict}\n"
+            f"模拟 {result['sessions']:,} 场，等概率时每个号码中奖概率 {expected:.2%}；"
+            f"最高 {numbers[high]}（{probability[high]:.2%}），"
+            f"最低 {numbers[low]}（{probability[low]:.2%}）\n"
+            f"卡方 χ² = {result['chi2']:.1f}，自由度 {result['dof']}，p = {result['p_value']:.3g}"
+        )
+
+    def on_failed(self, message):
+        self._end_run()
+        self.stats_label.setText(f"❌ {message}")
+
+    def _end_run(self):
+        self.task = None
+        self.progress.hide()
+        self.run_btn.setEnabled(True)
+        self.run_btn.setText("▶ 开始模拟")
+
+    def done(self, result):
+        # 关闭对话框时停止模拟（已在进行的一批会跑完）
+        if self.task is not None:
+            self.task.stop_event.set()
+        super().done(result)
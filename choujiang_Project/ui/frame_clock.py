@@ -0,0 +1,66 @@
+# ui/frame_clock.py
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Qt
+from PySide6.QtGui import QGuiApplication
+
+
+class FrameClock(QObject):
+    """全局动画帧时钟：号码滚动、彩带等所有动画共用一个定时器
+
+    按屏幕刷新率每帧触发一次，依次推进所有进行中的动画，回调拿到的是
+    统一的当前时间（秒），动画据此自行计算进度，不再各开定时器、改间隔。
+    动画在回调里用 request_update() 登记需要重绘的控件，
+    一帧结束时每个控件只 update() 一次。没有动画时定时器停止。
+    """
+
+    DEFAULT_FPS = 60
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(QGuiApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._callbacks = []
+        self._dirty = {}  # 本帧需要重绘的控件（dict 保持登记顺序）
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._frame)
+
+    def now(self) -> float:
+        """时钟启动以来的秒数，所有动画共用这一时间基准"""
+        return self._elapsed.nsecsElapsed() / 1e9
+
+    def add(self, callback):
+        """登记一个动画：callback(now) 每帧调用一次，返回 False 表示动画结束"""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+        if not self._timer.isActive():
+            screen = QGuiApplication.primaryScreen()
+            fps = screen.refreshRate() if screen is not None else 0
+            self._timer.start(round(1000 / (fps if fps > 1 else self.DEFAULT_FPS)))
+
+    def remove(self, callback):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def request_update(self, widget):
+        """本帧结束时重绘 widget（同一帧内多次登记只重绘一次）"""
+        self._dirty[widget] = None
+
+    def _frame(self):
+        now = self.now()
+        for callback in list(self._callbacks):
+            if not callback(now):
+                self.remove(callback)
+        dirty, self._dirty = self._dirty, {}
+        for widget in dirty:
+            widget.update()
+        if not self._callbacks:
+            self._timer.stop()
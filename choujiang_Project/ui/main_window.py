@@ -2,13 +2,36 @@
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QStackedWidget, QLabel, QPushButton, QMessageBox, QGraphicsDropShadowEffect
+    QStackedWidget, QLabel, QPushButton, QMessageBox, QGraphicsDropShadowEffect,
+    QFileDialog
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 from .draw_page import DrawPage
 from .setup_page import SetupPage
 from .summary_page import SummaryPage
+from core.config import validate_config
+from core.journal import DrawJournal, default_journal_path
+from core.lottery_engine import LotteryEngine
+import json
+
+
+def open_main_window():
+    """创建并显示主窗口（choujiang_Project/main.py 与打包入口共用）
+
+    引擎挂上默认位置的抽奖日志：日志里有上一场时恢复（程序崩溃/休眠后
+    重开可继续抽），日志内容与当前版本不兼容时从空白开始、继续记录。
+    """
+    journal = DrawJournal(default_journal_path())
+    engine = LotteryEngine()
+    try:
+        engine.resume(journal)
+    except (ValueError, KeyError):
+        engine = LotteryEngine()
+        engine.journal = journal
+    window = MainWindow(engine)
+    window.show()
+    return window
 
 
 class NavButton(QPushButton):
@@ -19,43 +42,7 @@ class NavButton(QPushButton):
         self.setCheckable(True)
         self.setFixedHeight(48)
         self.setCursor(Qt.PointingHandCursor)
-        self._update_style(False)
-    
-    def _update_style(self, selected):
-        if selected:
-            self.setStyleSheet("""
-                QPushButton {
-                    background: rgba(255, 255, 255, 0.95);
-                    border: none;
-                    border-radius: 12px;
-                    padding: 12px 20px;
-                    font-size: 15px;
-                    font-weight: 600;
-                    color: #5a4a78;
-                    text-align: left;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background: rgba(255, 255, 255, 0.15);
-                    border: none;
-                    border-radius: 12px;
-                    padding: 12px 20px;
-                    font-size: 15px;
-                    font-weight: 500;
-                    color: #ffffff;
-                    text-align: left;
-                }
-                QPushButton:hover {
-                    background: rgba(255, 255, 255, 0.3);
-                    color: #ffffff;
-                }
-            """)
-    
-    def setChecked(self, checked):
-        super().setChecked(checked)
-        self._update_style(checked)
+        self.setObjectName("navButton")  # 选中与否由主题的 :checked 区分
 
 
 class SideBar(QWidget):
@@ -63,12 +50,7 @@ class SideBar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedWidth(220)
-        self.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #667eea, stop:0.5 #764ba2, stop:1 #f093fb);
-            }
-        """)
+        self.setObjectName("sideBar")  # 渐变底色见主题
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(16, 30, 16, 30)
@@ -188,13 +170,16 @@ class MainWindow(QMainWindow):
         # 汇总页
         self.summary_page = SummaryPage()
         self.summary_page.reset_requested.connect(self.on_reset_lottery)
+        self.draw_page.winner_replaced.connect(self.summary_page.replace_winner)
+        self.draw_page.winners_revealed.connect(self.on_winners_revealed)
         self.stacked.addWidget(self.summary_page)
 
         main_layout.addWidget(self.sidebar)
         main_layout.addWidget(self.stacked)
 
-        # 默认页面
+        # 默认页面（从日志恢复了上一场时，设置页同步显示其配置）
         if self.engine.prizes:
+            self.setup_page.fill_form(validate_config(self.engine.to_config()))
             self.switch_page(0)
         else:
             self.switch_page(1)
@@ -210,27 +195,56 @@ class MainWindow(QMainWindow):
         if index == 0:
             self.draw_page.load_prizes(self.engine.prizes)
         elif index == 2:
-            self.summary_page.update_results(self.engine.prize_drawn)
+            self.summary_page.update_results(self.engine.prize_drawn, self.engine.guest_name)
 
-    def on_settings_saved(self, start, end, prizes):
+    def on_settings_saved(self, config):
         try:
-            self.engine.set_settings(start, end, prizes)
+            # 整份配置一次性交给引擎
+            self.engine.apply_config(config)
+            plan_note = ""
+            if self.engine.plan is not None:
+                plan_note = f"方案承诺（请在抽奖前公布）：\n{self.engine.plan.commitment}\n\n"
             # 隐藏汇总按钮（新配置）
             self.sidebar.hide_summary_btn()
             QMessageBox.information(
                 self, "✅ 配置成功",
-                f"号码范围：{start} ~ {end}\n"
-                f"奖项数量：{len(prizes)} 项\n\n"
+                f"号码范围：{self.engine.start} ~ {self.engine.end}\n"
+                f"奖项数量：{len(self.engine.prizes)} 项\n"
+                f"排除规则：{self.engine.rules.describe()}\n"
+                f"家庭分组：{len(self.engine.households)} 组\n"
+                f"加权号码：{len(self.engine.weights)} 个\n\n"
+                f"{plan_note}"
                 "点击「开始抽奖」开始使用！"
             )
             self.switch_page(0)
         except ValueError as e:
             QMessageBox.critical(self, "❌ 配置错误", str(e))
     
+    def on_winners_revealed(self, prize_name, winners):
+        """揭晓号码后只刷新汇总页上这个奖项的卡片"""
+        self.summary_page.update_prize(prize_name, self.engine.prize_drawn.get(prize_name, []))
+
     def on_all_completed(self):
         """所有奖项抽完时触发"""
         self.sidebar.show_summary_btn()
-        self.summary_page.update_results(self.engine.prize_drawn)
+        self.summary_page.update_results(self.engine.prize_drawn, self.engine.guest_name)
+        if self.engine.plan is not None:
+            self.save_plan_reveal()
+
+    def save_plan_reveal(self):
+        """抽奖结束后保存公开验证文件（种子 + 配置 + 方案）"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "保存抽奖验证文件", "lottery_plan_reveal.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.engine.plan.reveal(), f, ensure_ascii=False, indent=4)
+        QMessageBox.information(
+            self, "🔐 验证文件已保存",
+            f"种子：{self.engine.plan.seed}\n\n"
+            "公开该文件后，任何人都可以用 SessionPlan.verify 核对哈希承诺并重新推演抽奖结果。"
+        )
     
     def on_reset_lottery(self):
         """重新抽奖"""
@@ -242,8 +256,7 @@ class MainWindow(QMainWindow):
         )
         if reply == QMessageBox.Yes:
             # 重置引擎
-            self.engine.used_numbers.clear()
-            self.engine.prize_drawn = {p["name"]: [] for p in self.engine.prizes}
+            self.engine.reset()
             # 重置UI
             self.sidebar.hide_summary_btn()
             self.summary_page.clear_results()
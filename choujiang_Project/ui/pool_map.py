@@ -0,0 +1,154 @@
+# ui/pool_map.py
+
+import math
+
+import numpy as np
+from PySide6.QtWidgets import QWidget, QToolTip
+from PySide6.QtCore import QRect, QRectF
+from PySide6.QtGui import QImage, QPainter
+
+from core.draw_strategy import (
+    STATE_FREE, STATE_BLOCKED, STATE_USED, STATE_EXCLUDED, STATE_OUTSIDE
+)
+
+
+class PoolMap(QWidget):
+    """号码池状态图：每个号码一个像素，颜色表示可抽 / 邻号占用 / 已中奖 / 排除
+
+    引擎按名次批量给出状态（稠密策略直接解包位图缓冲区），经查色表写入
+    一块 uint32 像素缓冲区，QImage 直接包装这块内存；抽奖后只重算中奖号码
+    邻域和同家庭号码所在的几段，并只重绘这几段对应的矩形，
+    百万级号码也只有一次贴图的开销。
+    """
+
+    # 状态 → 颜色、说明（顺序即 STATE_* 的取值）
+    STATES = [
+        (STATE_FREE, "#43e97b", "可抽"),
+        (STATE_BLOCKED, "#ffb340", "邻号间隔不足"),
+        (STATE_USED, "#667eea", "已中奖"),
+        (STATE_EXCLUDED, "#8e8e93", "保留/同家庭排除"),
+        (STATE_OUTSIDE, "#e5e5ea", "号码规则排除"),
+    ]
+    MAX_NUMBERS = 1 << 22  # 最多绘制的号码数（约 400 万），范围更大时只画前这么多
+    ASPECT = 8  # 网格宽高比，适合横条显示
+    REBUILD_RATIO = 64  # 需要重算的号码超过总数的 1/64 时改为整张重算
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.setMouseTracking(True)
+        self.setMinimumHeight(90)
+        # 查色表：Format_RGB32 每像素一个 0xffRRGGBB
+        self._lut = np.zeros(len(self.STATES), dtype=np.uint32)
+        for state, color, _ in self.STATES:
+            self._lut[state] = 0xFF000000 | int(color[1:], 16)
+        self.lo = self.hi = 0
+        self.columns = 1
+        self.counts = np.zeros(len(self.STATES), dtype=np.int64)
+        self._states = None
+        self._pixels = None
+        self.image = None
+        self._signature = None
+
+    def _engine_signature(self):
+        """配置或抽奖进度变了才需要整张重算"""
+        e = self.engine
+        return (e.start, e.end, e.pool_size, len(e.used_numbers), id(e.valid_numbers))
+
+    def sync(self):
+        if self._signature != self._engine_signature():
+            self.rebuild()
+
+    def invalidate(self):
+        """错过了增量更新（如隐藏期间），下次 sync 时整张重算"""
+        self._signature = None
+
+    def rebuild(self):
+        """按引擎当前状态重算整张图"""
+        self._signature = self._engine_signature()
+        self.lo = self.engine.start
+        self.hi = min(self.engine.end, self.lo + self.MAX_NUMBERS - 1)
+        n = self.hi - self.lo + 1
+        self.columns = max(1, min(n, math.ceil(math.sqrt(n * self.ASPECT))))
+        rows = math.ceil(n / self.columns)
+        self._states = np.full(rows * self.columns, STATE_OUTSIDE, dtype=np.uint8)
+        self._states[:n] = self.engine.number_states(self.lo, self.hi)
+        self.counts = np.bincount(self._states[:n], minlength=len(self.STATES))
+        self._pixels = self._lut[self._states].reshape(rows, self.columns)
+        self.image = QImage(self._pixels.data, self.columns, rows,
+                            self.columns * 4, QImage.Format_RGB32)
+        self.update()
+
+    def refresh_numbers(self, numbers):
+        """中奖/撤销后增量更新：每个号码的 ±MIN_GAP 邻域及其同家庭号码"""
+        if self.image is None or self._signature is None:
+            self.sync()
+            return
+        if self._signature[:3] != self._engine_signature()[:3]:
+            self.rebuild()  # 号码池本身变了（如补抽时原号码作废）
+            return
+        gap = self.engine.MIN_GAP
+        touched = set()
+        for number in numbers:
+            touched.add(number)
+            touched.update(self.engine.households.others(number))
+        # 各号码的邻域合并成不相交的区间
+        spans = []
+        for number in sorted(touched):
+            lo, hi = max(number - gap + 1, self.lo), min(number + gap - 1, self.hi)
+            if lo > hi:
+                continue
+            if spans and lo <= spans[-1][1] + 1:
+                spans[-1][1] = max(spans[-1][1], hi)
+            else:
+                spans.append([lo, hi])
+        if sum(hi - lo + 1 for lo, hi in spans) * self.REBUILD_RATIO > self.hi - self.lo + 1:
+            self.rebuild()  # 一次抽出很多人时整张重算更快
+            return
+        for lo, hi in spans:
+            i, j = lo - self.lo, hi - self.lo + 1
+            states = self.engine.number_states(lo, hi)
+            self.counts -= np.bincount(self._states[i:j], minlength=len(self.STATES))
+            self.counts += np.bincount(states, minlength=len(self.STATES))
+            self._states[i:j] = states
+            self._pixels.reshape(-1)[i:j] = self._lut[states]
+            self._update_span(i, j)
+        self._signature = self._engine_signature()
+
+    def _update_span(self, i, j):
+        """只重绘第 i..j-1 格覆盖的行"""
+        target = self.rect()
+        rows = self.image.height()
+        r0, r1 = i // self.columns, (j - 1) // self.columns + 1
+        top = target.y() + math.floor(r0 * target.height() / rows) - 1
+        bottom = target.y() + math.ceil(r1 * target.height() / rows) + 1
+        self.update(QRect(target.x(), top, target.width(), bottom - top))
+
+    def paintEvent(self, event):
+        if self.image is None:
+            return
+        # 只把暴露区域覆盖的那几行像素缩放贴上
+        rows = self.image.height()
+        scale = self.height() / rows
+        exposed = event.rect()
+        r0 = max(int(exposed.top() / scale), 0)
+        r1 = min(math.ceil((exposed.bottom() + 1) / scale), rows)
+        painter = QPainter(self)
+        painter.drawImage(
+            QRectF(0, r0 * scale, self.width(), (r1 - r0) * scale),
+            self.image, QRectF(0, r0, self.columns, r1 - r0),
+        )
+
+    def mouseMoveEvent(self, event):
+        if self.image is None:
+            return
+        rect = self.rect()
+        pos = event.position().toPoint()
+        col = pos.x() * self.columns // max(rect.width(), 1)
+        row = pos.y() * self.image.height() // max(rect.height(), 1)
+        index = row * self.columns + col
+        if 0 <= index <= self.hi - self.lo:
+            label = self.STATES[self._states[index]][2]
+            QToolTip.showText(event.globalPosition().toPoint(), f"{self.lo + index}：{label}", self)
+        else:
+            QToolTip.hideText()
@@ -2,12 +2,20 @@
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame,
-    QLabel, QLineEdit, QSpinBox, QPushButton,
+    QLabel, QLineEdit, QSpinBox, QPushButton, QPlainTextEdit, QCheckBox,
     QListWidget, QListWidgetItem, QMessageBox,
-    QGraphicsDropShadowEffect, QScrollArea
+    QScrollArea, QFileDialog
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer
 from PySide6.QtGui import QColor
+import re
+
+from core.config import MAX_NUMBER, load_config, save_config, validate_config
+from core.feasibility import analyze
+from core.lottery_engine import LotteryEngine
+from .fairness_dialog import FairnessDialog
+from .shadow import DropShadow
+from .theme import set_state
 
 
 class Card(QFrame):
@@ -20,21 +28,58 @@ class Card(QFrame):
                 border-radius: 16px;
             }
         """)
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(30)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 20))
-        self.setGraphicsEffect(shadow)
+        self.shadow = DropShadow(self, blur=30, offset=(0, 4), color=QColor(0, 0, 0, 20), radius=16)
+
+
+class FeasibilitySignals(QObject):
+    finished = Signal(int, object)  # (请求序号, analyze() 的结果)
+    failed = Signal(int, str)
+
+
+class FeasibilityTask(QRunnable):
+    """在线程池中分析号码池（大范围、名单、自定义规则都可能较慢）"""
+
+    def __init__(self, generation, config):
+        super().__init__()
+        self.generation = generation
+        self.config = config
+        self.signals = FeasibilitySignals()
+
+    def run(self):
+        try:
+            result = analyze(self.config, LotteryEngine.MIN_GAP)
+        except (OSError, ValueError) as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, result)
 
 
 class SetupPage(QWidget):
-    save_requested = Signal(int, int, list)
+    save_requested = Signal(dict)  # 配置字典（格式同 lottery_config）
+
+    ANALYZE_DELAY_MS = 300  # 停止输入这么久之后才重新分析
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("background: #f5f5f7;")
+        self.setObjectName("setupPage")  # 页面底色见主题
+        self._analysis_generation = 0  # 只采用最新一次分析的结果
         self.init_ui()
 
+        self._analyze_timer = QTimer(self)
+        self._analyze_timer.setSingleShot(True)
+        self._analyze_timer.setInterval(self.ANALYZE_DELAY_MS)
+        self._analyze_timer.timeout.connect(self.start_analysis)
+        for signal in (
+            self.start_input.valueChanged, self.end_input.valueChanged,
+            self.prize_list.model().rowsInserted, self.prize_list.model().rowsRemoved,
+            self.prize_list.model().modelReset,
+            self.exclude_digits_input.textChanged, self.exclude_endings_input.textChanged,
+            self.blacklist_input.textChanged, self.roster_input.textChanged,
+            self.households_input.textChanged,
+        ):
+            signal.connect(self.schedule_analysis)
+        self.start_analysis()
+
     def init_ui(self):
         # 主滚动区域
         scroll = QScrollArea()
@@ -86,7 +131,7 @@ class SetupPage(QWidget):
             color: #1d1d1f;
         """)
         
-        range_hint = QLabel("系统将自动排除含数字「4」的号码")
+        range_hint = QLabel("默认排除含数字「4」的号码，可在下方「排除规则」中调整")
         range_hint.setStyleSheet("font-size: 13px; color: #86868b;")
         
         range_input_layout = QHBoxLayout()
@@ -94,8 +139,9 @@ class SetupPage(QWidget):
         
         self.start_input = QSpinBox()
         self.end_input = QSpinBox()
-        self.start_input.setRange(1, 9999)
-        self.end_input.setRange(1, 9999)
+        # 与 validate_config 的取值范围一致，导入配置时不会被输入框截断
+        self.start_input.setRange(0, MAX_NUMBER)
+        self.end_input.setRange(0, MAX_NUMBER)
         self.start_input.setValue(1)
         self.end_input.setValue(200)
         
@@ -108,7 +154,7 @@ class SetupPage(QWidget):
                 font-weight: 500;
                 background: white;
                 color: #1d1d1f;
-                min-width: 100px;
+                min-width: 140px;
             }
             QSpinBox:focus {
                 border-color: #667eea;
@@ -155,7 +201,7 @@ class SetupPage(QWidget):
         
         self.prize_name_input = QLineEdit()
         self.prize_name_input.setPlaceholderText("奖品名称，如：一等奖")
-        self.prize_name_input.setStyleSheet("""
+        lineedit_style = """
             QLineEdit {
                 padding: 12px 16px;
                 border: 2px solid #e5e5e5;
@@ -172,7 +218,8 @@ class SetupPage(QWidget):
             QLineEdit::placeholder {
                 color: #aaaaaa;
             }
-        """)
+        """
+        self.prize_name_input.setStyleSheet(lineedit_style)
         
         self.prize_count_input = QSpinBox()
         self.prize_count_input.setRange(1, 100)
@@ -257,6 +304,105 @@ class SetupPage(QWidget):
         prize_layout.addWidget(self.prize_list)
         prize_layout.addWidget(self.delete_btn, alignment=Qt.AlignRight)
 
+        # === 排除规则卡片 ===
+        rules_card = Card()
+        rules_layout = QVBoxLayout(rules_card)
+        rules_layout.setContentsMargins(28, 24, 28, 24)
+        rules_layout.setSpacing(16)
+
+        rules_title = QLabel("🚫 排除规则")
+        rules_title.setStyleSheet("""
+            font-size: 17px;
+            font-weight: 600;
+            color: #1d1d1f;
+        """)
+
+        rules_hint = QLabel("多个值用逗号分隔，留空表示不限制")
+        rules_hint.setStyleSheet("font-size: 13px; color: #86868b;")
+
+        self.exclude_digits_input = QLineEdit("4")
+        self.exclude_digits_input.setPlaceholderText("不能含有的数字，如：4, 7")
+        self.exclude_endings_input = QLineEdit()
+        self.exclude_endings_input.setPlaceholderText("不能使用的尾号，如：13, 250")
+        self.blacklist_input = QLineEdit()
+        self.blacklist_input.setPlaceholderText("保留号码（座位号、工作人员号等），如：520100, 520101")
+        self.weights_input = QLineEdit()
+        self.weights_input.setPlaceholderText("号码:权重（其余号码权重为1），如：520101:3, 520102:2")
+
+        rules_layout.addWidget(rules_title)
+        rules_layout.addWidget(rules_hint)
+        for label_text, line_edit in [
+            ("排除数字", self.exclude_digits_input),
+            ("排除尾号", self.exclude_endings_input),
+            ("保留号码", self.blacklist_input),
+            ("加权号码", self.weights_input),
+        ]:
+            row = QHBoxLayout()
+            row.setSpacing(16)
+            label = QLabel(label_text)
+            label.setFixedWidth(70)
+            label.setStyleSheet("font-size: 14px; color: #86868b; font-weight: 500;")
+            line_edit.setStyleSheet(lineedit_style)
+            row.addWidget(label)
+            row.addWidget(line_edit, 1)
+            rules_layout.addLayout(row)
+
+        # 来宾名单：只在名单票号中抽取，中奖时显示姓名
+        roster_row = QHBoxLayout()
+        roster_row.setSpacing(16)
+        roster_label = QLabel("来宾名单")
+        roster_label.setFixedWidth(70)
+        roster_label.setStyleSheet("font-size: 14px; color: #86868b; font-weight: 500;")
+        self.roster_input = QLineEdit()
+        self.roster_input.setPlaceholderText("可选：CSV / 文本名单（每行：票号, 姓名），导入后只抽名单中的票号")
+        self.roster_input.setStyleSheet(lineedit_style)
+        self.roster_btn = QPushButton("📋 选择")
+        self.roster_btn.setCursor(Qt.PointingHandCursor)
+        self.roster_btn.setStyleSheet("""
+            QPushButton {
+                background: #f0f0ff;
+                color: #667eea;
+                border: none;
+                border-radius: 10px;
+                padding: 12px 20px;
+                font-size: 15px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: #e0e0ff;
+            }
+        """)
+        self.roster_btn.clicked.connect(self.choose_roster)
+        roster_row.addWidget(roster_label)
+        roster_row.addWidget(self.roster_input, 1)
+        roster_row.addWidget(self.roster_btn)
+        rules_layout.addLayout(roster_row)
+
+        households_label = QLabel("👨‍👩‍👧 家庭分组（同一家最多一人中奖）")
+        households_label.setStyleSheet("font-size: 14px; color: #86868b; font-weight: 500;")
+        self.households_input = QPlainTextEdit()
+        self.households_input.setPlaceholderText("每行一个家庭，号码用逗号分隔，如：\n520101, 520102, 520103")
+        self.households_input.setFixedHeight(110)
+        self.households_input.setStyleSheet("""
+            QPlainTextEdit {
+                padding: 10px 14px;
+                border: 2px solid #e5e5e5;
+                border-radius: 10px;
+                font-size: 15px;
+                background: white;
+                color: #1d1d1f;
+            }
+            QPlainTextEdit:focus {
+                border-color: #667eea;
+            }
+        """)
+        rules_layout.addWidget(households_label)
+        rules_layout.addWidget(self.households_input)
+
+        self.precompute_check = QCheckBox("🔐 预先生成抽奖方案（抽奖前公布哈希承诺，结束后可公开验证）")
+        self.precompute_check.setStyleSheet("font-size: 14px; color: #1d1d1f;")
+        rules_layout.addWidget(self.precompute_check)
+
         # === 保存按钮 ===
         self.save_btn = QPushButton("💾  保存配置并开始抽奖")
         self.save_btn.setFixedHeight(56)
@@ -279,10 +425,52 @@ class SetupPage(QWidget):
         """)
         self.save_btn.clicked.connect(self.validate_and_save)
 
+        # === 配置文件导入/导出 ===
+        file_btn_style = """
+            QPushButton {
+                background: white;
+                color: #667eea;
+                border: 2px solid #667eea;
+                border-radius: 14px;
+                font-size: 15px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: #f0f0ff;
+            }
+        """
+        self.import_btn = QPushButton("📂  导入配置文件")
+        self.export_btn = QPushButton("📤  导出配置文件")
+        for btn in (self.import_btn, self.export_btn):
+            btn.setFixedHeight(48)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setStyleSheet(file_btn_style)
+        self.import_btn.clicked.connect(self.import_config)
+        self.export_btn.clicked.connect(self.export_config)
+        self.fairness_btn = QPushButton("📊  公平性分析")
+        self.fairness_btn.setFixedHeight(48)
+        self.fairness_btn.setCursor(Qt.PointingHandCursor)
+        self.fairness_btn.setStyleSheet(file_btn_style)
+        self.fairness_btn.clicked.connect(self.open_fairness)
+
+        # === 可行性提示（随输入实时更新） ===
+        self.feasibility_label = QLabel()
+        self.feasibility_label.setObjectName("feasibilityLabel")  # 样式见主题的 [level=...]
+        self.feasibility_label.setWordWrap(True)
+
+        file_layout = QHBoxLayout()
+        file_layout.setSpacing(16)
+        file_layout.addWidget(self.import_btn)
+        file_layout.addWidget(self.export_btn)
+        file_layout.addWidget(self.fairness_btn)
+
         # 组装布局
         layout.addWidget(header)
         layout.addWidget(range_card)
         layout.addWidget(prize_card)
+        layout.addWidget(rules_card)
+        layout.addWidget(self.feasibility_label)
+        layout.addLayout(file_layout)
         layout.addWidget(self.save_btn)
         layout.addStretch()
         
@@ -311,16 +499,218 @@ class SetupPage(QWidget):
             self.prize_list.takeItem(current)
 
     def validate_and_save(self):
+        config = self._checked_config()
+        if config is not None:
+            self.save_requested.emit(config)
+
+    def _checked_config(self):
+        """收集并校验表单，出错时弹出提示并返回 None"""
         if self.prize_list.count() == 0:
             QMessageBox.warning(self, "提示", "请至少添加一个奖项")
-            return
-        start = self.start_input.value()
-        end = self.end_input.value()
-        if start >= end:
+            return None
+        if self.start_input.value() >= self.end_input.value():
             QMessageBox.warning(self, "提示", "起始号码必须小于结束号码")
+            return None
+        try:
+            return validate_config(self.collect_config())
+        except ValueError as e:
+            QMessageBox.warning(self, "提示", f"配置格式有误：{e}")
+            return None
+
+    def schedule_analysis(self, *args):
+        """输入变化后重新计时，连续输入时只在停下来后分析一次"""
+        self._analyze_timer.start()
+
+    def _show_feasibility(self, level, text):
+        self.feasibility_label.setText(text)
+        set_state(self.feasibility_label, "level", level)
+
+    def start_analysis(self):
+        """收集表单并在后台计算号码池可行性；表单有误时直接提示"""
+        self._analysis_generation += 1
+        if self.start_input.value() >= self.end_input.value():
+            self._show_feasibility("error", "❌ 起始号码必须小于结束号码")
             return
-        prizes = [
-            self.prize_list.item(i).data(Qt.UserRole)
-            for i in range(self.prize_list.count())
-        ]
-        self.save_requested.emit(start, end, prizes)
+        try:
+            config = self.collect_config()
+            if config["prizes"]:
+                config = validate_config(config)
+        except ValueError as e:
+            self._show_feasibility("error", f"❌ {e}")
+            return
+
+        self._show_feasibility("info", "⏳ 正在分析号码池…")
+        task = FeasibilityTask(self._analysis_generation, config)
+        task.signals.finished.connect(self.on_analysis_finished)
+        task.signals.failed.connect(self.on_analysis_failed)
+        QThreadPool.globalInstance().start(task)
+
+    def on_analysis_finished(self, generation, result):
+        if generation != self._analysis_generation:
+            return  # 分析期间表单又改过，结果已过时
+        gap = LotteryEngine.MIN_GAP
+        needed, pool, spaced = result["needed"], result["pool"], result["spaced"]
+        if not needed:
+            self._show_feasibility(
+                "info", f"ℹ️ 可用号码 {pool} 个，号码间隔 ≥ {gap} 时最多 {spaced} 人中奖"
+            )
+        elif pool < needed:
+            self._show_feasibility(
+                "error", f"❌ 号码不足：可用号码 {pool} 个（每个家庭只计一人），奖项共需 {needed} 人"
+            )
+        elif spaced < needed:
+            self._show_feasibility(
+                "warn",
+                f"⚠️ 奖项共需 {needed} 人，但号码间隔 ≥ {gap} 时最多只能抽出 {spaced} 人，"
+                f"之后会抽到相邻号码",
+            )
+        else:
+            self._show_feasibility(
+                "ok",
+                f"✅ 可用号码 {pool} 个，号码间隔 ≥ {gap} 时最多 {spaced} 人中奖，奖项共需 {needed} 人",
+            )
+
+    def on_analysis_failed(self, generation, message):
+        if generation == self._analysis_generation:
+            self._show_feasibility("error", f"❌ {message}")
+
+    def collect_config(self):
+        """把整个表单整理成配置字典"""
+        return {
+            "start": self.start_input.value(),
+            "end": self.end_input.value(),
+            "prizes": [
+                self.prize_list.item(i).data(Qt.UserRole)
+                for i in range(self.prize_list.count())
+            ],
+            "rules": self.collect_rules(),
+            "households": self.collect_households(),
+            "weights": {str(n): w for n, w in self.collect_weights().items()},
+            "precompute": self.precompute_check.isChecked(),
+            "roster": self.roster_input.text().strip(),
+        }
+
+    def fill_form(self, config):
+        """用（已校验的）配置填充表单，奖项列表批量写入"""
+        self.start_input.setValue(config["start"])
+        self.end_input.setValue(config["end"])
+
+        self.prize_list.setUpdatesEnabled(False)
+        self.prize_list.clear()
+        for prize in config["prizes"]:
+            item = QListWidgetItem(f"🎁  {prize['name']}    ×{prize['count']}人")
+            item.setData(Qt.UserRole, prize)
+            self.prize_list.addItem(item)
+        self.prize_list.setUpdatesEnabled(True)
+
+        rules = config["rules"]
+        self.exclude_digits_input.setText(", ".join(map(str, rules["exclude_digits"])))
+        self.exclude_endings_input.setText(", ".join(rules["exclude_endings"]))
+        self.blacklist_input.setText(", ".join(map(str, rules["blacklist"])))
+        self.households_input.setPlainText(
+            "\n".join(", ".join(map(str, members)) for members in config["households"])
+        )
+        self.weights_input.setText(
+            ", ".join(f"{n}:{w:g}" for n, w in config["weights"].items())
+        )
+        self.precompute_check.setChecked(config["precompute"])
+        self.roster_input.setText(config["roster"])
+
+    def choose_roster(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "选择来宾名单", "", "来宾名单 (*.csv *.txt);;所有文件 (*)"
+        )
+        if path:
+            self.roster_input.setText(path)
+
+    def import_config(self):
+        """导入配置文件：填充表单，并把配置整体交给引擎（不经过表单逐项回读）"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "导入配置文件", "", "配置文件 (*.json *.yaml *.yml)"
+        )
+        if not path:
+            return
+        try:
+            config = load_config(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "导入失败", str(e))
+            return
+        self.fill_form(config)
+        self.save_requested.emit(config)
+
+    def export_config(self):
+        config = self._checked_config()
+        if config is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "导出配置文件", "lottery_config.json", "JSON (*.json);;YAML (*.yaml *.yml)"
+        )
+        if not path:
+            return
+        try:
+            save_config(config, path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "导出失败", str(e))
+            return
+        QMessageBox.information(self, "导出成功", f"配置已保存到：\n{path}")
+
+    def open_fairness(self):
+        """用当前表单的配置打开公平性分析"""
+        config = self._checked_config()
+        if config is not None:
+            FairnessDialog(config, self).exec()
+
+    @staticmethod
+    def _split_values(text):
+        return [v for v in re.split(r"[,，;；\s]+", text.strip()) if v]
+
+    def collect_rules(self):
+        """把排除规则输入框整理成配置字典（格式同 lottery_config 的 rules 段）"""
+        digits = []
+        for value in self._split_values(self.exclude_digits_input.text()):
+            if not value.isdigit():
+                raise ValueError(f"排除数字只能填 0~9：{value}")
+            digits.extend(int(ch) for ch in value)
+        endings = self._split_values(self.exclude_endings_input.text())
+        for value in endings:
+            if not value.isdigit():
+                raise ValueError(f"尾号只能由数字组成：{value}")
+        blacklist = []
+        for value in self._split_values(self.blacklist_input.text()):
+            if not value.isdigit():
+                raise ValueError(f"保留号码只能是数字：{value}")
+            blacklist.append(int(value))
+        return {
+            "exclude_digits": sorted(set(digits)),
+            "exclude_endings": endings,
+            "blacklist": blacklist,
+        }
+
+    def collect_households(self):
+        """家庭分组：每行一个家庭"""
+        households = []
+        for line in self.households_input.toPlainText().splitlines():
+            values = self._split_values(line)
+            if not values:
+                continue
+            for value in values:
+                if not value.isdigit():
+                    raise ValueError(f"家庭分组中的号码只能是数字：{value}")
+            households.append([int(v) for v in values])
+        return households
+
+    def collect_weights(self):
+        """加权号码：号码:权重，权重可以是小数"""
+        weights = {}
+        for value in self._split_values(self.weights_input.text()):
+            number, sep, weight = value.replace("：", ":").partition(":")
+            if not sep or not number.isdigit():
+                raise ValueError(f"加权号码格式应为 号码:权重：{value}")
+            try:
+                weight = float(weight)
+            except ValueError:
+                raise ValueError(f"权重必须是数字：{value}")
+            if weight <= 0:
+                raise ValueError(f"权重必须大于0：{value}")
+            weights[int(number)] = weight
+        return weights
@@ -0,0 +1,138 @@
+# ui/shadow.py
+
+import math
+
+from PySide6.QtWidgets import QWidget, QGraphicsScene, QGraphicsDropShadowEffect
+from PySide6.QtCore import QEvent, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPixmap
+
+
+# (圆角, 模糊半径, 颜色, 设备像素比, 尺寸或 None) → 阴影位图
+_cache = {}
+
+
+def _render(width, height, radius, blur, color, ratio):
+    """渲染一块 width×height 圆角矩形的模糊阴影（四周各留 blur 的扩散区）
+
+    直接用 QGraphicsDropShadowEffect 渲染，结果与原来挂在控件上的阴影一致：
+    把阴影偏移到形状右侧足够远处，只截取阴影那一块，不带形状本身。
+    """
+    w, h = width + 2 * blur, height + 2 * blur
+    shift = w  # 阴影与形状互不重叠
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+    scene = QGraphicsScene()
+    item = scene.addPath(path, Qt.NoPen, QColor(Qt.black))
+    effect = QGraphicsDropShadowEffect()
+    effect.setBlurRadius(blur)
+    effect.setOffset(shift, 0)
+    effect.setColor(QColor(color))
+    item.setGraphicsEffect(effect)
+    # 场景按形状本身的范围裁剪可见项，所以整个场景一起渲染，再截取阴影部分
+    scene.setSceneRect(QRectF(-blur, -blur, shift + w, h))
+    full = QImage(math.ceil((shift + w) * ratio), math.ceil(h * ratio),
+                  QImage.Format_ARGB32_Premultiplied)
+    full.fill(Qt.transparent)
+    painter = QPainter(full)
+    scene.render(painter, QRectF(0, 0, full.width(), full.height()), scene.sceneRect())
+    painter.end()
+    image = full.copy(round(shift * ratio), 0, math.ceil(w * ratio), math.ceil(h * ratio))
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(ratio)
+    return pixmap
+
+
+def shadow_pixmap(radius, blur, color, ratio, size=None):
+    """取缓存的阴影位图：size 为 None 时是可九宫格拉伸的最小阴影"""
+    key = (radius, blur, QColor(color).rgba(), ratio, size)
+    if key not in _cache:
+        if size is None:
+            # 角区（圆角 + 内外两侧的模糊）之外只留 1 像素，用于拉伸
+            side = 2 * (radius + blur) + 1
+            size = (side, side)
+        _cache[key] = _render(*size, radius, blur, color, ratio)
+    return _cache[key]
+
+
+def paint_shadow(painter, rect, radius, blur, color, ratio):
+    """在 rect（目标矩形四周各扩出 blur 的范围）内画缓存的阴影
+
+    DropShadow 控件和列表委托里画的卡片（不是控件）共用。
+    """
+    corner = radius + 2 * blur  # 九宫格角区边长（含外侧扩散区）
+    x0, y0, width, height = rect.x(), rect.y(), rect.width(), rect.height()
+    if 2 * corner + 1 > width or 2 * corner + 1 > height:
+        # 目标太小放不下九宫格：按实际尺寸单独渲染
+        size = (width - 2 * blur, height - 2 * blur)
+        painter.drawPixmap(x0, y0, shadow_pixmap(radius, blur, color, ratio, size))
+        return
+    source = shadow_pixmap(radius, blur, color, ratio)
+    scale = source.width() / (2 * corner + 1)  # 位图像素 / 逻辑像素
+    # 每个方向三段：角区、拉伸的中段、角区
+    for (tx, tw), (sx, sw) in _segments(width, corner, scale):
+        for (ty, th), (sy, sh) in _segments(height, corner, scale):
+            painter.drawPixmap(QRect(x0 + tx, y0 + ty, tw, th), source, QRect(sx, sy, sw, sh))
+
+
+def _segments(length, corner, scale):
+    """一个方向上的 ((目标起点, 长度), (源起点, 长度)) 三段"""
+    c = round(corner * scale)
+    return (
+        ((0, corner), (0, c)),
+        ((corner, length - 2 * corner), (c, round(scale))),
+        ((length - corner, corner), (c + round(scale), c)),
+    )
+
+
+class DropShadow(QWidget):
+    """缓存式阴影：代替 QGraphicsDropShadowEffect
+
+    阴影是目标控件的一个兄弟控件，叠在目标正下方，跟随目标移动、缩放和显隐。
+    同样参数的阴影只渲染一次（九宫格），之后每次绘制只是九次贴图，
+    目标控件本身照常直接绘制，不再经过离屏渲染和逐帧模糊。
+    """
+
+    def __init__(self, target, blur, offset=(0, 0), color=QColor(0, 0, 0, 40), radius=16):
+        super().__init__(target.parentWidget())
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.target = target
+        self.blur = blur
+        self.offset = offset
+        self.color = QColor(color)
+        self.radius = radius
+        self.active = True
+        target.installEventFilter(self)
+        target.destroyed.connect(self.deleteLater)
+        self._sync()
+
+    def set_active(self, active):
+        """开关阴影（如号码标签只在显示中奖号码时发光）"""
+        self.active = active
+        self._sync()
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.ParentChange:
+            self.setParent(self.target.parentWidget())
+            self._sync()
+        elif kind in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide, QEvent.ZOrderChange):
+            self._sync()
+        return False
+
+    def _sync(self):
+        """按目标的位置、大小和可见性摆放阴影"""
+        parent = self.parentWidget()
+        visible = self.active and parent is not None and self.target.isVisibleTo(parent)
+        if not visible:
+            self.hide()
+            return
+        dx, dy = self.offset
+        self.setGeometry(self.target.geometry().translated(dx, dy).adjusted(
+            -self.blur, -self.blur, self.blur, self.blur))
+        self.stackUnder(self.target)
+        self.show()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        paint_shadow(painter, self.rect(), self.radius, self.blur, self.color, self.devicePixelRatioF())
@@ -1,117 +1,295 @@
 # ui/summary_page.py
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QFrame, QScrollArea, QGraphicsDropShadowEffect,
-    QPushButton
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QListView, QStyledItemDelegate,
+    QPushButton, QMenu, QFileDialog, QMessageBox, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor, QLinearGradient, QPainter, QBrush
+from PySide6.QtCore import Qt, Signal, QThreadPool, QAbstractListModel, QModelIndex, QPointF, QRect, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QLinearGradient, QPainter, QBrush, QPen
 
+from .export_worker import ExportTask
+from .shadow import paint_shadow
+
+
+class PrizeListModel(QAbstractListModel):
+    """各奖项的中奖结果：每行一个有中奖者的奖项
+
+    结果更新时逐个奖项比较，只对有变化的行发 dataChanged、新出现的奖项
+    插入一行，视图只重排和重绘受影响的卡片，而不是整页重建。
+    """
+
+    WinnersRole = Qt.UserRole + 1  # ((号码, 来宾姓名或 None), ...)
+    ColorRole = Qt.UserRole + 2    # 渐变色序号（奖项在全部奖项中的位置）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._order = []  # 全部奖项名（含尚无中奖者的），决定配色
+        self._rows = []   # [(奖项名, 中奖者元组, 配色序号)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, winners, color = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == self.WinnersRole:
+            return winners
+        if role == self.ColorRole:
+            return color
+        return None
+
+    def set_results(self, results, name_of=None):
+        """按 {奖项: [号码]} 整体比较更新"""
+        self._order = list(results)
+        self._apply([
+            self._row(name, winners, name_of) for name, winners in results.items() if winners
+        ])
+
+    def update_prize(self, name, winners, name_of=None):
+        """只更新一个奖项（刚抽出号码或补抽）"""
+        if name not in self._order:
+            return
+        rows = [row for row in self._rows if row[0] != name]
+        if winners:
+            rows.append(self._row(name, winners, name_of))
+            rows.sort(key=lambda row: row[2])
+        self._apply(rows)
+
+    def _row(self, name, winners, name_of):
+        name_of = name_of or (lambda number: None)
+        return (name, tuple((n, name_of(n)) for n in winners), self._order.index(name))
+
+    def _apply(self, rows):
+        """把 rows 合并进当前结果：只插入新奖项、刷新有变化的行"""
+        names = [row[0] for row in rows]
+        old = [row[0] for row in self._rows]
+        if not old or not set(old) <= set(names) or [n for n in names if n in old] != old:
+            # 首次加载，或有奖项消失、顺序变化（重新配置、重置）：整体重置
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        for i, row in enumerate(rows):
+            if i < len(self._rows) and self._rows[i][0] == row[0]:
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    index = self.index(i)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self._rows.insert(i, row)
+                self.endInsertRows()
+
+
+class PrizeCardDelegate(QStyledItemDelegate):
+    """奖项展示卡片 - 渐变背景，直接画在列表里（不创建控件）
+
+    中奖号码按卡片宽度排成多行，号码多时卡片变高而不是互相重叠；
+    只画落在可见区域内的号码。
+    """
 
-class PrizeCard(QFrame):
-    """奖项展示卡片 - 渐变背景"""
-    
     # 不同奖项的渐变色
     GRADIENTS = [
         ("#667eea", "#764ba2", "#f093fb"),  # 一等奖 - 紫色渐变
-        ("#11998e", "#38ef7d", "#56ccf2"),  # 二等奖 - 青绿渐变  
+        ("#11998e", "#38ef7d", "#56ccf2"),  # 二等奖 - 青绿渐变
         ("#f093fb", "#f5576c", "#ff9966"),  # 三等奖 - 粉橙渐变
         ("#4facfe", "#00f2fe", "#43e97b"),  # 四等奖 - 蓝绿渐变
         ("#fa709a", "#fee140", "#f8b500"),  # 五等奖 - 粉黄渐变
     ]
-    
-    def __init__(self, prize_name, winners, index=0, parent=None):
+
+    CARD_WIDTH = 300
+    MIN_HEIGHT = 280
+    RADIUS = 20
+    PADDING = 30
+    SPACING = 20
+    CIRCLE = 70              # 号码圆圈直径
+    GAP = 15                 # 号码之间的间距
+    NAME_GAP = 6             # 号码与姓名之间的间距
+    MARGIN = (12, 10, 12, 30)  # 卡片四周留给间距和阴影的边距（左、上、右、下）
+    SHADOW = (30, 10, QColor(0, 0, 0, 40))  # 模糊半径、向下偏移、颜色
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.prize_name = prize_name
-        self.winners = winners
-        self.gradient_colors = self.GRADIENTS[index % len(self.GRADIENTS)]
-        
-        self.setMinimumHeight(280)
-        self.setStyleSheet("border-radius: 20px;")
-        
-        # 阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(30)
-        shadow.setOffset(0, 10)
-        shadow.setColor(QColor(0, 0, 0, 40))
-        self.setGraphicsEffect(shadow)
-        
-        self.init_ui()
-    
-    def init_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(30, 30, 30, 30)
-        layout.setSpacing(20)
-        
-        # 奖项名称
-        title = QLabel(self.prize_name)
-        title.setStyleSheet("""
-            font-size: 28px;
-            font-weight: 700;
-            color: white;
-            background: transparent;
-            letter-spacing: 2px;
-        """)
-        title.setAlignment(Qt.AlignCenter)
-        
-        # 分隔线
-        line = QFrame()
-        line.setFixedHeight(2)
-        line.setStyleSheet("background: rgba(255,255,255,0.3); border: none;")
-        
-        # 中奖号码区域
-        winners_container = QWidget()
-        winners_container.setStyleSheet("background: transparent;")
-        winners_layout = QHBoxLayout(winners_container)
-        winners_layout.setSpacing(15)
-        winners_layout.setAlignment(Qt.AlignCenter)
-        
-        for num in self.winners:
-            num_label = QLabel(str(num))
-            num_label.setFixedSize(70, 70)
-            num_label.setAlignment(Qt.AlignCenter)
-            num_label.setStyleSheet("""
-                QLabel {
-                    background: rgba(255, 255, 255, 0.25);
-                    border-radius: 35px;
-                    font-size: 26px;
-                    font-weight: 700;
-                    color: white;
-                    border: 2px solid rgba(255,255,255,0.4);
-                }
-            """)
-            winners_layout.addWidget(num_label)
-        
-        # 中奖人数
-        count_label = QLabel(f"共 {len(self.winners)} 人中奖")
-        count_label.setStyleSheet("""
-            font-size: 14px;
-            color: rgba(255,255,255,0.8);
-            background: transparent;
-        """)
-        count_label.setAlignment(Qt.AlignCenter)
-        
-        layout.addWidget(title)
-        layout.addWidget(line)
-        layout.addStretch()
-        layout.addWidget(winners_container)
-        layout.addWidget(count_label)
-        layout.addStretch()
-    
-    def paintEvent(self, event):
-        painter = QPainter(self)
+        self.title_font = self._font(28, QFont.Bold, spacing=2)
+        self.number_font = self._font(26, QFont.Bold)
+        self.name_font = self._font(14)
+        self.count_font = self._font(14)
+        self._number_fonts = {}  # 号码位数 → 放得进圆圈的字体
+
+    @staticmethod
+    def _font(size, weight=QFont.Normal, spacing=0):
+        font = QFont(QApplication.font())
+        font.setPixelSize(size)
+        font.setWeight(weight)
+        if spacing:
+            font.setLetterSpacing(QFont.AbsoluteSpacing, spacing)
+        return font
+
+    @classmethod
+    def item_width(cls):
+        return cls.CARD_WIDTH + cls.MARGIN[0] + cls.MARGIN[2]
+
+    def _grid(self, winners):
+        """号码网格：(列数, 行数, 每格高度)"""
+        columns = max(1, (self.CARD_WIDTH - 2 * self.PADDING + self.GAP) // (self.CIRCLE + self.GAP))
+        rows = -(-len(winners) // columns)
+        cell = self.CIRCLE
+        if any(name for _, name in winners):
+            cell += self.NAME_GAP + QFontMetrics(self.name_font).height()
+        return columns, rows, cell
+
+    def _layout(self, winners):
+        """卡片高度与号码网格的纵向起点（相对卡片顶部）"""
+        _, rows, cell = self._grid(winners)
+        title = QFontMetrics(self.title_font).height()
+        count = QFontMetrics(self.count_font).height()
+        grid = rows * cell + max(rows - 1, 0) * self.GAP
+        # 标题、分隔线、弹性空白、号码、人数、弹性空白，相邻两项间隔 SPACING
+        fixed = title + 2 + grid + count + 5 * self.SPACING
+        height = max(self.MIN_HEIGHT, 2 * self.PADDING + fixed)
+        free = height - 2 * self.PADDING - fixed
+        grid_top = self.PADDING + title + 2 + 3 * self.SPACING + free // 2
+        return height, grid_top, grid
+
+    def sizeHint(self, option, index):
+        height, _, _ = self._layout(index.data(PrizeListModel.WinnersRole))
+        return QSize(self.item_width(), height + self.MARGIN[1] + self.MARGIN[3])
+
+    def _fit_number_font(self, text):
+        """号码位数多时缩小字号，保证放得进圆圈"""
+        font = self._number_fonts.get(len(text))
+        if font is None:
+            font = QFont(self.number_font)
+            width = QFontMetrics(font).horizontalAdvance("8" * len(text))
+            limit = self.CIRCLE - 8
+            if width > limit:
+                font.setPixelSize(max(10, int(font.pixelSize() * limit / width)))
+            self._number_fonts[len(text)] = font
+        return font
+
+    def paint(self, painter, option, index):
+        winners = index.data(PrizeListModel.WinnersRole)
+        colors = self.GRADIENTS[index.data(PrizeListModel.ColorRole) % len(self.GRADIENTS)]
+        height, grid_top, grid = self._layout(winners)
+        card = QRect(option.rect.x() + self.MARGIN[0], option.rect.y() + self.MARGIN[1],
+                     self.CARD_WIDTH, height)
+        ratio = option.widget.devicePixelRatioF() if option.widget else 1.0
+
+        painter.save()
+        painter.setClipRect(option.rect)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 绘制渐变背景
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(self.gradient_colors[0]))
-        gradient.setColorAt(0.5, QColor(self.gradient_colors[1]))
-        gradient.setColorAt(1, QColor(self.gradient_colors[2]))
-        
-        painter.setBrush(QBrush(gradient))
+        painter.setRenderHint(QPainter.TextAntialiasing)
+
+        # 阴影与渐变背景
+        blur, offset, shadow_color = self.SHADOW
+        paint_shadow(painter, card.translated(0, offset).adjusted(-blur, -blur, blur, blur),
+                     self.RADIUS, blur, shadow_color, ratio)
+        gradient = QLinearGradient(QPointF(card.topLeft()), QPointF(card.bottomRight()))
+        for stop, color in zip((0, 0.5, 1), colors):
+            gradient.setColorAt(stop, QColor(color))
         painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(self.rect(), 20, 20)
+        painter.setBrush(QBrush(gradient))
+        painter.drawRoundedRect(card, self.RADIUS, self.RADIUS)
+
+        # 奖项名称与分隔线
+        inner = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        title_height = QFontMetrics(self.title_font).height()
+        painter.setPen(Qt.white)
+        painter.setFont(self.title_font)
+        painter.drawText(QRect(inner.x(), inner.y(), inner.width(), title_height),
+                         Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.fillRect(QRect(inner.x(), inner.y() + title_height + self.SPACING, inner.width(), 2),
+                         QColor(255, 255, 255, 77))
+
+        # 中奖号码：只画与可见区域相交的那几行
+        columns, rows, cell = self._grid(winners)
+        top = card.y() + grid_top
+        visible = option.widget.viewport().rect() if option.widget else option.rect
+        pitch = cell + self.GAP
+        first = max(0, (visible.top() - top) // pitch)
+        last = min(rows, (visible.bottom() - top) // pitch + 1)
+        for row in range(first, last):
+            items = winners[row * columns:(row + 1) * columns]
+            # 每行居中（最后一行可能不满）
+            width = len(items) * self.CIRCLE + (len(items) - 1) * self.GAP
+            x = card.x() + (self.CARD_WIDTH - width) // 2
+            y = top + row * pitch
+            for number, name in items:
+                self._paint_winner(painter, QRect(x, y, self.CIRCLE, cell), number, name)
+                x += self.CIRCLE + self.GAP
+
+        # 中奖人数
+        painter.setPen(QColor(255, 255, 255, 204))
+        painter.setFont(self.count_font)
+        painter.drawText(QRect(inner.x(), top + grid + self.SPACING, inner.width(),
+                               QFontMetrics(self.count_font).height()),
+                         Qt.AlignCenter, f"共 {len(winners)} 人中奖")
+        painter.restore()
+
+    def _paint_winner(self, painter, rect, number, name):
+        """一个号码圆圈，导入了名单时下方显示来宾姓名"""
+        circle = QRectF(rect.x() + 1, rect.y() + 1, self.CIRCLE - 2, self.CIRCLE - 2)
+        painter.setPen(QPen(QColor(255, 255, 255, 102), 2))
+        painter.setBrush(QColor(255, 255, 255, 64))
+        painter.drawEllipse(circle)
+        text = str(number)
+        painter.setPen(Qt.white)
+        painter.setFont(self._fit_number_font(text))
+        painter.drawText(circle, Qt.AlignCenter, text)
+        if name:
+            painter.setFont(self.name_font)
+            metrics = QFontMetrics(self.name_font)
+            # 姓名可以比圆圈略宽（占到两侧间距），再长就省略
+            width = self.CIRCLE + self.GAP
+            painter.drawText(
+                QRect(rect.x() - self.GAP // 2, rect.y() + self.CIRCLE + self.NAME_GAP,
+                      width, metrics.height()),
+                Qt.AlignCenter, metrics.elidedText(name, Qt.ElideRight, width),
+            )
+
+
+class PrizeListView(QListView):
+    """卡片按行排列、自动换行的列表，卡片不满一行时整体居中
+
+    只有可见的卡片会被绘制，奖项再多也不会创建成百上千个控件。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.rowsInserted.connect(self._center)
+        model.modelReset.connect(self._center)
+
+    def resizeEvent(self, event):
+        self._center()
+        super().resizeEvent(event)
+
+    def _center(self):
+        """左右留出相等的空白，使一行卡片居中"""
+        model = self.model()
+        count = model.rowCount() if model is not None else 0
+        item = PrizeCardDelegate.item_width()
+        # 始终预留滚动条的宽度，免得滚动条出现/消失时边距来回变化
+        available = self.width() - 2 * self.frameWidth() - self.verticalScrollBar().sizeHint().width()
+        # QListView 在卡片右缘碰到视口最右一像素时就换行，多留 2 像素
+        per_row = max(1, (available - 2) // item)
+        side = max(0, (available - 2 - min(count, per_row) * item) // 2)
+        self.setViewportMargins(side, 0, side, 0)
 
 
 class SummaryPage(QWidget):
@@ -119,10 +297,20 @@ class SummaryPage(QWidget):
     
     reset_requested = Signal()  # 重新抽奖信号
     
+    # 导出格式：(菜单文字, 文件过滤器, 默认文件名)
+    EXPORT_FORMATS = {
+        "csv": ("表格 CSV", "CSV 文件 (*.csv)", "抽奖结果.csv"),
+        "json": ("数据 JSON", "JSON 文件 (*.json)", "抽奖结果.json"),
+        "png": ("高清海报 PNG", "PNG 图片 (*.png)", "抽奖结果.png"),
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("background: #1a1a2e;")
         self.results = {}  # {prize_name: [winners]}
+        self.model = PrizeListModel(self)
+        self.name_of = None  # 号码 → 来宾姓名
+        self.export_task = None  # 正在进行的导出任务
         self.init_ui()
     
     def init_ui(self):
@@ -163,8 +351,52 @@ class SummaryPage(QWidget):
         """)
         self.reset_btn.clicked.connect(self.reset_requested.emit)
         
+        # 导出结果按钮（后台线程写文件，不阻塞界面）
+        self.export_btn = QPushButton("📤 导出结果")
+        self.export_btn.setCursor(Qt.PointingHandCursor)
+        self.export_btn.setStyleSheet("""
+            QPushButton {
+                background: rgba(102, 126, 234, 0.8);
+                color: white;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 24px;
+                font-size: 15px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: rgba(102, 126, 234, 1);
+            }
+            QPushButton::menu-indicator {
+                width: 0;
+            }
+        """)
+        export_menu = QMenu(self.export_btn)
+        for fmt, (text, _, _) in self.EXPORT_FORMATS.items():
+            export_menu.addAction(text, lambda f=fmt: self.export_results(f))
+        self.export_btn.setMenu(export_menu)
+        
+        self.export_progress = QProgressBar()
+        self.export_progress.setFixedWidth(160)
+        self.export_progress.setTextVisible(False)
+        self.export_progress.setStyleSheet("""
+            QProgressBar {
+                background: rgba(255,255,255,0.15);
+                border: none;
+                border-radius: 4px;
+                height: 8px;
+            }
+            QProgressBar::chunk {
+                background: #667eea;
+                border-radius: 4px;
+            }
+        """)
+        self.export_progress.hide()
+        
         header_layout.addWidget(title)
         header_layout.addStretch()
+        header_layout.addWidget(self.export_progress)
+        header_layout.addWidget(self.export_btn)
         header_layout.addWidget(self.reset_btn)
         
         # 副标题
@@ -174,55 +406,88 @@ class SummaryPage(QWidget):
             color: rgba(255,255,255,0.6);
         """)
         
-        # 卡片滚动区域
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
+        # 卡片列表（只绘制可见的卡片）
+        self.cards_view = PrizeListView()
+        self.cards_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background: transparent;
             }
-            QScrollArea > QWidget > QWidget {
-                background: transparent;
-            }
         """)
-        
-        self.cards_container = QWidget()
-        self.cards_container.setStyleSheet("background: transparent;")
-        self.cards_layout = QHBoxLayout(self.cards_container)
-        self.cards_layout.setSpacing(25)
-        self.cards_layout.setContentsMargins(10, 10, 10, 20)
-        self.cards_layout.setAlignment(Qt.AlignCenter)
-        
-        scroll.setWidget(self.cards_container)
+        self.cards_view.setItemDelegate(PrizeCardDelegate(self.cards_view))
+        self.cards_view.setModel(self.model)
         
         layout.addWidget(header)
         layout.addWidget(subtitle)
         layout.addSpacing(20)
-        layout.addWidget(scroll, 1)
+        layout.addWidget(self.cards_view, 1)
     
-    def update_results(self, prize_drawn: dict):
-        """更新抽奖结果"""
-        self.results = prize_drawn
-        self.refresh_cards()
+    def update_results(self, prize_drawn: dict, name_of=None):
+        """更新抽奖结果，name_of 用于显示来宾姓名；只有变化的奖项会重绘"""
+        self.results = {prize_name: list(winners) for prize_name, winners in prize_drawn.items()}
+        self.name_of = name_of
+        self.model.set_results(self.results, name_of)
+
+    def update_prize(self, prize_name, winners):
+        """某个奖项刚揭晓了号码：只更新这一张卡片"""
+        if prize_name not in self.results:
+            return  # 还没加载过这一场的结果，下次 update_results 时一并显示
+        self.results[prize_name] = list(winners)
+        self.model.update_prize(prize_name, self.results[prize_name], self.name_of)
+
+    def replace_winner(self, prize_name, old, new):
+        """补抽后只更新对应奖项卡片上的号码"""
+        winners = self.results.get(prize_name)
+        if winners is None or old not in winners:
+            return
+        winners[winners.index(old)] = new
+        self.model.update_prize(prize_name, winners, self.name_of)
     
-    def refresh_cards(self):
-        """刷新卡片显示"""
-        # 清除旧卡片
-        while self.cards_layout.count():
-            item = self.cards_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+    def export_results(self, fmt):
+        """选择保存位置后在线程池中导出，进度显示在标题栏"""
+        if not any(self.results.values()):
+            QMessageBox.information(self, "提示", "还没有抽奖结果")
+            return
+        _, file_filter, default_name = self.EXPORT_FORMATS[fmt]
+        path, _ = QFileDialog.getSaveFileName(self, "导出结果", default_name, file_filter)
+        if not path:
+            return
         
-        # 创建新卡片
-        for i, (prize_name, winners) in enumerate(self.results.items()):
-            if winners:  # 只显示有中奖者的奖项
-                card = PrizeCard(prize_name, winners, i)
-                card.setFixedWidth(300)
-                self.cards_layout.addWidget(card)
+        # 在界面线程里拍下结果快照（号码与姓名），工作线程只读快照
+        name_of = self.name_of or (lambda number: None)
+        snapshot = {
+            prize_name: [(n, name_of(n)) for n in winners]
+            for prize_name, winners in self.results.items()
+        }
+        
+        task = ExportTask(fmt, path, snapshot, PrizeCardDelegate.GRADIENTS)
+        task.signals.progress.connect(self.on_export_progress)
+        task.signals.finished.connect(self.on_export_finished)
+        task.signals.failed.connect(self.on_export_failed)
+        self.export_task = task
+        self.export_btn.setEnabled(False)
+        self.export_progress.setValue(0)
+        self.export_progress.show()
+        QThreadPool.globalInstance().start(task)
+    
+    def on_export_progress(self, done, total):
+        self.export_progress.setMaximum(max(total, 1))
+        self.export_progress.setValue(done)
+    
+    def on_export_finished(self, path):
+        self._end_export()
+        QMessageBox.information(self, "导出完成", f"结果已保存到：\n{path}")
+    
+    def on_export_failed(self, message):
+        self._end_export()
+        QMessageBox.warning(self, "导出失败", message)
+    
+    def _end_export(self):
+        self.export_task = None
+        self.export_btn.setEnabled(True)
+        self.export_progress.hide()
     
     def clear_results(self):
         """清空结果"""
         self.results = {}
-        self.refresh_cards()
-
+        self.model.set_results(self.results)
@@ -0,0 +1,78 @@
+# ui/theme.py
+
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from utils.resource_path import resource_path
+
+
+class Theme(QObject):
+    """全局主题：整个程序只有一份应用级样式表，启动时解析一次
+
+    控件的状态（抽奖按钮的开始/停止/完成、可行性提示的级别等）不再在
+    切换时重新 setStyleSheet，而是改动态属性（见 set_state），由样式表里的
+    属性选择器匹配，切换时只重新 polish 这一个控件。
+    样式表文件被修改后自动重新加载，活动现场调整配色无需重启程序；
+    环境变量 LOTTERY_THEME 可指定自定义的样式表文件。
+    """
+
+    DEFAULT_PATH = "resources/styles/macos.qss"
+    RELOAD_DELAY_MS = 200  # 编辑器保存时可能连续写几次，停下来后再加载
+
+    reloaded = Signal(str)  # 重新加载后的样式表路径
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_reload)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self.reload)
+
+    def load(self, path=None):
+        """加载样式表并监视文件变化；返回是否加载成功（失败时保持原样式）"""
+        path = path or os.environ.get("LOTTERY_THEME") or resource_path(self.DEFAULT_PATH)
+        if self.path and self.path != path:
+            self._watcher.removePath(self.path)
+        self.path = path
+        return self.reload()
+
+    def reload(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                sheet = f.read()
+        except OSError:
+            return False
+        finally:
+            # 不少编辑器保存时先删后写，监视会随旧文件失效，需要重新登记
+            if os.path.exists(self.path) and self.path not in self._watcher.files():
+                self._watcher.addPath(self.path)
+        QApplication.instance().setStyleSheet(sheet)
+        self.reloaded.emit(self.path)
+        return True
+
+    def _schedule_reload(self, path):
+        self._reload_timer.start()
+
+
+def set_state(widget, name, value):
+    """改控件的动态属性并按主题重新套用样式（值没变时什么也不做）"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()